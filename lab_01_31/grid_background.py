@@ -0,0 +1,167 @@
+from typing import Dict, Tuple
+
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainter, QPen, QPixmap, QTransform
+from PyQt5.QtWidgets import QGraphicsView
+
+# сетка и оси рисуются фоном вида, а не элементами сцены: линии сетки повторяются с периодом шага,
+# поэтому для каждого масштаба один раз рисуется полоса из нескольких клеток (отдельно для
+# вертикальных и горизонтальных линий), а при перерисовке она только копируется плиткой
+TILE_MIN_LENGTH = 256  # пикселей экрана вдоль полосы
+TILE_MAX_LENGTH = 8192
+TILE_WIDTH = 16
+TILE_MAX_PERIOD = 1024  # шаг сетки на экране больше - линии рисуются напрямую, их видно всего несколько
+MAX_CACHED_TILES = 16
+
+
+class GridBackground:
+    def __init__(self, view: QGraphicsView):
+        self.view = view
+        self.max_width = 0
+        self.max_height = 0
+        self.interval = 0
+        self.scale = 1.0  # масштаб, при котором сетка строилась последний раз
+        self.tiles: Dict[Tuple[float, float, int, int, bool], QPixmap] = {}
+        view.drawBackground = self.draw
+
+    @property
+    def step(self) -> int:
+        return self.interval if self.interval != 0 else 20
+
+    def update(self, scale: float) -> bool:
+        # шаг сетки и ее границы меняются при масштабировании; False - перестраивать нечего
+        changed = False
+        max_size = self.view.maximumSize()
+        max_width = int(max_size.width() * (1 / scale))
+        max_height = int(max_size.height() * (1 / scale))
+        grid_interval = int(50 * (1 / scale))
+        grid_interval = round(grid_interval / 50) * 50
+        if grid_interval != self.interval:
+            self.interval = grid_interval
+            changed = True
+        if self.max_width < max_width and self.max_height < max_height:
+            self.max_width = max_width
+            self.max_height = max_height
+            changed = True
+        if changed:
+            self.scale = scale
+            # прокрутка по-прежнему охватывает всю сетку, как когда она состояла из элементов сцены
+            scene = self.view.scene()
+            scene.setSceneRect(scene.sceneRect() | self.bounds())
+            self.view.viewport().update()
+        return changed
+
+    def pen_width(self) -> int:
+        return 1 if int(1 / self.scale) == 0 else int(1 / self.scale)
+
+    def lines(self) -> Tuple[int, int, int, int]:
+        # первая линия и конец сетки по x и y
+        step = self.step
+        start_grid_width = - ((self.max_width // 2) + step - (self.max_width // 2) % step)
+        start_grid_height = - ((self.max_height // 2) + step - (self.max_height // 2) % step)
+        end_grid_width = (self.max_width // 2) - (self.max_width // 2) % step
+        end_grid_height = (self.max_height // 2) - (self.max_width // 2) % step
+        return start_grid_width, start_grid_height, end_grid_width, end_grid_height
+
+    def axis_length(self) -> float:
+        return 300 * (1 / self.scale)
+
+    def regions(self) -> Tuple[QRectF, QRectF]:
+        # области вертикальных и горизонтальных линий вместе с толщиной пера и квадратными концами
+        start_x, start_y, end_x, end_y = self.lines()
+        last_x = start_x + (end_x - 1 - start_x) // self.step * self.step
+        last_y = start_y + (end_y - 1 - start_y) // self.step * self.step
+        half = self.pen_width() / 2
+        vertical = QRectF(start_x, start_y, last_x - start_x, end_y - start_y) if end_x > start_x else QRectF()
+        horizontal = QRectF(start_x, start_y, end_x - start_x, last_y - start_y) if end_y > start_y else QRectF()
+        return vertical.adjusted(-half, -half, half, half), horizontal.adjusted(-half, -half, half, half)
+
+    def bounds(self) -> QRectF:
+        vertical, horizontal = self.regions()
+        length = self.axis_length()
+        half = self.pen_width() / 2
+        axes = QRectF(-length, -length, 2 * length, 2 * length).adjusted(-half, -half, half, half)
+        return vertical | horizontal | axes
+
+    def pen(self, color) -> QPen:
+        pen = QPen(color)
+        pen.setWidth(self.pen_width())
+        return pen
+
+    def tile(self, scale: float, shift: float, vertical: bool) -> QPixmap:
+        # полоса из нескольких клеток, линия x = 0 (y = 0) проходит через пиксель shift;
+        # число клеток подбирается так, чтобы длина полосы была почти целой в пикселях:
+        # иначе линии в следующих копиях плитки сдвигаются на долю пикселя
+        key = (scale, shift, self.step, self.pen_width(), vertical)
+        if key in self.tiles:
+            return self.tiles[key]
+        period = self.step * scale
+        first = max(int(-(-TILE_MIN_LENGTH // period)), 1)
+        last = max(int(TILE_MAX_LENGTH // period), first)
+        cells = min(range(first, last + 1), key=lambda n: (round(abs(n * period - round(n * period)), 3), n))
+        length = round(cells * period)
+
+        tile = QPixmap(length, TILE_WIDTH) if vertical else QPixmap(TILE_WIDTH, length)
+        tile.fill(Qt.transparent)
+        painter = QPainter(tile)
+        painter.setPen(self.pen(Qt.darkGray))
+        across = 2 * TILE_WIDTH / scale
+        # линии у краев полосы, выходящие за них, переносятся на другой край: плитка строго периодична
+        for wrap in (-length, 0, length):
+            if vertical:
+                painter.setTransform(QTransform(scale, 0, 0, scale, shift + wrap, 0))
+            else:
+                painter.setTransform(QTransform(scale, 0, 0, scale, 0, shift + wrap))
+            for i in range(cells):
+                if vertical:
+                    painter.drawLine(QPointF(i * self.step, -across), QPointF(i * self.step, across))
+                else:
+                    painter.drawLine(QPointF(-across, i * self.step), QPointF(across, i * self.step))
+        painter.end()
+
+        if len(self.tiles) >= MAX_CACHED_TILES:
+            del self.tiles[next(iter(self.tiles))]
+        self.tiles[key] = tile
+        return tile
+
+    def draw(self, painter: QPainter, rect: QRectF) -> None:
+        # drawBackground вида подменен, поэтому кисть фона (цвет, выбранный пользователем) рисуется здесь
+        QGraphicsView.drawBackground(self.view, painter, rect)
+        transform = painter.worldTransform()
+        scale = transform.m11()
+        origin = transform.map(QPointF(0, 0))
+        left, top = int(origin.x() // 1), int(origin.y() // 1)
+        for region, vertical in zip(self.regions(), (True, False)):
+            exposed = rect & region
+            if exposed.isEmpty():
+                continue
+            painter.save()
+            painter.setClipRect(exposed, Qt.IntersectClip)
+            if self.step * scale > TILE_MAX_PERIOD:
+                self.draw_lines(painter, exposed, vertical)
+            else:
+                target = transform.mapRect(exposed).toAlignedRect()
+                if vertical:
+                    tile = self.tile(scale, origin.x() - left, True)
+                    offset = QPointF((target.left() - left) % tile.width(), 0)
+                else:
+                    tile = self.tile(scale, origin.y() - top, False)
+                    offset = QPointF(0, (target.top() - top) % tile.height())
+                painter.resetTransform()
+                painter.drawTiledPixmap(QRectF(target), tile, offset)
+            painter.restore()
+
+        length = self.axis_length()
+        painter.setPen(self.pen(Qt.white))
+        painter.drawLine(QPointF(-length, 0), QPointF(length, 0))
+        painter.drawLine(QPointF(0, -length), QPointF(0, length))
+
+    def draw_lines(self, painter: QPainter, exposed: QRectF, vertical: bool) -> None:
+        painter.setPen(self.pen(Qt.darkGray))
+        step = self.step
+        if vertical:
+            for i in range(int(exposed.left() // step), int(exposed.right() // step) + 2):
+                painter.drawLine(QPointF(i * step, exposed.top()), QPointF(i * step, exposed.bottom()))
+        else:
+            for i in range(int(exposed.top() // step), int(exposed.bottom() // step) + 2):
+                painter.drawLine(QPointF(exposed.left(), i * step), QPointF(exposed.right(), i * step))
@@ -2,7 +2,7 @@ import sys
 
 from PyQt5 import QtWidgets
 from PyQt5 import uic
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QPen, QMouseEvent, QFont, QColor, QBrush, QWheelEvent
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsTextItem
 from typing import List, Union, Tuple
@@ -10,16 +10,16 @@ from typing import List, Union, Tuple
 from dialogs import show_war_win, show_err_win, show_author, show_task, show_instruction
 from triangle_methods import find_min_angle
 from class_point import Point
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
 
 point_list: List[Point] = []
 scene_point_list: List[QGraphicsEllipseItem] = []
-grid_lines: List[QGraphicsLineItem] = []
 point_scale: List[float] = []
 triangle_lines: List[QGraphicsLineItem] = []
 coords_desc: List[QGraphicsTextItem] = []
 
 scale: float = 1.0
-max_win_size: List[int] = [0, 0, 0]
 
 dragging: bool = False
 is_pressed: bool = False
@@ -34,8 +34,8 @@ class Ui(QtWidgets.QMainWindow):
         self.scene = QGraphicsScene()
         self.graphicsView.setScene(self.scene)
 
-        self.need_grid()
-        self.add_grid()
+        self.grid = GridBackground(self.graphicsView)
+        self.update_grid()
 
         self.redBrush = QBrush(Qt.red)
         self.pen = QPen(Qt.red)
@@ -48,6 +48,7 @@ class Ui(QtWidgets.QMainWindow):
         self.about_task.triggered.connect(show_task)
         self.instruction.triggered.connect(show_instruction)
 
+        self.input = InputCoalescer(self.apply_mouse_move, self.apply_wheel, self)
         self.graphicsView.mousePressEvent = self.mousePressEvent
         self.graphicsView.wheelEvent = self.wheel_event
         self.graphicsView.mouseReleaseEvent = self.mouseReleaseEvent
@@ -55,57 +56,9 @@ class Ui(QtWidgets.QMainWindow):
 
         self.show()
 
-    def need_grid(self) -> bool:
-        global max_win_size
-        flag: bool = False
-        max_size = self.graphicsView.maximumSize()
-        max_width = int(max_size.width() * (1 / scale))
-        max_height = int(max_size.height() * (1 / scale))
-        grid_interval = int(50 * (1 / scale))
-        grid_interval = round(grid_interval / 50) * 50
-        if grid_interval != max_win_size[2]:
-            max_win_size[2] = grid_interval
-            flag = True
-        if max_win_size[0] < max_width and max_win_size[1] < max_height:
-            max_win_size[0] = max_width
-            max_win_size[1] = max_height
-            flag = True
-        return flag
-
-    def add_grid(self) -> None:
-        max_width = max_win_size[0]
-        max_height = max_win_size[1]
-        grid_interval = max_win_size[2]
-        if grid_interval == 0:
-            grid_interval = 20
-        self.current_grid_label.setText(f'Текущий шаг сетки: {grid_interval}')
-        start_grid_width = - ((max_width // 2) + grid_interval - (max_width // 2) % grid_interval)
-        start_grid_height = - ((max_height // 2) + grid_interval - (max_height // 2) % grid_interval)
-        end_grid_width = (max_width // 2) - (max_width // 2) % grid_interval
-        end_grid_height = (max_height // 2) - (max_width // 2) % grid_interval
-        pen = QPen(Qt.darkGray)
-        pen_width = 1 if int(1 / scale) == 0 else int(1 / scale)
-        pen.setWidth(pen_width)
-        for x in range(start_grid_width, end_grid_width, grid_interval):
-            line = QGraphicsLineItem(x, start_grid_height, x, end_grid_height)
-            line.setPen(pen)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-        for y in range(start_grid_height, end_grid_height, grid_interval):
-            line = QGraphicsLineItem(start_grid_width, y, end_grid_width, y)
-            line.setPen(pen)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-
-        axis_x = QGraphicsLineItem(-300 * (1 / scale), 0, 300 * (1 / scale), 0)
-        axis_y = QGraphicsLineItem(0, -300 * (1 / scale), 0, 300 * (1 / scale))
-        pen.setColor(Qt.white)
-        grid_lines.append(axis_x)
-        grid_lines.append(axis_y)
-        axis_x.setPen(pen)
-        axis_y.setPen(pen)
-        self.scene.addItem(axis_x)
-        self.scene.addItem(axis_y)
+    def update_grid(self) -> None:
+        if self.grid.update(scale):
+            self.current_grid_label.setText(f'Текущий шаг сетки: {self.grid.step}')
 
     def add_point(self) -> None:
         coords = self.get_coords_from_field()
@@ -207,6 +160,7 @@ class Ui(QtWidgets.QMainWindow):
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         global last_pos, is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = True
             last_pos = event.pos()
@@ -254,26 +208,24 @@ class Ui(QtWidgets.QMainWindow):
         show_war_win(f"Задача решена.\nМинимальный угол: {min_angle}°")
 
     def wheel_event(self, event: QWheelEvent) -> None:
-        global scale
-        factor = 1.2
+        self.input.wheel(1 if event.angleDelta().y() > 0 else -1)
 
-        if event.angleDelta().y() > 0:
-            self.graphicsView.scale(factor, factor)
-        else:
-            self.graphicsView.scale(1.0 / factor, 1.0 / factor)
+    def apply_wheel(self, steps: int) -> None:
+        # steps - сумма шагов колесика за кадр, каждый шаг - масштаб в 1.2 раза
+        global scale
+        factor = 1.2 ** steps
+        self.graphicsView.scale(factor, factor)
 
         scale = self.graphicsView.transform().m11()  # Получаем текущий масштаб по оси X (и Y)
         for i in range(len(scene_point_list)):
             point = scene_point_list[i]
             point.setTransformOriginPoint(point.boundingRect().center())
             point.setScale(1 / (scale * point_scale[i]))
-        if self.need_grid():
-            for grid_line in grid_lines:
-                self.scene.removeItem(grid_line)
-            self.add_grid()
+        self.update_grid()
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         global dragging, is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             if not dragging:
                 self.add_point_by_click(event)
@@ -281,19 +233,20 @@ class Ui(QtWidgets.QMainWindow):
             is_pressed = False
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        global last_pos, dragging
+        global dragging
         if is_pressed:
             dragging = True
-            dx = event.pos().x() - last_pos.x()
-            dy = event.pos().y() - last_pos.y()
+        self.input.move(event.pos())
+
+    def apply_mouse_move(self, pos: QPoint) -> None:
+        global last_pos
+        if is_pressed:
+            dx = pos.x() - last_pos.x()
+            dy = pos.y() - last_pos.y()
             self.graphicsView.horizontalScrollBar().setValue(self.graphicsView.horizontalScrollBar().value() - dx)
             self.graphicsView.verticalScrollBar().setValue(self.graphicsView.verticalScrollBar().value() - dy)
-            last_pos = event.pos()
-            if self.need_grid():
-                for grid_line in grid_lines:
-                    self.scene.removeItem(grid_line)
-                self.add_grid()
-        scene_pos = self.graphicsView.mapToScene(event.pos())
+            last_pos = pos
+        scene_pos = self.graphicsView.mapToScene(pos)
         self.current_coords_label.setText(f'x :{scene_pos.x():.2f}, y :{scene_pos.y():.2f}')
 
 
@@ -5,13 +5,14 @@ from typing import List, Tuple
 
 from PyQt5 import QtWidgets
 from PyQt5 import uic
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QBrush, QPen, QWheelEvent, QMouseEvent
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsLineItem
 
 from dialogs import show_author, show_task, show_instruction
 from input_checks import params_to_float, check_radius, check_scale_koeff
 from class_point import Point
+from input_coalescer import InputCoalescer
 from matrix_methods import get_new_coords
 
 intersection_points: List[Point] = []
@@ -104,6 +105,7 @@ class Ui(QtWidgets.QMainWindow):
 
         self.graphicsView.setMouseTracking(True)
 
+        self.input = InputCoalescer(self.apply_mouse_move, self.apply_wheel, self)
         self.graphicsView.mousePressEvent = self.mousePressEvent
         self.graphicsView.wheelEvent = self.wheel_event
         self.graphicsView.mouseReleaseEvent = self.mouseReleaseEvent
@@ -112,13 +114,13 @@ class Ui(QtWidgets.QMainWindow):
         self.show()
 
     def wheel_event(self, event: QWheelEvent) -> None:
-        global scale
-        factor = 1.2
+        self.input.wheel(1 if event.angleDelta().y() > 0 else -1)
 
-        if event.angleDelta().y() > 0:
-            self.graphicsView.scale(factor, factor)
-        else:
-            self.graphicsView.scale(1.0 / factor, 1.0 / factor)
+    def apply_wheel(self, steps: int) -> None:
+        # steps - сумма шагов колесика за кадр, каждый шаг - масштаб в 1.2 раза
+        global scale
+        factor = 1.2 ** steps
+        self.graphicsView.scale(factor, factor)
 
         # Получаем текущий масштаб по оси X (и Y)
         scale = self.graphicsView.transform().m11()
@@ -129,29 +131,34 @@ class Ui(QtWidgets.QMainWindow):
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         global is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = False
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        self.input.move(event.pos())
+
+    def apply_mouse_move(self, pos: QPoint) -> None:
         global last_pos
         if is_pressed:
-            dx = event.pos().x() - last_pos.x()
-            dy = event.pos().y() - last_pos.y()
+            dx = pos.x() - last_pos.x()
+            dy = pos.y() - last_pos.y()
             self.graphicsView.horizontalScrollBar().setValue(
                 self.graphicsView.horizontalScrollBar().value() - dx)
             self.graphicsView.verticalScrollBar().setValue(
                 self.graphicsView.verticalScrollBar().value() - dy)
-            last_pos = event.pos()
+            last_pos = pos
             if self.need_grid():
                 for grid_line in grid_lines:
                     grid_line.deleteLater()
                 self.add_grid()
-        scene_pos = self.graphicsView.mapToScene(event.pos())
+        scene_pos = self.graphicsView.mapToScene(pos)
         self.current_coords_label.setText(
             f'x :{scene_pos.x():.2f}, y :{-scene_pos.y():.2f}')
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         global last_pos, is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = True
             last_pos = event.pos()
@@ -1,5 +1,7 @@
 from matrix_methods import mul_matrices, get_new_coords
 from class_point import Point
+from input_coalescer import InputCoalescer
+from PyQt5.QtCore import QPoint
 import pytest
 
 
@@ -20,3 +22,20 @@ def test_zero_point(ed_matrix, null_point):
 def test_raises_empty_point_list(ed_matrix):
     with pytest.raises(AttributeError):
         get_new_coords([], ed_matrix)
+
+
+def test_input_coalescer():
+    # за кадр от движений остается последняя позиция, шаги колесика складываются
+    # и применяются раньше движения; первое событие кадра применяется сразу
+    calls = []
+    coalescer = InputCoalescer(lambda pos: calls.append(('move', pos)), lambda steps: calls.append(('wheel', steps)))
+    coalescer.move(QPoint(1, 1))
+    for i in range(2, 5):
+        coalescer.move(QPoint(i, i))
+    for steps in (1, 2, -1):
+        coalescer.wheel(steps)
+    assert calls == [('move', QPoint(1, 1))]
+    coalescer.flush()
+    assert calls == [('move', QPoint(1, 1)), ('wheel', 2), ('move', QPoint(4, 4))]
+    coalescer.next_frame()
+    assert len(calls) == 3
@@ -0,0 +1,139 @@
+import argparse
+import csv
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from math import radians, cos, sin
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+from class_point import Point
+from point_algs import brezenhem_float, brezenhem_st, brezenhem_int, cda, vu
+from point_algs_np import brezenhem_float_np, brezenhem_st_np, brezenhem_int_np, cda_np, vu_np
+
+ALGS: Dict[str, Dict[str, Callable]] = {
+    'scalar': {'br_int': brezenhem_int, 'br_float': brezenhem_float, 'br_st': brezenhem_st,
+               'cda': cda, 'vu': vu},
+    'np': {'br_int': brezenhem_int_np, 'br_float': brezenhem_float_np, 'br_st': brezenhem_st_np,
+           'cda': cda_np, 'vu': vu_np},
+}
+
+FIELDS = ['backend', 'alg', 'length', 'angle', 'runs', 'median_ns', 'p95_ns', 'q1_ns', 'q3_ns', 'iqr_ns',
+          'min_ns', 'max_ns']
+
+
+def summarize(samples: List[int]) -> Dict[str, float]:
+    q1, median, q3, p95 = np.percentile(samples, [25, 50, 75, 95])
+    return {'median_ns': float(median), 'p95_ns': float(p95), 'q1_ns': float(q1), 'q3_ns': float(q3),
+            'iqr_ns': float(q3 - q1), 'min_ns': float(min(samples)), 'max_ns': float(max(samples))}
+
+
+def time_segment(alg: Callable, length: float, angle: float, runs: int, warmup: int) -> List[int]:
+    x2 = length * cos(radians(angle))
+    y2 = length * sin(radians(angle))
+    samples = []
+    for i in range(warmup + runs):
+        # vu сдвигает начальную точку, поэтому точки создаются заново
+        p1, p2 = Point(0.0, 0.0), Point(x2, y2)
+        start = perf_counter_ns()
+        alg(p1, p2)
+        elapsed = perf_counter_ns() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def run_sweep(backends: List[str], algs: List[str], lengths: List[float], angles: List[float],
+              runs: int, warmup: int) -> List[Dict[str, Union[str, float]]]:
+    results = []
+    for backend in backends:
+        for name in algs:
+            for length in lengths:
+                for angle in angles:
+                    samples = time_segment(ALGS[backend][name], length, angle, runs, warmup)
+                    row = {'backend': backend, 'alg': name, 'length': length, 'angle': angle, 'runs': runs}
+                    row.update(summarize(samples))
+                    results.append(row)
+    return results
+
+
+def get_revision() -> Union[str, None]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_json(path: str, results: List[Dict], args: argparse.Namespace) -> None:
+    meta = {'revision': get_revision(), 'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'runs': args.runs, 'warmup': args.warmup}
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=4)
+
+
+def write_csv(path: str, results: List[Dict]) -> None:
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def load_results(path: str) -> List[Dict]:
+    if path.endswith('.json'):
+        with open(path) as f:
+            return json.load(f)['results']
+    with open(path, newline='') as f:
+        return [dict(row, length=float(row['length']), angle=float(row['angle']),
+                     median_ns=float(row['median_ns'])) for row in csv.DictReader(f)]
+
+
+def print_table(results: List[Dict], baseline: List[Dict] = None) -> None:
+    old = {}
+    if baseline:
+        old = {(r['backend'], r['alg'], r['length'], r['angle']): r['median_ns'] for r in baseline}
+    header = f"{'backend':<8}{'alg':<10}{'length':>8}{'angle':>8}{'median, us':>13}{'p95, us':>11}{'iqr, us':>11}"
+    print(header + ('  ratio' if old else ''))
+    for r in results:
+        line = f"{r['backend']:<8}{r['alg']:<10}{r['length']:>8g}{r['angle']:>8g}" \
+               f"{r['median_ns'] / 1000:>13.2f}{r['p95_ns'] / 1000:>11.2f}{r['iqr_ns'] / 1000:>11.2f}"
+        prev = old.get((r['backend'], r['alg'], r['length'], r['angle']))
+        if prev:
+            line += f"  {r['median_ns'] / prev:.3f}"
+        print(line)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Замер времени алгоритмов построения отрезков без GUI")
+    parser.add_argument('--backend', nargs='+', choices=list(ALGS), default=['scalar'])
+    parser.add_argument('--algs', nargs='+', choices=list(ALGS['scalar']), default=list(ALGS['scalar']))
+    parser.add_argument('--lengths', nargs='+', type=float, default=[10, 100, 1000])
+    parser.add_argument('--angles', nargs='+', type=float, default=[0, 15, 30, 45, 60, 75, 90])
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--json', help="файл для результатов в формате JSON")
+    parser.add_argument('--csv', help="файл для результатов в формате CSV")
+    parser.add_argument('--compare', help="JSON/CSV прошлого запуска, печатается отношение медиан")
+    args = parser.parse_args(argv)
+    if args.runs <= 0 or args.warmup < 0:
+        parser.error("число запусков должно быть положительным, прогрев - неотрицательным")
+    return args
+
+
+def main(argv: List[str]) -> None:
+    args = parse_args(argv)
+    results = run_sweep(args.backend, args.algs, args.lengths, args.angles, args.runs, args.warmup)
+    print_table(results, load_results(args.compare) if args.compare else None)
+    if args.json:
+        write_json(args.json, results, args)
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
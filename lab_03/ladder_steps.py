@@ -0,0 +1,128 @@
+from math import floor, trunc
+
+from class_point import Point
+from point_algs import brezenhem_float, brezenhem_st, brezenhem_int, cda, vu
+
+# Количество ступенек (шагов сразу по обеим осям), которое алгоритмы из point_algs
+# насчитывают с testing=True, за O(1) без прохода по отрезку. Если ответ зависит от
+# ошибок округления при накоплении (значение на границе округления), считает сам алгоритм.
+
+TIE_EPS = 1e-9
+
+
+def is_same_point(p1: Point, p2: Point) -> bool:
+    return abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13
+
+
+def is_tie(value: float) -> bool:
+    return abs(value - round(value)) <= TIE_EPS * max(1.0, abs(value))
+
+
+def brezenhem_int_steps(p1: Point, p2: Point) -> int:
+    if is_same_point(p1, p2):
+        return 0
+
+    dx = abs(p2.x - p1.x)
+    dy = abs(p2.y - p1.y)
+    if dy > dx:
+        dx, dy = dy, dx
+    if dy == 0:
+        return 0
+
+    # из n шагов по основной оси диагональных floor(n * dy / dx + 1 / 2)
+    n = int(dx + 1) - 1
+    if float(dx).is_integer() and float(dy).is_integer():
+        return (2 * n * int(dy) + int(dx)) // (2 * int(dx))
+    value = n * dy / dx + 0.5
+    if is_tie(value):
+        return brezenhem_int(p1, p2, True)
+    return floor(value)
+
+
+def brezenhem_float_steps(p1: Point, p2: Point) -> int:
+    if is_same_point(p1, p2):
+        return 0
+
+    dx = abs(p2.x - p1.x)
+    dy = abs(p2.y - p1.y)
+    if dx <= 1e-13 or dy == 0:
+        return 0
+
+    m = dy / dx
+    if m > 1:
+        dx, dy = dy, dx
+        m = 1 / m
+
+    value = int(dx + 1) * m + 0.5
+    if is_tie(value):
+        return brezenhem_float(p1, p2, True)
+    return floor(value)
+
+
+def brezenhem_st_steps(p1: Point, p2: Point) -> int:
+    if is_same_point(p1, p2):
+        return 0
+
+    dx = abs(p2.x - p1.x)
+    dy = abs(p2.y - p1.y)
+    if dy > dx:
+        dx, dy = dy, dx
+    if dy == 0:
+        return 0
+
+    value = (int(dx + 1) - 1) * (dy / dx) + 0.5
+    if is_tie(value):
+        return brezenhem_st(p1, p2, True)
+    return floor(value)
+
+
+def cda_steps(p1: Point, p2: Point) -> int:
+    if is_same_point(p1, p2):
+        return 0
+
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+
+    if abs(dx) > abs(dy):
+        L = abs(dx)
+        start, delta, major = p1.y, dy / L, p1.x
+    else:
+        L = abs(dy)
+        start, delta, major = p1.x, dx / L, p1.y
+    if delta == 0:
+        return 0
+    n = int(L)
+
+    # по основной оси шаг равен 1 и округление меняется каждый раз, кроме полуцелых
+    # координат (округление к четному); по другой оси шаг меньше 1, значит изменений
+    # столько же, сколько целых в разности округленных концов
+    end = start + n * delta
+    if is_tie(major + 0.5) or is_tie(end + 0.5) or abs(delta) == 1 and is_tie(start + 0.5):
+        return cda(p1, p2, True)
+    return abs(round(end) - round(start))
+
+
+def vu_steps(p1: Point, p2: Point) -> int:
+    if is_same_point(p1, p2):
+        return 0
+
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+
+    if abs(dy) >= abs(dx):
+        start, stop, cross, intensity = p1.y, p2.y, p1.x, dx / dy
+        end = round(p2.y) - 1 if dx > dy else round(p2.y) + 1
+    else:
+        start, stop, cross, intensity = p1.x, p2.x, p1.y, dy / dx
+        end = round(p2.x) - 1 if dx < dy else round(p2.x) + 1
+
+    # при обратном проходе условие y < round(p2.y) (x < round(p2.x)) не выполняется
+    if start > stop or intensity == 0:
+        return 0
+
+    # шаги, на которых срабатывает условие, и разность целых частей на их концах
+    n = max(min(round(stop), end) - round(start), 0)
+    last = cross + n * intensity
+    if is_tie(last):
+        return vu(Point(p1.x, p1.y), p2, True)
+    return abs(trunc(last) - trunc(cross))
@@ -2,22 +2,30 @@ import sys
 from time import time
 from math import radians, cos, sin
 from matplotlib import pyplot
+import numpy as np
 
 from typing import List, Tuple, Union
 
 from PyQt5 import QtWidgets
 from PyQt5 import uic
 from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtWidgets import QGraphicsScene, QGraphicsLineItem, QButtonGroup, QGraphicsRectItem
-from PyQt5.QtGui import QWheelEvent, QMouseEvent, QPen, QColor, QBrush
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsLineItem, QButtonGroup
+from PyQt5.QtGui import QWheelEvent, QMouseEvent, QColor, QBrush, QCloseEvent
 
 from dialogs import show_author, show_task, show_instruction
 from class_point import Point
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
 from input_checks import params_to_float
+from ladder_steps import brezenhem_float_steps, brezenhem_st_steps, brezenhem_int_steps, cda_steps, vu_steps
+from pixel_canvas import PixelCanvas
+from point_buffer import PointBuffer
 from point_algs import brezenhem_float, brezenhem_st, brezenhem_int, cda, vu
+from point_algs_np import brezenhem_float_np, brezenhem_st_np, brezenhem_int_np, cda_np, vu_np, Pixels, ShadedPixels
+from spectre_algs import brezenhem_float_spectre, brezenhem_st_spectre, brezenhem_int_spectre, cda_spectre, \
+    vu_spectre
+from workers import Job, JobControls
 
-grid_lines: List[QGraphicsLineItem] = []
-max_win_size: List[int] = [0, 0, 0]
 
 scale: float = 1.0
 num_tests: int = 50
@@ -28,15 +36,55 @@ last_pos: QPoint = None
 current_line_color: QColor = QColor(255, 0, 0)
 
 
+def count_ladder_steps(job: Job, point: Point, length: float, step: int) -> List[List[int]]:
+    steps = [[] for _ in range(5)]
+    cur_angle = 0
+
+    while cur_angle < 90:
+        end = Point(point.x + length * cos(radians(cur_angle)), point.y + length * sin(radians(cur_angle)))
+        for i, count_steps in enumerate([cda_steps, brezenhem_float_steps, brezenhem_int_steps,
+                                         brezenhem_st_steps, vu_steps]):
+            steps[i].append(count_steps(point, end))
+
+        cur_angle += step
+        job.report(cur_angle, 90)
+    return steps
+
+
+def measure_times(job: Job, point: Point, angle: float, length: float) -> List[float]:
+    algs = [brezenhem_int, brezenhem_float, brezenhem_st, cda, vu]
+    run_times = []
+    for k, alg in enumerate(algs):
+        sum_time = 0
+
+        for i in range(num_tests):
+            start = time()
+            cur_angle = 0
+            while cur_angle < 360:
+                alg(point, Point(point.x + length * cos(radians(cur_angle)),
+                                 point.y + length * sin(radians(cur_angle))))
+                cur_angle += angle
+            sum_time += time() - start
+            job.report(k * num_tests + i + 1, len(algs) * num_tests)
+
+        run_times.append(sum_time / num_tests)
+    return run_times
+
+
 class Ui(QtWidgets.QMainWindow):
     def __init__(self):
         super(Ui, self).__init__()
         uic.loadUi("./out/template.ui", self)  # временно в корне
+        self.jobs = JobControls(self)
 
         self.scene = QGraphicsScene()
         self.graphicsView.setScene(self.scene)
-        self.need_grid()
-        self.add_grid()
+        self.grid = GridBackground(self.graphicsView)
+        self.update_grid()
+
+        self.canvas = PixelCanvas(current_line_color)
+        self.canvas.setZValue(1)
+        self.scene.addItem(self.canvas)
 
         # menu bar
         self.about_author.triggered.connect(show_author)
@@ -110,6 +158,7 @@ class Ui(QtWidgets.QMainWindow):
 
         self.graphicsView.setMouseTracking(True)
 
+        self.input = InputCoalescer(self.apply_mouse_move, self.apply_wheel, self)
         self.graphicsView.mousePressEvent = self.mousePressEvent
         self.graphicsView.wheelEvent = self.wheel_event
         self.graphicsView.mouseReleaseEvent = self.mouseReleaseEvent
@@ -117,119 +166,65 @@ class Ui(QtWidgets.QMainWindow):
 
         self.show()
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.jobs.stop()
+        super().closeEvent(event)
+
     def wheel_event(self, event: QWheelEvent) -> None:
-        global scale
-        factor = 1.2
+        self.input.wheel(1 if event.angleDelta().y() > 0 else -1)
 
-        if event.angleDelta().y() > 0:
-            self.graphicsView.scale(factor, factor)
-        else:
-            self.graphicsView.scale(1.0 / factor, 1.0 / factor)
+    def apply_wheel(self, steps: int) -> None:
+        # steps - сумма шагов колесика за кадр, каждый шаг - масштаб в 1.2 раза
+        global scale
+        factor = 1.2 ** steps
+        self.graphicsView.scale(factor, factor)
 
         # Получаем текущий масштаб по оси X (и Y)
         scale = self.graphicsView.transform().m11()
-        if self.need_grid():
-            for grid_line in grid_lines:
-                if grid_line in self.scene.items():
-                    self.scene.removeItem(grid_line)
-            self.add_grid()
+        self.update_grid()
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         global is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = False
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        self.input.move(event.pos())
+
+    def apply_mouse_move(self, pos: QPoint) -> None:
         global last_pos
         if is_pressed:
-            dx = event.pos().x() - last_pos.x()
-            dy = event.pos().y() - last_pos.y()
+            dx = pos.x() - last_pos.x()
+            dy = pos.y() - last_pos.y()
             self.graphicsView.horizontalScrollBar().setValue(
                 self.graphicsView.horizontalScrollBar().value() - dx)
             self.graphicsView.verticalScrollBar().setValue(
                 self.graphicsView.verticalScrollBar().value() - dy)
-            last_pos = event.pos()
-            if self.need_grid():
-                for grid_line in grid_lines:
-                    if grid_line in self.scene.items():
-                        self.scene.removeItem(grid_line)
-                self.add_grid()
-        scene_pos = self.graphicsView.mapToScene(event.pos())
+            last_pos = pos
+        scene_pos = self.graphicsView.mapToScene(pos)
         self.current_coords_label.setText(
             f'x :{scene_pos.x():.2f}, y :{-scene_pos.y():.2f}')
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         global last_pos, is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = True
             last_pos = event.pos()
 
-    def need_grid(self) -> bool:
-        global max_win_size
-        flag: bool = False
-        max_size = self.graphicsView.maximumSize()
-        max_width = int(max_size.width() * (1 / scale))
-        max_height = int(max_size.height() * (1 / scale))
-        grid_interval = int(50 * (1 / scale))
-        grid_interval = round(grid_interval / 50) * 50
-        if grid_interval != max_win_size[2]:
-            max_win_size[2] = grid_interval
-            flag = True
-        if max_win_size[0] < max_width and max_win_size[1] < max_height:
-            max_win_size[0] = max_width
-            max_win_size[1] = max_height
-            flag = True
-        return flag
-
-    def add_grid(self) -> None:
-        global grid_lines, max_win_size
-        max_width = max_win_size[0]
-        max_height = max_win_size[1]
-        grid_interval = max_win_size[2]
-        if grid_interval == 0:
-            grid_interval = 20
-        self.current_grid_label.setText(f'Текущий шаг сетки: {grid_interval}')
-        start_grid_width = - ((max_width // 2) +
-                              grid_interval - (max_width // 2) % grid_interval)
-        start_grid_height = - \
-            ((max_height // 2) + grid_interval - (max_height // 2) % grid_interval)
-        end_grid_width = (max_width // 2) - (max_width // 2) % grid_interval
-        end_grid_height = (max_height // 2) - (max_width // 2) % grid_interval
-        pen = QPen(Qt.darkGray)
-        pen_width = 1 if int(1 / scale) == 0 else int(1 / scale)
-        pen.setWidth(pen_width)
-        for x in range(start_grid_width, end_grid_width, grid_interval):
-            line = QGraphicsLineItem(x, start_grid_height, x, end_grid_height)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-        for y in range(start_grid_height, end_grid_height, grid_interval):
-            line = QGraphicsLineItem(start_grid_width, y, end_grid_width, y)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-
-        axis_x = QGraphicsLineItem(-300 * (1 / scale), 0, 300 * (1 / scale), 0)
-        axis_y = QGraphicsLineItem(0, -300 * (1 / scale), 0, 300 * (1 / scale))
-        pen.setColor(Qt.white)
-        grid_lines.append(axis_x)
-        grid_lines.append(axis_y)
-        axis_x.setPen(pen)
-        axis_y.setPen(pen)
-        axis_x.setZValue(0)
-        axis_y.setZValue(0)
-        self.scene.addItem(axis_x)
-        self.scene.addItem(axis_y)
+    def update_grid(self) -> None:
+        if self.grid.update(scale):
+            self.current_grid_label.setText(f'Текущий шаг сетки: {self.grid.step}')
 
     def set_lines_color(self, color: QColor) -> None:
         global current_line_color
         current_line_color = color
         lines = self.scene.items()
         for line in lines:
-            if line not in grid_lines:
+            if line is not self.canvas:
                 line.setPen(current_line_color)
+        self.canvas.set_color(current_line_color)
 
     def set_bg_color(self, color: QColor) -> None:
         background_brush = QBrush(color)
@@ -237,8 +232,9 @@ class Ui(QtWidgets.QMainWindow):
 
     def clear_scene(self):
         for item in self.scene.items():
-            if item not in grid_lines:
+            if item is not self.canvas:
                 self.scene.removeItem(item)
+        self.canvas.clear()
 
     def get_segment_coords(self) -> Tuple[Point, Point]:
         x_1_str = self.set_x1.text()
@@ -264,26 +260,13 @@ class Ui(QtWidgets.QMainWindow):
             p1, p2 = params
 
         current_points = self.get_points(p1, p2)
-        if not current_points:
+        if isinstance(current_points, tuple):
+            self.draw_pixels(*current_points)
             return
+        self.canvas.add_points(current_points)
 
-        if type(current_points[0]) is Point:
-            for point in current_points:
-                part = QGraphicsRectItem(point.x, -point.y, 1, 1)
-                part.setZValue(1)
-                part.setPen(current_line_color)
-                self.scene.addItem(part)
-        elif type(current_points[0]) is tuple:
-            for i in range(len(current_points)):
-                point = current_points[i][0]
-                intensity = current_points[i][1]
-
-                part = QGraphicsRectItem(point.x, -point.y, 1, 1)
-                part.setZValue(1)
-                part_color = QColor(current_line_color)
-                part_color.setAlpha(int(intensity))
-                part.setPen(part_color)
-                self.scene.addItem(part)
+    def draw_pixels(self, xs, ys, intensities=None) -> None:
+        self.canvas.add_pixels(xs, ys, intensities)
 
     def draw_spectre(self, center: Point = None, angle: float = None, length: float = None) -> None:
         if center is None or angle is None or length is None:
@@ -293,6 +276,11 @@ class Ui(QtWidgets.QMainWindow):
 
             center, angle, length = params
 
+        if self.numpy_backend_cb.isChecked() and not self.bibl_alg_rbutton.isChecked():
+            pixels = self.get_spectre_pixels(center, angle, length)
+            self.draw_pixels(*pixels.T)
+            return
+
         cur_angle = 0
 
         while cur_angle < 360:
@@ -315,7 +303,9 @@ class Ui(QtWidgets.QMainWindow):
 
         return Point(x_c, y_c), angle, length
 
-    def get_points(self, p1: Point, p2: Point) -> Union[List[Point], List[Tuple[Point, float]]]:
+    def get_points(self, p1: Point, p2: Point) -> Union[PointBuffer, List[Point], Pixels, ShadedPixels]:
+        if self.numpy_backend_cb.isChecked() and not self.bibl_alg_rbutton.isChecked():
+            return self.get_points_np(p1, p2)
         if self.brezenhem_int_rbutton.isChecked():
             return brezenhem_int(p1, p2)
         elif self.brezenhem_float_rbutton.isChecked():
@@ -333,28 +323,49 @@ class Ui(QtWidgets.QMainWindow):
             self.scene.addItem(line)
             return []
 
-    def ladder_test(self, *args):
-        if isinstance(args[0], bool):
-            params = self.get_spectre_coeff()
-            if params is None:
-                return
-            point, angle, length = params
-        else:
-            x, y, angle, length = args
-            point = Point(x, y)
+    def get_spectre_pixels(self, center: Point, angle: float, length: float) -> np.ndarray:
+        if self.brezenhem_int_rbutton.isChecked():
+            return brezenhem_int_spectre(center, angle, length)
+        elif self.brezenhem_float_rbutton.isChecked():
+            return brezenhem_float_spectre(center, angle, length)
+        elif self.brezenhem_st_rbutton.isChecked():
+            return brezenhem_st_spectre(center, angle, length)
+        elif self.cda_alg_rbutton.isChecked():
+            return cda_spectre(center, angle, length)
+        elif self.vu_alg_rbutton.isChecked():
+            return vu_spectre(center, angle, length)
 
-        steps = [[] for _ in range(5)]
-        step = 5
-        cur_angle = 0
+    def get_points_np(self, p1: Point, p2: Point) -> Union[Pixels, ShadedPixels]:
+        if self.brezenhem_int_rbutton.isChecked():
+            return brezenhem_int_np(p1, p2)
+        elif self.brezenhem_float_rbutton.isChecked():
+            return brezenhem_float_np(p1, p2)
+        elif self.brezenhem_st_rbutton.isChecked():
+            return brezenhem_st_np(p1, p2)
+        elif self.cda_alg_rbutton.isChecked():
+            return cda_np(p1, p2)
+        elif self.vu_alg_rbutton.isChecked():
+            return vu_np(p1, p2)
 
-        while cur_angle < 90:
-            for i, alg in enumerate([cda, brezenhem_float, brezenhem_int, brezenhem_st, vu]):
-                cur_steps = alg(Point(point.x, point.y), Point(point.x + length * cos(radians(cur_angle)),
-                                                               point.y + length * sin(radians(cur_angle))), True)
-                steps[i].append(cur_steps)
+    def get_test_params(self, args) -> Union[Tuple[Point, float, float], None]:
+        if isinstance(args[0], bool):
+            return self.get_spectre_coeff()
+        x, y, angle, length = args
+        return Point(x, y), angle, length
 
-            cur_angle += step
+    def ladder_test(self, *args):
+        params = self.get_test_params(args)
+        if params is None:
+            return
+        point, angle, length = params
+
+        job = Job(count_ladder_steps, point, length, 5, parent=self)
+        job.result_ready.connect(lambda steps: self.show_ladder_test(steps, length, 5))
+        self.jobs.start(job, self.ladder_test_button, self.time_test_button)
+        if FUNC_TESTING:
+            self.jobs.wait()
 
+    def show_ladder_test(self, steps: List[List[int]], length: float, step: int) -> None:
         pyplot.figure(figsize=(20, 20))
         pyplot.title(f"Сравнение ступенчатости алгоритмов при разных углах, длина: {length}")
         pyplot.xlabel("Угол, °")
@@ -375,31 +386,18 @@ class Ui(QtWidgets.QMainWindow):
             pyplot.savefig(f'./results/ladder_test_{test_i}.png')
 
     def time_test(self, *args):
-        if isinstance(args[0], bool):
-            params = self.get_spectre_coeff()
-            if params is None:
-                return
-
-            point, angle, length = params
-        else:
-            x, y, angle, length = args
-            point = Point(x, y)
-
-        run_times = []
-        for alg in [brezenhem_int, brezenhem_float, brezenhem_st, cda, vu]:
-            sum_time = 0
-
-            for _ in range(num_tests):
-                start = time()
-                cur_angle = 0
-                while cur_angle < 360:
-                    alg(point, Point(point.x + length * cos(radians(cur_angle)),
-                                     point.y + length * sin(radians(cur_angle))))
-                    cur_angle += angle
-                sum_time += time() - start
+        params = self.get_test_params(args)
+        if params is None:
+            return
+        point, angle, length = params
 
-            run_times.append(sum_time / num_tests)
+        job = Job(measure_times, point, angle, length, parent=self)
+        job.result_ready.connect(self.show_time_test)
+        self.jobs.start(job, self.ladder_test_button, self.time_test_button)
+        if FUNC_TESTING:
+            self.jobs.wait()
 
+    def show_time_test(self, run_times: List[float]) -> None:
         pyplot.figure(figsize=(20, 20))
         pyplot.title("Сравнение времени работы алгоритмов")
         pyplot.xlabel("Название алгоритма")
@@ -434,6 +432,8 @@ if __name__ == '__main__':
             window.bibl_alg_rbutton.setChecked(True)
         elif sys.argv[7] == 'br_st':
             window.brezenhem_st_rbutton.setChecked(True)
+        if len(sys.argv) > 8 and sys.argv[8] == 'np':
+            window.numpy_backend_cb.setChecked(True)
 
         if sys.argv[2] == 'segment':
             x_1 = float(sys.argv[3])
@@ -1,5 +1,18 @@
-from point_algs import sign, brezenhem_float, vu
+from point_algs import sign, brezenhem_float, brezenhem_int, brezenhem_st, cda, vu
+from point_algs_np import brezenhem_float_np, brezenhem_int_np, brezenhem_st_np, cda_np, vu_np
+from spectre_algs import brezenhem_float_spectre, brezenhem_int_spectre, brezenhem_st_spectre, cda_spectre, \
+    vu_spectre
+from pixel_canvas import PixelCanvas
+from point_buffer import PointBuffer
+from benchmark import summarize
+from ladder_steps import brezenhem_float_steps, brezenhem_int_steps, brezenhem_st_steps, cda_steps, vu_steps
 from class_point import Point
+from PyQt5.QtGui import QColor, QBrush
+from math import radians, cos, sin
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
+from PyQt5.QtCore import QPoint, QLineF, QRectF, QPointF
+from PyQt5.QtWidgets import QApplication, QGraphicsScene, QGraphicsView
 import pytest
 
 
@@ -40,3 +53,180 @@ def test_vu_point(null_point):
         assert _[0].x == 0.0
         assert _[0].y == 0.0
         assert _[1] == 255
+
+
+def test_brezenhem_np_match():
+    for x2, y2 in [(5, 0), (10, 3), (-7, 12), (3.3, -8.7), (100, 10)]:
+        p1, p2 = segment(0.5, -1, x2, y2)
+        for alg, alg_np in [(brezenhem_int, brezenhem_int_np), (brezenhem_float, brezenhem_float_np)]:
+            ref = alg(p1, p2)
+            xs, ys = alg_np(p1, p2)
+            assert [(p.x, p.y) for p in ref] == list(zip(xs, ys))
+
+
+def test_shaded_np_match():
+    for x2, y2 in [(5, 0), (10, 3), (-7, 12), (3.3, -8.7), (-40, -40)]:
+        for alg, alg_np in [(brezenhem_st, brezenhem_st_np), (vu, vu_np)]:
+            ref = alg(*segment(1, 2, x2, y2))
+            xs, ys, intensity = alg_np(*segment(1, 2, x2, y2))
+            assert [(p.x, p.y, i) for p, i in ref] == list(zip(xs, ys, intensity))
+
+
+def test_cda_np_match():
+    p1, p2 = segment(0, 0, 10, 3)
+    xs, ys = cda_np(p1, p2)
+    assert [(p.x, p.y) for p in cda(p1, p2)] == list(zip(xs, ys))
+
+
+def test_vu_np_point(null_point):
+    xs, ys, intensity = vu_np(null_point, null_point)
+    assert list(zip(xs, ys, intensity)) == [(0.0, 0.0, 255)]
+
+
+def test_spectre_match():
+    pairs = [(brezenhem_int, brezenhem_int_spectre), (brezenhem_float, brezenhem_float_spectre),
+             (brezenhem_st, brezenhem_st_spectre), (cda, cda_spectre), (vu, vu_spectre)]
+    center = Point(-10.5, 4)
+    for alg, alg_spectre in pairs:
+        ref = []
+        cur_angle = 0
+        while cur_angle < 360:
+            end = Point(center.x + 40 * cos(radians(cur_angle)), center.y + 40 * sin(radians(cur_angle)))
+            for p in alg(Point(center.x, center.y), end):
+                ref.append((p[0].x, p[0].y, p[1]) if isinstance(p, tuple) else (p.x, p.y))
+            cur_angle += 7.5
+        assert ref == [tuple(row) for row in alg_spectre(center, 7.5, 40).tolist()]
+
+
+def test_spectre_zero_length():
+    # отрезки нулевой длины - одна точка в дробном центре, как у обычных алгоритмов
+    pairs = [(brezenhem_int, brezenhem_int_spectre), (brezenhem_float, brezenhem_float_spectre),
+             (brezenhem_st, brezenhem_st_spectre), (cda, cda_spectre), (vu, vu_spectre)]
+    center = Point(1.5, 2)
+    for alg, alg_spectre in pairs:
+        ref = []
+        for p in alg(Point(center.x, center.y), Point(center.x, center.y)):
+            ref.append((p[0].x, p[0].y, p[1]) if isinstance(p, tuple) else (p.x, p.y))
+        assert ref * 4 == [tuple(row) for row in alg_spectre(center, 90, 0).tolist()]
+
+
+def test_ladder_steps_match():
+    pairs = [(cda, cda_steps), (brezenhem_float, brezenhem_float_steps), (brezenhem_int, brezenhem_int_steps),
+             (brezenhem_st, brezenhem_st_steps), (vu, vu_steps)]
+    for x, y in [(0, 0), (0.5, 0.5), (-37.3, 12.9)]:
+        for length in [7, 100, 333]:
+            for cur_angle in range(0, 90, 5):
+                end = (x + length * cos(radians(cur_angle)), y + length * sin(radians(cur_angle)))
+                for alg, count_steps in pairs:
+                    assert alg(Point(x, y), Point(*end), True) == count_steps(Point(x, y), Point(*end))
+
+
+def test_point_buffer():
+    points = PointBuffer(2, shaded=True)
+    for i in range(5):
+        points.append(i, -i, 255 * i / 4)
+    assert len(points) == 5 and points[-1] == (Point(4, -4), 255)
+    tail = points[1:3]
+    assert [(p.x, p.y, i) for p, i in tail] == [(1, -1, 63.75), (2, -2, 127.5)]
+    assert tail.xs.base is points.x_data
+    tail.append(9, 9, 0)
+    assert points[3] == (Point(3, -3), 191.25)
+
+
+def test_canvas_blending():
+    canvas = PixelCanvas(QColor(255, 0, 0))
+    canvas.add_pixels([0, 0, 300], [0, 0, -5], [127.5, 127.5, 255])
+    assert set(canvas.tiles) == {(0, 0), (1, 0)}
+    tile = canvas.tiles[(0, 0)]
+    assert abs(tile.coverage[0, 0] - (1 - (128 / 255) ** 2)) < 1e-6
+    canvas.render_tile(tile)
+    assert tile.argb[0, 0] == 0xBFFF0000 and tile.argb[0, 1] == 0
+
+
+def test_benchmark_summarize():
+    stats = summarize(list(range(1, 101)))
+    assert stats['median_ns'] == 50.5
+    assert abs(stats['p95_ns'] - 95.05) < 1e-9
+    assert abs(stats['iqr_ns'] - 49.5) < 1e-9
+
+
+def test_input_coalescer():
+    # за кадр от движений остается последняя позиция, шаги колесика складываются
+    # и применяются раньше движения; первое событие кадра применяется сразу
+    calls = []
+    coalescer = InputCoalescer(lambda pos: calls.append(('move', pos)), lambda steps: calls.append(('wheel', steps)))
+    coalescer.move(QPoint(1, 1))
+    for i in range(2, 5):
+        coalescer.move(QPoint(i, i))
+    for steps in (1, 2, -1):
+        coalescer.wheel(steps)
+    assert calls == [('move', QPoint(1, 1))]
+    coalescer.flush()
+    assert calls == [('move', QPoint(1, 1)), ('wheel', 2), ('move', QPoint(4, 4))]
+    coalescer.next_frame()
+    assert len(calls) == 3
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def grid_view(qt_app):
+    view = QGraphicsView()
+    view.setScene(QGraphicsScene())
+    view.setMaximumSize(800, 600)
+    return view
+
+
+def old_grid_lines(max_width: int, max_height: int, interval: int, scale: float):
+    # линии сетки и осей так, как их строил add_grid элементами сцены
+    step = interval if interval != 0 else 20
+    start_width = - ((max_width // 2) + step - (max_width // 2) % step)
+    start_height = - ((max_height // 2) + step - (max_height // 2) % step)
+    end_width = (max_width // 2) - (max_width // 2) % step
+    end_height = (max_height // 2) - (max_width // 2) % step
+    vertical = [QLineF(x, start_height, x, end_height) for x in range(start_width, end_width, step)]
+    horizontal = [QLineF(start_width, y, end_width, y) for y in range(start_height, end_height, step)]
+    axes = [QLineF(-300 * (1 / scale), 0, 300 * (1 / scale), 0), QLineF(0, -300 * (1 / scale), 0, 300 * (1 / scale))]
+    return vertical, horizontal, axes
+
+
+def test_grid_update(grid_view):
+    grid = GridBackground(grid_view)
+    assert grid.update(1.0)
+    assert (grid.step, grid.max_width, grid.max_height) == (50, 800, 600)
+    assert not grid.update(1.0)
+    assert not grid.update(1.2)  # шаг тот же, границы меньше прежних
+    assert grid.update(0.5)
+    assert (grid.step, grid.max_width, grid.max_height) == (100, 1600, 1200)
+    assert not grid.update(0.5)
+    assert grid_view.scene().sceneRect().contains(grid.bounds())
+
+
+@pytest.mark.parametrize('scale', [1.0, 0.5, 0.3, 2.0])
+def test_grid_extents(grid_view, scale):
+    grid = GridBackground(grid_view)
+    grid.update(scale)
+    vertical, horizontal, axes = old_grid_lines(grid.max_width, grid.max_height, grid.interval, scale)
+    half = grid.pen_width() / 2
+
+    def extent(lines):
+        rect = QRectF()
+        for line in lines:
+            rect |= QRectF(line.p1(), line.p2())
+        return rect.adjusted(-half, -half, half, half)
+
+    assert grid.regions() == (extent(vertical), extent(horizontal))
+    assert grid.bounds() == extent(vertical + horizontal + axes)
+
+
+def test_grid_background_brush(grid_view):
+    grid_view.resize(300, 300)
+    grid_view.setBackgroundBrush(QBrush(QColor(200, 0, 0)))
+    GridBackground(grid_view).update(1.0)
+    image = grid_view.viewport().grab().toImage()
+    # середина клетки сетки, вдали от линий и осей
+    cell = grid_view.mapFromScene(QPointF(25, 25))
+    assert image.pixelColor(cell) == QColor(200, 0, 0)
@@ -0,0 +1,117 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from PyQt5.QtCore import QRectF, QPointF
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+
+from class_point import Point
+from point_buffer import PointBuffer
+
+TILE = 256  # сторона плитки растра в пикселях сцены
+
+
+class Tile:
+    def __init__(self):
+        # покрытие пикселя (0 - пусто, 1 - закрашен полностью) и готовые ARGB-значения
+        self.coverage = np.zeros((TILE, TILE), dtype=np.float32)
+        self.argb = np.zeros((TILE, TILE), dtype=np.uint32)
+        self.image = QImage()
+        self.dirty = False
+
+
+# растровый слой: все пиксели алгоритмов в одном элементе сцены
+class PixelCanvas(QGraphicsItem):
+    def __init__(self, color: QColor):
+        super().__init__()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.color = QColor(color)
+        self.tiles: Dict[Tuple[int, int], Tile] = {}
+        self.rect = QRectF()
+
+    def boundingRect(self) -> QRectF:
+        return self.rect
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None) -> None:
+        exposed = option.exposedRect
+        for (tx, ty), tile in self.tiles.items():
+            tile_rect = QRectF(tx * TILE, ty * TILE, TILE, TILE)
+            if not exposed.intersects(tile_rect):
+                continue
+            if tile.dirty:
+                self.render_tile(tile)
+            painter.drawImage(QPointF(tx * TILE, ty * TILE), tile.image)
+
+    def render_tile(self, tile: Tile) -> None:
+        rgb = self.color.rgb() & 0xFFFFFF
+        alpha = np.rint(tile.coverage * self.color.alpha()).astype(np.uint32)
+        np.bitwise_or(alpha << 24, rgb, out=tile.argb)
+        tile.argb[alpha == 0] = 0
+        # новый QImage над тем же буфером, чтобы не сработал кэш по cacheKey
+        tile.image = QImage(tile.argb.data, TILE, TILE, TILE * 4, QImage.Format_ARGB32)
+        tile.dirty = False
+
+    def get_tile(self, tx: int, ty: int) -> Tile:
+        tile = self.tiles.get((tx, ty))
+        if tile is None:
+            self.prepareGeometryChange()
+            tile = Tile()
+            self.tiles[(tx, ty)] = tile
+            self.rect = self.rect.united(QRectF(tx * TILE, ty * TILE, TILE, TILE))
+        return tile
+
+    def add_pixels(self, xs, ys, intensities=None) -> None:
+        # координаты как у алгоритмов (ось y вверх), интенсивность 0..255 смешивается поверх
+        cols = np.floor(np.asarray(xs, dtype=np.float64)).astype(np.int64)
+        rows = np.floor(-np.asarray(ys, dtype=np.float64)).astype(np.int64)
+        if len(cols) == 0:
+            return
+        if intensities is None:
+            transparency = None
+        else:
+            alpha = np.clip(np.trunc(np.asarray(intensities, dtype=np.float64)), 0, 255) / 255
+            transparency = 1 - alpha
+
+        tx = np.floor_divide(cols, TILE)
+        ty = np.floor_divide(rows, TILE)
+        order = np.lexsort((tx, ty))
+        tx, ty = tx[order], ty[order]
+        index = (rows[order] - ty * TILE) * TILE + (cols[order] - tx * TILE)
+        if transparency is not None:
+            transparency = transparency[order]
+        bounds = np.flatnonzero((np.diff(tx) != 0) | (np.diff(ty) != 0)) + 1
+
+        for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(index)]))):
+            tile = self.get_tile(int(tx[start]), int(ty[start]))
+            coverage = tile.coverage.reshape(-1)
+            if transparency is None:
+                coverage[index[start:end]] = 1
+            else:
+                # одинаковый цвет у всех пикселей вызова, поэтому порядок наложения не важен
+                keep = np.ones(TILE * TILE, dtype=np.float32)
+                np.multiply.at(keep, index[start:end], transparency[start:end])
+                np.subtract(1, (1 - coverage) * keep, out=coverage)
+            tile.dirty = True
+        self.update()
+
+    def add_points(self, points: Union[PointBuffer, List[Point], List[Tuple[Point, float]]]) -> None:
+        if not points:
+            return
+        if isinstance(points, PointBuffer):
+            self.add_pixels(points.xs, points.ys, points.intensities)
+        elif isinstance(points[0], tuple):
+            self.add_pixels([p[0].x for p in points], [p[0].y for p in points], [p[1] for p in points])
+        else:
+            self.add_pixels([p.x for p in points], [p.y for p in points])
+
+    def set_color(self, color: QColor) -> None:
+        self.color = QColor(color)
+        for tile in self.tiles.values():
+            tile.dirty = True
+        self.update()
+
+    def clear(self) -> None:
+        self.prepareGeometryChange()
+        self.tiles.clear()
+        self.rect = QRectF()
+        self.update()
@@ -1,7 +1,8 @@
 from math import floor, fabs
-from typing import List, Union, Tuple
+from typing import Union
 
 from class_point import Point
+from point_buffer import PointBuffer
 
 
 def sign(n: Union[int, float]) -> int:
@@ -12,12 +13,12 @@ def sign(n: Union[int, float]) -> int:
     return 1
 
 
-def brezenhem_int(p1: Point, p2: Point, testing=False) -> Union[List[Point], int]:
-    points = []
+def brezenhem_int(p1: Point, p2: Point, testing=False) -> Union[PointBuffer, int]:
+    points = PointBuffer()
     steps = 0
 
     if abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13:
-        points.append(Point(p1.x, p1.y))
+        points.append(p1.x, p1.y)
         return points
 
     dx = p2.x - p1.x
@@ -43,7 +44,7 @@ def brezenhem_int(p1: Point, p2: Point, testing=False) -> Union[List[Point], int
 
     for i in range(1, int(dx + 1)):
         if not testing:
-            points.append(Point(x, y))
+            points.append(x, y)
 
         if f >= 0:
             if swap:
@@ -67,12 +68,12 @@ def brezenhem_int(p1: Point, p2: Point, testing=False) -> Union[List[Point], int
     return points if not testing else steps
 
 
-def brezenhem_float(p1: Point, p2: Point, testing=False) -> Union[List[Point], int]:
-    points = []
+def brezenhem_float(p1: Point, p2: Point, testing=False) -> Union[PointBuffer, int]:
+    points = PointBuffer()
     steps = 0
 
     if abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13:
-        points.append(Point(p1.x, p1.y))
+        points.append(p1.x, p1.y)
         return points
 
     dx = p2.x - p1.x
@@ -104,7 +105,7 @@ def brezenhem_float(p1: Point, p2: Point, testing=False) -> Union[List[Point], i
 
     for i in range(int(dx + 1)):
         if not testing:
-            points.append(Point(x, y))
+            points.append(x, y)
         if f >= 0:
             if fl:
                 x = x + sx
@@ -125,12 +126,12 @@ def brezenhem_float(p1: Point, p2: Point, testing=False) -> Union[List[Point], i
     return points if not testing else steps
 
 
-def brezenhem_st(p1: Point, p2: Point, testing=False) -> Union[List[Tuple[Point, float]], int]:
-    points = []
+def brezenhem_st(p1: Point, p2: Point, testing=False) -> Union[PointBuffer, int]:
+    points = PointBuffer(shaded=True)
     steps = 0
 
     if abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13:
-        points.append((Point(p1.x, p1.y), 255))
+        points.append(p1.x, p1.y, 255)
         return points
 
     dx = p2.x - p1.x
@@ -162,7 +163,7 @@ def brezenhem_st(p1: Point, p2: Point, testing=False) -> Union[List[Tuple[Point,
 
     for i in range(1, int(dx + 1)):
         if not testing:
-            points.append((Point(x, y), 255 * f))
+            points.append(x, y, 255 * f)
 
         if f < 1 - m:
             if fl:
@@ -184,11 +185,11 @@ def brezenhem_st(p1: Point, p2: Point, testing=False) -> Union[List[Tuple[Point,
     return points if not testing else steps
 
 
-def cda(p1: Point, p2: Point, testing=False) -> Union[List[Point], int]:
-    points = []
+def cda(p1: Point, p2: Point, testing=False) -> Union[PointBuffer, int]:
+    points = PointBuffer()
 
     if abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13:
-        points.append(Point(p1.x, p1.y))
+        points.append(p1.x, p1.y)
         return points
 
     dx = p2.x - p1.x
@@ -217,20 +218,20 @@ def cda(p1: Point, p2: Point, testing=False) -> Union[List[Point], int]:
         x += dx
         y += dy
         if not testing:
-            points.append(Point(round(x), round(y)))
+            points.append(round(x), round(y))
         elif round(x_) != round(x) and round(y_) != round(y):
             steps += 1
 
     return points if not testing else steps
 
 
-def vu(p1: Point, p2: Point, testing=False) -> Union[List[Tuple[Point, float]], int]:
-    points = []
+def vu(p1: Point, p2: Point, testing=False) -> Union[PointBuffer, int]:
+    points = PointBuffer(shaded=True)
 
     count_steps = 0
 
     if abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13:
-        points.append((Point(p1.x, p1.y), 255))
+        points.append(p1.x, p1.y, 255)
         return points
 
     dx = p2.x - p1.x
@@ -255,8 +256,8 @@ def vu(p1: Point, p2: Point, testing=False) -> Union[List[Tuple[Point, float]],
             d2 = 1 - d1
 
             if not testing:
-                points.append((Point(int(p1.x) + 1, y), round(fabs(d1) * 255)))
-                points.append((Point(int(p1.x), y), round(fabs(d2) * 255)))
+                points.append(int(p1.x) + 1, y, round(fabs(d1) * 255))
+                points.append(int(p1.x), y, round(fabs(d2) * 255))
             elif y < round(p2.y) and int(p1.x) != int(p1.x + intensity):
                 count_steps += 1
 
@@ -278,8 +279,8 @@ def vu(p1: Point, p2: Point, testing=False) -> Union[List[Tuple[Point, float]],
             d2 = 1 - d1
 
             if not testing:
-                points.append((Point(x, int(p1.y) + 1), round(fabs(d1) * 255)))
-                points.append((Point(x, int(p1.y)), round(fabs(d2) * 100)))
+                points.append(x, int(p1.y) + 1, round(fabs(d1) * 255))
+                points.append(x, int(p1.y), round(fabs(d2) * 100))
             elif x < round(p2.x) and int(p1.y) != int(p1.y + intensity):
                 count_steps += 1
 
@@ -0,0 +1,261 @@
+from typing import Tuple, Sequence, Union
+
+import numpy as np
+
+from class_point import Point
+
+Pixels = Tuple[np.ndarray, np.ndarray]
+ShadedPixels = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+MAX_FIXES = 2
+
+
+def is_same_point(p1: Point, p2: Point) -> bool:
+    return abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13
+
+
+def accumulate(start: float, step: Union[float, np.ndarray], n: int) -> np.ndarray:
+    # последовательное сложение, как x += step в скалярных алгоритмах
+    steps = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return steps
+    steps[0] = start
+    steps[1:] = step if np.ndim(step) == 0 else step[:n - 1]
+    return np.cumsum(steps)
+
+
+def guess_steps(f: float, n: int, threshold: float, major: float, diff: float) -> np.ndarray:
+    # аналитическое решение для точной арифметики: диагональный шаг там,
+    # где floor((f - threshold + i * major) / diff) увеличивается
+    g = np.floor((f - threshold + np.arange(-1, n) * major) / diff)
+    return np.diff(g) > 0
+
+
+def trace_error(f: float, steps: np.ndarray, ops_table: np.ndarray) -> np.ndarray:
+    # значения ошибки перед каждым шагом при заданных решениях
+    width = ops_table.shape[1]
+    values = np.empty(len(steps) * width + 1, dtype=np.float64)
+    values[0] = f
+    values[1:] = ops_table[steps.view(np.int8)].ravel()
+    return np.cumsum(values)[:-1:width]
+
+
+def sequential_steps(f: float, n: int, threshold: float, major_ops: Sequence[float],
+                     minor_ops: Sequence[float]) -> np.ndarray:
+    # решения подряд, как в скалярном цикле (операции прибавляются в том же порядке), но без
+    # построения точек - их потом строит walk; для отрезков с частыми "ничьими"
+    steps = []
+    append = steps.append
+    if len(major_ops) == 2:
+        (major_a, major_b), (minor_a, minor_b) = major_ops, minor_ops
+        for _ in range(n):
+            if f >= threshold:
+                append(True)
+                f = f + minor_a + minor_b
+            else:
+                append(False)
+                f = f + major_a + major_b
+    else:
+        (major_a,), (minor_a,) = major_ops, minor_ops
+        for _ in range(n):
+            if f >= threshold:
+                append(True)
+                f = f + minor_a
+            else:
+                append(False)
+                f = f + major_a
+    return np.array(steps, dtype=bool)
+
+
+def solve_steps(f: float, n: int, threshold: float, major_ops: Sequence[float],
+                minor_ops: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    # шаги по неосновной оси для ошибки вида f >= threshold;
+    # аналитическое приближение уточняется, пока не совпадет с вещественной
+    # арифметикой скалярного алгоритма (расхождения бывают только в "ничьих")
+    ops_table = np.array([major_ops, minor_ops], dtype=np.float64)
+    major = sum(major_ops)
+    diff = major - sum(minor_ops)
+    steps = guess_steps(f, n, threshold, major, diff)
+    start = 0
+    cur_f = f
+    fixes = 0
+    while start < n:
+        if fixes == MAX_FIXES:
+            # много "ничьих" (рациональный наклон, например у целых концов): каждая зависит от ошибок
+            # округления перед ней, и уточнять приближение пришлось бы по разу на ничью - дешевле
+            # досчитать решения подряд
+            steps[start:] = sequential_steps(cur_f, n - start, threshold, major_ops, minor_ops)
+            break
+        values = trace_error(cur_f, steps[start:], ops_table)
+        actual = values >= threshold
+        wrong = np.flatnonzero(actual != steps[start:])
+        if wrong.size == 0:
+            break
+        i = start + wrong[0]
+        steps[i] = actual[wrong[0]]
+        cur_f = float(values[wrong[0]])
+        for op in (minor_ops if steps[i] else major_ops):
+            cur_f += op
+        start = i + 1
+        fixes += 1
+        steps[start:] = guess_steps(cur_f, n - start, threshold, major, diff)
+    if start == 0:
+        return steps, values if n else np.empty(0)
+    return steps, trace_error(f, steps, ops_table)
+
+
+def walk(p: Point, n: int, sx: int, sy: int, steps: np.ndarray, swap: bool) -> Pixels:
+    major = np.ones(n, dtype=np.float64)
+    minor = steps[:n].astype(np.float64)
+    if swap:
+        return accumulate(p.x, sx * minor, n), accumulate(p.y, sy * major, n)
+    return accumulate(p.x, sx * major, n), accumulate(p.y, sy * minor, n)
+
+
+def brezenhem_int_np(p1: Point, p2: Point) -> Pixels:
+    if is_same_point(p1, p2):
+        return np.array([p1.x], dtype=np.float64), np.array([p1.y], dtype=np.float64)
+
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+    sx = int(np.sign(dx))
+    sy = int(np.sign(dy))
+    dx = abs(dx)
+    dy = abs(dy)
+
+    swap = dy > dx
+    if swap:
+        dx, dy = dy, dx
+
+    n = len(range(1, int(dx + 1)))
+    steps, _ = solve_steps(2 * dy - dx, n, 0, (0.0, 2 * dy), (-2 * dx, 2 * dy))
+    return walk(p1, n, sx, sy, steps, swap)
+
+
+def brezenhem_float_np(p1: Point, p2: Point) -> Pixels:
+    if is_same_point(p1, p2):
+        return np.array([p1.x], dtype=np.float64), np.array([p1.y], dtype=np.float64)
+
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+    sx = int(np.sign(dx))
+    sy = int(np.sign(dy))
+    dx = abs(dx)
+    dy = abs(dy)
+
+    if dx <= 1e-13:
+        m = 10e9
+    else:
+        m = dy / dx
+
+    swap = m > 1
+    if swap:
+        dx, dy = dy, dx
+        m = 1 / m
+
+    n = int(dx + 1)
+    steps, _ = solve_steps(m - 0.5, n, 0, (0.0, m), (-1.0, m))
+    return walk(p1, n, sx, sy, steps, swap)
+
+
+def brezenhem_st_np(p1: Point, p2: Point) -> ShadedPixels:
+    if is_same_point(p1, p2):
+        return np.array([p1.x], dtype=np.float64), np.array([p1.y], dtype=np.float64), \
+            np.array([255], dtype=np.float64)
+
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+    sx = int(np.sign(dx))
+    sy = int(np.sign(dy))
+    dx = abs(dx)
+    dy = abs(dy)
+
+    swap = dy > dx
+    if swap:
+        dx, dy = dy, dx
+
+    if abs(dx) < 1e-13:
+        m = 10e9
+    else:
+        m = dy / dx
+
+    n = len(range(1, int(dx + 1)))
+    w = 1 - m
+    steps, f = solve_steps(0.5, n, w, (m,), (-w,))
+    xs, ys = walk(p1, n, sx, sy, steps, swap)
+    return xs, ys, 255 * f
+
+
+def cda_np(p1: Point, p2: Point) -> Pixels:
+    if is_same_point(p1, p2):
+        return np.array([p1.x]), np.array([p1.y])
+
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+
+    if abs(dx) > abs(dy):
+        L = abs(dx)
+    else:
+        L = abs(dy)
+
+    dx /= L
+    dy /= L
+
+    n = int(L)
+    xs = accumulate(p1.x, dx, n + 1)[1:]
+    ys = accumulate(p1.y, dy, n + 1)[1:]
+    return np.rint(xs).astype(np.int64), np.rint(ys).astype(np.int64)
+
+
+def vu_pairs(main: np.ndarray, cross: np.ndarray, far_scale: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # пара пикселей на каждый шаг: (int + 1, d1) и (int, d2)
+    d1 = cross - np.floor(cross)
+    d2 = 1 - d1
+    base = np.trunc(cross).astype(np.int64)
+
+    main_out = np.repeat(main, 2)
+    cross_out = np.empty(2 * len(main), dtype=np.int64)
+    cross_out[0::2] = base + 1
+    cross_out[1::2] = base
+    intensity = np.empty(2 * len(main), dtype=np.int64)
+    intensity[0::2] = np.rint(np.abs(d1) * 255)
+    intensity[1::2] = np.rint(np.abs(d2) * far_scale)
+    return main_out, cross_out, intensity
+
+
+def vu_np(p1: Point, p2: Point) -> ShadedPixels:
+    if is_same_point(p1, p2):
+        return np.array([p1.x]), np.array([p1.y]), np.array([255], dtype=np.int64)
+
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+    intensity = 1
+    step = 1
+
+    if abs(dy) >= abs(dx):
+        if dy != 0:
+            intensity = dx / dy
+
+        tmp_intensity = intensity
+
+        if p1.y > p2.y:
+            tmp_intensity *= -1
+            step *= -1
+
+        end = round(p2.y) - 1 if dx > dy else round(p2.y) + 1
+        ys = np.arange(round(p1.y), end, step, dtype=np.int64)
+        ys, xs, shades = vu_pairs(ys, accumulate(p1.x, tmp_intensity, len(ys)), 255)
+    else:
+        if dx != 0:
+            intensity = dy / dx
+
+        tmp_intensity = intensity
+
+        if p1.x > p2.x:
+            tmp_intensity *= -1
+            step *= -1
+
+        end = round(p2.x) - 1 if dx < dy else round(p2.x) + 1
+        xs = np.arange(round(p1.x), end, step, dtype=np.int64)
+        xs, ys, shades = vu_pairs(xs, accumulate(p1.y, tmp_intensity, len(xs)), 100)
+    return xs, ys, shades
@@ -0,0 +1,206 @@
+from math import radians, cos, sin
+from typing import List, Tuple
+
+import numpy as np
+
+from class_point import Point
+from point_algs_np import solve_steps
+
+Rays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def spectre_ends(center: Point, angle: float, length: float) -> Tuple[np.ndarray, np.ndarray]:
+    # концы отрезков считаются так же, как в Ui.draw_spectre
+    ends_x: List[float] = []
+    ends_y: List[float] = []
+    cur_angle = 0
+    while cur_angle < 360:
+        ends_x.append(center.x + length * cos(radians(cur_angle)))
+        ends_y.append(center.y + length * sin(radians(cur_angle)))
+        cur_angle += angle
+    return np.array(ends_x, dtype=np.float64), np.array(ends_y, dtype=np.float64)
+
+
+def spectre_rays(center: Point, angle: float, length: float) -> Rays:
+    ends_x, ends_y = spectre_ends(center, angle, length)
+    dx = ends_x - center.x
+    dy = ends_y - center.y
+    same = (np.abs(center.x - ends_x) <= 1e-13) & (np.abs(center.y - ends_y) <= 1e-13)
+    return ends_x, ends_y, dx, dy, same
+
+
+def pack(columns: List[np.ndarray], counts: np.ndarray) -> np.ndarray:
+    # все отрезки спектра в одном буфере: строка = (x, y[, интенсивность])
+    width = columns[0].shape[1] if columns[0].ndim == 2 else 0
+    mask = np.arange(width) < counts[:, None]
+    return np.stack([column[mask] for column in columns], axis=1)
+
+
+def accumulate_rows(start: np.ndarray, steps: np.ndarray) -> np.ndarray:
+    values = np.empty((steps.shape[0], steps.shape[1] + 1), dtype=np.float64)
+    values[:, 0] = start
+    values[:, 1:] = steps
+    return np.cumsum(values, axis=1)
+
+
+def batch_steps(f: np.ndarray, n: np.ndarray, threshold: np.ndarray, major_ops: np.ndarray,
+                minor_ops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    rows, width = major_ops.shape
+    n_max = max(int(n.max()), 1)
+    major = major_ops.sum(axis=1)
+    diff = major - minor_ops.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        g = np.floor(((f - threshold)[:, None] + np.arange(-1, n_max) * major[:, None]) / diff[:, None])
+    steps = np.diff(g, axis=1) > 0
+
+    ops = np.where(steps[:, :, None], minor_ops[:, None, :], major_ops[:, None, :])
+    values = accumulate_rows(f, ops.reshape(rows, -1))[:, :-1:width]
+
+    # строки, где аналитическое решение разошлось с вещественной арифметикой
+    inside = np.arange(n_max) < n[:, None]
+    wrong = (((values >= threshold[:, None]) != steps) & inside).any(axis=1)
+    for i in np.flatnonzero(wrong):
+        k = int(n[i])
+        steps[i, :k], values[i, :k] = solve_steps(float(f[i]), k, float(threshold[i]),
+                                                  tuple(map(float, major_ops[i])),
+                                                  tuple(map(float, minor_ops[i])))
+    return steps, values
+
+
+def walk_rays(center: Point, n: np.ndarray, sx: np.ndarray, sy: np.ndarray, steps: np.ndarray,
+              swap: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n_max = steps.shape[1]
+    minor = steps[:, :max(n_max - 1, 0)].astype(np.float64)
+    major = np.ones_like(minor)
+    swap = swap[:, None]
+    xs = accumulate_rows(np.full(len(n), center.x), sx[:, None] * np.where(swap, minor, major))
+    ys = accumulate_rows(np.full(len(n), center.y), sy[:, None] * np.where(swap, major, minor))
+    return xs, ys
+
+
+def brezenhem_int_spectre(center: Point, angle: float, length: float) -> np.ndarray:
+    _, _, dx, dy, same = spectre_rays(center, angle, length)
+    sx = np.sign(dx)
+    sy = np.sign(dy)
+    dx = np.abs(dx)
+    dy = np.abs(dy)
+
+    swap = dy > dx
+    dx, dy = np.where(swap, dy, dx), np.where(swap, dx, dy)
+
+    n = np.where(same, 0, np.maximum(np.trunc(dx + 1) - 1, 0)).astype(np.int64)
+    zeros = np.zeros_like(dx)
+    steps, _ = batch_steps(2 * dy - dx, n, zeros, np.stack((zeros, 2 * dy), axis=1),
+                           np.stack((-2 * dx, 2 * dy), axis=1))
+    xs, ys = walk_rays(center, n, sx, sy, steps, swap)
+    return pack([xs, ys], np.where(same, 1, n))
+
+
+def brezenhem_float_spectre(center: Point, angle: float, length: float) -> np.ndarray:
+    _, _, dx, dy, same = spectre_rays(center, angle, length)
+    sx = np.sign(dx)
+    sy = np.sign(dy)
+    dx = np.abs(dx)
+    dy = np.abs(dy)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = np.where(dx <= 1e-13, 10e9, dy / dx)
+        swap = m > 1
+        dx = np.where(swap, dy, dx)
+        m = np.where(swap, 1 / m, m)
+
+    n = np.where(same, 0, np.trunc(dx + 1)).astype(np.int64)
+    zeros = np.zeros_like(m)
+    ones = np.ones_like(m)
+    steps, _ = batch_steps(m - 0.5, n, zeros, np.stack((zeros, m), axis=1), np.stack((-ones, m), axis=1))
+    xs, ys = walk_rays(center, n, sx, sy, steps, swap)
+    return pack([xs, ys], np.where(same, 1, n))
+
+
+def brezenhem_st_spectre(center: Point, angle: float, length: float) -> np.ndarray:
+    _, _, dx, dy, same = spectre_rays(center, angle, length)
+    sx = np.sign(dx)
+    sy = np.sign(dy)
+    dx = np.abs(dx)
+    dy = np.abs(dy)
+
+    swap = dy > dx
+    dx, dy = np.where(swap, dy, dx), np.where(swap, dx, dy)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = np.where(np.abs(dx) < 1e-13, 10e9, dy / dx)
+
+    n = np.where(same, 0, np.maximum(np.trunc(dx + 1) - 1, 0)).astype(np.int64)
+    w = 1 - m
+    steps, f = batch_steps(np.full_like(m, 0.5), n, w, m[:, None], -w[:, None])
+    xs, ys = walk_rays(center, n, sx, sy, steps, swap)
+    intensity = 255 * f
+    if same.any():
+        intensity[same, 0] = 255
+    return pack([xs, ys, intensity], np.where(same, 1, n))
+
+
+def cda_spectre(center: Point, angle: float, length: float) -> np.ndarray:
+    _, _, dx, dy, same = spectre_rays(center, angle, length)
+
+    L = np.where(np.abs(dx) > np.abs(dy), np.abs(dx), np.abs(dy))
+    L = np.where(same, 1, L)
+    n = np.where(same, 1, np.trunc(L)).astype(np.int64)
+    n_max = max(int(n.max()), 1)
+
+    step_x = np.repeat((dx / L)[:, None], n_max, axis=1)
+    step_y = np.repeat((dy / L)[:, None], n_max, axis=1)
+    xs = np.rint(accumulate_rows(np.full(len(n), center.x), step_x)[:, 1:])
+    ys = np.rint(accumulate_rows(np.full(len(n), center.y), step_y)[:, 1:])
+    if same.any():
+        xs[same, 0] = center.x
+        ys[same, 0] = center.y
+    return pack([xs, ys], n)
+
+
+def vu_spectre(center: Point, angle: float, length: float) -> np.ndarray:
+    ends_x, ends_y, dx, dy, same = spectre_rays(center, angle, length)
+
+    # ось, вдоль которой идет цикл (y для крутых отрезков), и поперечная ось
+    steep = np.abs(dy) >= np.abs(dx)
+    main_start = np.where(steep, round(center.y), round(center.x))
+    main_end = np.where(steep, ends_y, ends_x)
+    cross_start = np.where(steep, center.x, center.y)
+    main_delta = np.where(steep, dy, dx)
+    cross_delta = np.where(steep, dx, dy)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intensity = np.where(main_delta != 0, cross_delta / main_delta, 1)
+    backward = np.where(steep, center.y > ends_y, center.x > ends_x)
+    intensity = np.where(backward, -intensity, intensity)
+    step = np.where(backward, -1, 1)
+
+    wide = np.where(steep, dx > dy, dx < dy)
+    end = np.where(wide, np.rint(main_end) - 1, np.rint(main_end) + 1)
+    n = np.where(same, 0, np.maximum((end - main_start) * step, 0)).astype(np.int64)
+    n_max = max(int(n.max()), 1)
+
+    main = main_start[:, None] + np.arange(n_max) * step[:, None]
+    cross = accumulate_rows(cross_start, np.repeat(intensity[:, None], max(n_max - 1, 0), axis=1))
+    d1 = cross - np.floor(cross)
+    d2 = 1 - d1
+    base = np.trunc(cross)
+    far_scale = np.where(steep, 255, 100)[:, None]
+
+    main = np.repeat(main, 2, axis=1)
+    cross = np.empty(main.shape, dtype=np.float64)  # центр может быть дробным
+    cross[:, 0::2] = base + 1
+    cross[:, 1::2] = base
+    shades = np.empty_like(main)
+    shades[:, 0::2] = np.rint(np.abs(d1) * 255)
+    shades[:, 1::2] = np.rint(np.abs(d2) * far_scale)
+
+    xs = np.where(steep[:, None], cross, main)
+    ys = np.where(steep[:, None], main, cross)
+    counts = 2 * n
+    if same.any():
+        xs[same, 0] = center.x
+        ys[same, 0] = center.y
+        shades[same, 0] = 255
+        counts = np.where(same, 1, counts)
+    return pack([xs, ys, shades], counts)
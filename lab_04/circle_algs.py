@@ -1,18 +1,20 @@
 from math import sqrt, pi, cos, sin
-from typing import List
 
 from class_point import Point
-from point_funcs import add_symmetr_points
+from point_buffer import PointBuffer
+from point_funcs import add_symmetr_arc
 
 
-def circle_brezenhem(p: Point, radius: float, time_testing=False) -> List[Point]:
-    points = []
+def circle_brezenhem(p: Point, radius: float, time_testing=False) -> PointBuffer:
+    xs = []
+    ys = []
     x = 0
     y = radius
     d = 2 * (1 - radius)
     while x <= y:
         if not time_testing:
-            points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y), True))
+            xs.append(x)
+            ys.append(y)
         d1 = 2 * d + 2 * y - 1
         if d1 < 0:
             x += 1
@@ -22,26 +24,32 @@ def circle_brezenhem(p: Point, radius: float, time_testing=False) -> List[Point]
             y -= 1
             d = d + 2 * (x - y + 1)
     if not time_testing:
+        points = PointBuffer(8 * len(xs))
+        add_symmetr_arc(points, p, xs, ys, True)
         return points
 
 
-def circle_canonical(p: Point, radius: float, time_testing=False) -> List[Point]:
-    points = []
+def circle_canonical(p: Point, radius: float, time_testing=False) -> PointBuffer:
+    xs = []
+    ys = []
     x = 0
     arc_end = round(radius / sqrt(2))  # идем до половины дуги
     while x <= arc_end:
         y = sqrt(radius * radius - x ** 2)
         if not time_testing:
-            points.extend(add_symmetr_points(
-                p, Point(x + p.x, y + p.y), is_circle=True))
+            xs.append(x)
+            ys.append(y)
         x += 1
     if not time_testing:
+        points = PointBuffer(8 * len(xs))
+        add_symmetr_arc(points, p, xs, ys, True)
         return points
 
 
-def circle_param(p: Point, radius: float, time_testing=False) -> List[Point]:
+def circle_param(p: Point, radius: float, time_testing=False) -> PointBuffer:
     t = 1 / radius
-    points = []
+    xs = []
+    ys = []
     angle = 0
 
     while angle <= pi / 4:
@@ -49,21 +57,25 @@ def circle_param(p: Point, radius: float, time_testing=False) -> List[Point]:
         y = round(radius * sin(angle))
         angle += t
         if not time_testing:
-            points.extend(add_symmetr_points(
-                p, Point(x + p.x, y + p.y), is_circle=True))
+            xs.append(x)
+            ys.append(y)
 
     if not time_testing:
+        points = PointBuffer(8 * len(xs))
+        add_symmetr_arc(points, p, xs, ys, True)
         return points
 
 
-def circle_middle_point(p: Point, radius: float, time_testing=False) -> List[Point]:
+def circle_middle_point(p: Point, radius: float, time_testing=False) -> PointBuffer:
     x = 0
     y = radius
-    points = []
+    xs = []
+    ys = []
 
     k = 5 / 4 - radius  # параметр принятия решений
     if not time_testing:
-        points = add_symmetr_points(p, Point(x + p.x, y + p.y), is_circle=True)
+        xs.append(x)
+        ys.append(y)
 
     while x < y:
         x += 1
@@ -73,7 +85,9 @@ def circle_middle_point(p: Point, radius: float, time_testing=False) -> List[Poi
             y -= 1
             k = k + 2 * x + 1 - 2 * y
         if not time_testing:
-            points.extend(add_symmetr_points(
-                p, Point(x + p.x, y + p.y), is_circle=True))
+            xs.append(x)
+            ys.append(y)
     if not time_testing:
+        points = PointBuffer(8 * len(xs))
+        add_symmetr_arc(points, p, xs, ys, True)
         return points
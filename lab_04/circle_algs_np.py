@@ -0,0 +1,34 @@
+from math import sqrt, pi
+
+import numpy as np
+
+from class_point import Point
+from point_buffer import PointBuffer
+from point_funcs import add_symmetr_arc, drop_repeats
+
+
+def accumulate_angles(step: float, limit: float) -> np.ndarray:
+    # последовательное сложение, как angle += step в скалярных алгоритмах
+    steps = np.full(int(limit / step) + 3, step)
+    steps[0] = 0
+    angles = np.cumsum(steps)
+    return angles[angles <= limit]
+
+
+def circle_canonical_np(p: Point, radius: float, time_testing=False) -> PointBuffer:
+    xs = np.arange(round(radius / sqrt(2)) + 1)
+    # у дробных радиусов меньше ~1.4 последний x больше радиуса: под корнем отрицательное, считаем нулем
+    ys = np.sqrt(np.maximum(radius * radius - xs ** 2, 0))
+    if not time_testing:
+        points = PointBuffer(8 * len(xs))
+        add_symmetr_arc(points, p, xs, ys, True)
+        return points
+
+
+def circle_param_np(p: Point, radius: float, time_testing=False) -> PointBuffer:
+    angles = accumulate_angles(1 / radius, pi / 4)
+    xs, ys = drop_repeats(np.rint(radius * np.cos(angles)), np.rint(radius * np.sin(angles)))
+    if not time_testing:
+        points = PointBuffer(8 * len(xs))
+        add_symmetr_arc(points, p, xs, ys, True)
+        return points
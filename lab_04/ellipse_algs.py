@@ -1,20 +1,22 @@
 from math import sqrt, pi, cos, sin
-from typing import List
 
 from class_point import Point
-from point_funcs import add_symmetr_points
+from point_buffer import PointBuffer
+from point_funcs import add_symmetr_arc
 
 
-def ellipse_brezenhem(p: Point, width: float, height: float, time_testing=False) -> List[Point]:
+def ellipse_brezenhem(p: Point, width: float, height: float, time_testing=False) -> PointBuffer:
     x = 0
     y = height
-    points = []
+    xs = []
+    ys = []
 
     d = height * height - width * width * (2 * height - 1)
     y_k = 0
     while y >= y_k:
         if not time_testing:
-            points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y)))
+            xs.append(x)
+            ys.append(y)
         if d <= 0:
             d1 = 2 * d + width * width * (2 * y + 2)
             if d1 < 0:
@@ -35,11 +37,14 @@ def ellipse_brezenhem(p: Point, width: float, height: float, time_testing=False)
             else:
                 d += width * width * (1 - 2 * y)
     if not time_testing:
+        points = PointBuffer(4 * len(xs))
+        add_symmetr_arc(points, p, xs, ys)
         return points
 
 
-def ellipse_canonical(p: Point, width: float, height: float, time_testing=False) -> List[Point]:
-    points = []
+def ellipse_canonical(p: Point, width: float, height: float, time_testing=False) -> PointBuffer:
+    xs = []
+    ys = []
     x = 0
     y = 0
 
@@ -49,21 +54,26 @@ def ellipse_canonical(p: Point, width: float, height: float, time_testing=False)
         y = round(sqrt(width * width * height * height -
                   x * x * height * height) / width)
         if not time_testing:
-            points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y)))
+            xs.append(x)
+            ys.append(y)
         x += 1
 
     while y >= 0:
         x = round(sqrt(width * width * height * height -
                   y * y * width * width) / height)
         if not time_testing:
-            points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y)))
+            xs.append(x)
+            ys.append(y)
         y -= 1
     if not time_testing:
+        points = PointBuffer(4 * len(xs))
+        add_symmetr_arc(points, p, xs, ys)
         return points
 
 
-def ellipse_param(p: Point, width: float, height: float, time_testing=False) -> List[Point]:
-    points = []
+def ellipse_param(p: Point, width: float, height: float, time_testing=False) -> PointBuffer:
+    xs = []
+    ys = []
     step = 1 / max(width, height)
     angle = 0
 
@@ -72,19 +82,24 @@ def ellipse_param(p: Point, width: float, height: float, time_testing=False) ->
         y = round(height * sin(angle))
         angle += step
         if not time_testing:
-            points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y)))
+            xs.append(x)
+            ys.append(y)
     if not time_testing:
+        points = PointBuffer(4 * len(xs))
+        add_symmetr_arc(points, p, xs, ys)
         return points
 
 
-def ellipse_middle_point(p: Point, width: float, height: float, time_testing=False) -> List[Point]:
-    points = []
+def ellipse_middle_point(p: Point, width: float, height: float, time_testing=False) -> PointBuffer:
+    xs = []
+    ys = []
     x = 0
     y = height
     P1 = height * height - width * width * (height - 1 / 4)
     while 2 * height * height * x < 2 * width * width * y:
         if not time_testing:
-            points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y)))
+            xs.append(x)
+            ys.append(y)
         if P1 < 0:
             x += 1
             P1 = P1 + 2 * height * height * x + height * height
@@ -98,7 +113,8 @@ def ellipse_middle_point(p: Point, width: float, height: float, time_testing=Fal
     y = 0
     while y <= height / sqrt(1 + width * width / (height * height)):
         if not time_testing:
-            points += add_symmetr_points(p, Point(x + p.x, y + p.y))
+            xs.append(x)
+            ys.append(y)
         if P2 < 0:
             y += 1
             P2 = P2 + 2 * width * width * y + width * width
@@ -107,4 +123,6 @@ def ellipse_middle_point(p: Point, width: float, height: float, time_testing=Fal
             y += 1
             P2 += width * width * (2 * y + 1) - 2 * height * height * x
     if not time_testing:
+        points = PointBuffer(4 * len(xs))
+        add_symmetr_arc(points, p, xs, ys)
         return points
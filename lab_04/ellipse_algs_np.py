@@ -0,0 +1,33 @@
+from math import sqrt, pi
+
+import numpy as np
+
+from class_point import Point
+from point_buffer import PointBuffer
+from point_funcs import add_symmetr_arc, drop_repeats
+from circle_algs_np import accumulate_angles
+
+
+def ellipse_canonical_np(p: Point, width: float, height: float, time_testing=False) -> PointBuffer:
+    edge_x = round(width / sqrt(1 + height * height / (width * width)))
+
+    # до edge_x идем по x, дальше по y; отрицательное под корнем (нецелые полуоси) считаем нулем
+    xs_1 = np.arange(edge_x + 1)
+    ys_1 = np.rint(np.sqrt(np.maximum(width * width * height * height - xs_1 * xs_1 * height * height, 0)) / width)
+    ys_2 = np.arange(ys_1[-1], -1, -1)
+    xs_2 = np.rint(np.sqrt(np.maximum(width * width * height * height - ys_2 * ys_2 * width * width, 0)) / height)
+
+    xs, ys = drop_repeats(np.concatenate((xs_1, xs_2)), np.concatenate((ys_1, ys_2)))
+    if not time_testing:
+        points = PointBuffer(4 * len(xs))
+        add_symmetr_arc(points, p, xs, ys)
+        return points
+
+
+def ellipse_param_np(p: Point, width: float, height: float, time_testing=False) -> PointBuffer:
+    angles = accumulate_angles(1 / max(width, height), pi / 2)
+    xs, ys = drop_repeats(np.rint(width * np.cos(angles)), np.rint(height * np.sin(angles)))
+    if not time_testing:
+        points = PointBuffer(4 * len(xs))
+        add_symmetr_arc(points, p, xs, ys)
+        return points
@@ -6,18 +6,28 @@ from typing import List, Tuple
 from PyQt5 import QtWidgets
 from PyQt5 import uic
 from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtWidgets import QGraphicsScene, QGraphicsLineItem, QButtonGroup, QGraphicsEllipseItem, QGraphicsRectItem
-from PyQt5.QtGui import QWheelEvent, QMouseEvent, QPen, QColor, QBrush
+from PyQt5.QtWidgets import QGraphicsScene, QButtonGroup, QGraphicsEllipseItem
+from PyQt5.QtGui import QWheelEvent, QMouseEvent, QColor, QBrush, QCloseEvent
 from matplotlib import pyplot
+import numpy as np
 
 from dialogs import show_author, show_task, show_instruction, show_err_win
 from class_point import Point
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
 from input_checks import params_to_float, validate_circle_spektre_params
+from pixel_canvas import PixelCanvas
+from point_buffer import PointBuffer
 from circle_algs import circle_brezenhem, circle_canonical, circle_param, circle_middle_point
 from ellipse_algs import ellipse_brezenhem, ellipse_canonical, ellipse_param, ellipse_middle_point
+from circle_algs_np import circle_canonical_np, circle_param_np
+from ellipse_algs_np import ellipse_canonical_np, ellipse_param_np
+from spectre_algs import circle_brezenhem_spectre, circle_canonical_spectre, circle_param_spectre, \
+    circle_middle_point_spectre, ellipse_brezenhem_spectre, ellipse_canonical_spectre, ellipse_param_spectre, \
+    ellipse_middle_point_spectre
+from time_sweep import TimeSweep
+from workers import JobControls
 
-grid_lines: List[QGraphicsLineItem] = []
-max_win_size: List[int] = [0, 0, 0]
 
 scale: float = 1.0
 num_tests: int = 50
@@ -35,8 +45,13 @@ class Ui(QtWidgets.QMainWindow):
 
         self.scene = QGraphicsScene()
         self.graphicsView.setScene(self.scene)
-        self.need_grid()
-        self.add_grid()
+        self.grid = GridBackground(self.graphicsView)
+        self.update_grid()
+
+        self.jobs = JobControls(self)
+        self.canvas = PixelCanvas(current_line_color)
+        self.canvas.setZValue(1)
+        self.scene.addItem(self.canvas)
 
         # menu bar
         self.about_author.triggered.connect(show_author)
@@ -118,6 +133,7 @@ class Ui(QtWidgets.QMainWindow):
 
         self.graphicsView.setMouseTracking(True)
 
+        self.input = InputCoalescer(self.apply_mouse_move, self.apply_wheel, self)
         self.graphicsView.mousePressEvent = self.mousePressEvent
         self.graphicsView.wheelEvent = self.wheel_event
         self.graphicsView.mouseReleaseEvent = self.mouseReleaseEvent
@@ -126,118 +142,60 @@ class Ui(QtWidgets.QMainWindow):
         self.show()
 
     def wheel_event(self, event: QWheelEvent) -> None:
-        global scale
-        factor = 1.2
+        self.input.wheel(1 if event.angleDelta().y() > 0 else -1)
 
-        if event.angleDelta().y() > 0:
-            self.graphicsView.scale(factor, factor)
-        else:
-            self.graphicsView.scale(1.0 / factor, 1.0 / factor)
+    def apply_wheel(self, steps: int) -> None:
+        # steps - сумма шагов колесика за кадр, каждый шаг - масштаб в 1.2 раза
+        global scale
+        factor = 1.2 ** steps
+        self.graphicsView.scale(factor, factor)
 
         # Получаем текущий масштаб по оси X (и Y)
         scale = self.graphicsView.transform().m11()
-        if self.need_grid():
-            for grid_line in grid_lines:
-                if grid_line in self.scene.items():
-                    self.scene.removeItem(grid_line)
-            self.add_grid()
+        self.update_grid()
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         global is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = False
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        self.input.move(event.pos())
+
+    def apply_mouse_move(self, pos: QPoint) -> None:
         global last_pos
         if is_pressed:
-            dx = event.pos().x() - last_pos.x()
-            dy = event.pos().y() - last_pos.y()
+            dx = pos.x() - last_pos.x()
+            dy = pos.y() - last_pos.y()
             self.graphicsView.horizontalScrollBar().setValue(
                 self.graphicsView.horizontalScrollBar().value() - dx)
             self.graphicsView.verticalScrollBar().setValue(
                 self.graphicsView.verticalScrollBar().value() - dy)
-            last_pos = event.pos()
-            if self.need_grid():
-                for grid_line in grid_lines:
-                    if grid_line in self.scene.items():
-                        self.scene.removeItem(grid_line)
-                self.add_grid()
-        scene_pos = self.graphicsView.mapToScene(event.pos())
+            last_pos = pos
+        scene_pos = self.graphicsView.mapToScene(pos)
         self.current_coords_label.setText(
             f'x :{scene_pos.x():.2f}, y :{-scene_pos.y():.2f}')
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         global last_pos, is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = True
             last_pos = event.pos()
 
-    def need_grid(self) -> bool:
-        global max_win_size
-        flag: bool = False
-        max_size = self.graphicsView.maximumSize()
-        max_width = int(max_size.width() * (1 / scale))
-        max_height = int(max_size.height() * (1 / scale))
-        grid_interval = int(50 * (1 / scale))
-        grid_interval = round(grid_interval / 50) * 50
-        if grid_interval != max_win_size[2]:
-            max_win_size[2] = grid_interval
-            flag = True
-        if max_win_size[0] < max_width and max_win_size[1] < max_height:
-            max_win_size[0] = max_width
-            max_win_size[1] = max_height
-            flag = True
-        return flag
-
-    def add_grid(self) -> None:
-        global grid_lines, max_win_size
-        max_width = max_win_size[0]
-        max_height = max_win_size[1]
-        grid_interval = max_win_size[2]
-        if grid_interval == 0:
-            grid_interval = 20
-        self.current_grid_label.setText(f'Текущий шаг сетки: {grid_interval}')
-        start_grid_width = - ((max_width // 2) +
-                              grid_interval - (max_width // 2) % grid_interval)
-        start_grid_height = - \
-            ((max_height // 2) + grid_interval - (max_height // 2) % grid_interval)
-        end_grid_width = (max_width // 2) - (max_width // 2) % grid_interval
-        end_grid_height = (max_height // 2) - (max_width // 2) % grid_interval
-        pen = QPen(Qt.darkGray)
-        pen_width = 1 if int(1 / scale) == 0 else int(1 / scale)
-        pen.setWidth(pen_width)
-        for x in range(start_grid_width, end_grid_width, grid_interval):
-            line = QGraphicsLineItem(x, start_grid_height, x, end_grid_height)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-        for y in range(start_grid_height, end_grid_height, grid_interval):
-            line = QGraphicsLineItem(start_grid_width, y, end_grid_width, y)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-
-        axis_x = QGraphicsLineItem(-300 * (1 / scale), 0, 300 * (1 / scale), 0)
-        axis_y = QGraphicsLineItem(0, -300 * (1 / scale), 0, 300 * (1 / scale))
-        pen.setColor(Qt.white)
-        grid_lines.append(axis_x)
-        grid_lines.append(axis_y)
-        axis_x.setPen(pen)
-        axis_y.setPen(pen)
-        axis_x.setZValue(0)
-        axis_y.setZValue(0)
-        self.scene.addItem(axis_x)
-        self.scene.addItem(axis_y)
+    def update_grid(self) -> None:
+        if self.grid.update(scale):
+            self.current_grid_label.setText(f'Текущий шаг сетки: {self.grid.step}')
 
     def set_figure_color(self, color: QColor) -> None:
         global current_line_color
         current_line_color = color
         objects = self.scene.items()
         for obj in objects:
-            if obj not in grid_lines:
+            if obj is not self.canvas:
                 obj.setPen(current_line_color)
+        self.canvas.set_color(current_line_color)
 
     def set_bg_color(self, color: QColor) -> None:
         background_brush = QBrush(color)
@@ -245,52 +203,59 @@ class Ui(QtWidgets.QMainWindow):
 
     def clear_scene(self):
         for item in self.scene.items():
-            if item not in grid_lines:
+            if item is not self.canvas:
                 self.scene.removeItem(item)
+        self.canvas.clear()
 
     def time_test(self):
         r_max = 1500
         step = 100
         cnt_runs = 500
-        algs = [ellipse_brezenhem, ellipse_canonical, ellipse_param, ellipse_middle_point] \
-            if self.ellipse_rb.isChecked() else [circle_brezenhem, circle_canonical, circle_param, circle_middle_point]
-        run_times = [[] for _ in range(4)]
-        for k, alg in enumerate(algs):
-            for i in range(1, r_max // step):
-                sum_time = 0
-                if self.ellipse_rb.isChecked():
-                    for _ in range(cnt_runs):
-                        start = time()
-                        alg(Point(0, 0), step * i, step * i, True)
-                        sum_time += time() - start
-                else:
-                    for _ in range(cnt_runs):
-                        start = time()
-                        alg(Point(0, 0), step * i, True)
-                        sum_time += time() - start
-                run_times[k].append(sum_time / cnt_runs)
-
         range_ = [i for i in range(step, r_max, step)]
+        figure = 'ellipse' if self.ellipse_rb.isChecked() else 'circle'
 
+        # 4 алгоритма x 14 радиусов считаются в пуле процессов, график дорисовывается
+        # по мере прихода точек, а окно в это время не блокируется
+        self.run_times = np.full((4, len(range_)), np.nan)
         pyplot.figure(figsize=(13, 7))
         pyplot.rcParams['font.size'] = '14'
 
         pyplot.title(f"Сравнение времени построения {'эллипсов' if self.ellipse_rb.isChecked() else 'окружностей'}"
                      f" для различных алгоритмов")
-        pyplot.plot(range_, run_times[0], label='Алгоритм Брезенхема')
-        pyplot.plot(range_, run_times[1], label='Каноническое уравнение')
-        pyplot.plot(range_, run_times[2], label='Параметрическое уравнение')
-        pyplot.plot(range_, run_times[3], label='Алгоритм средней точки')
+        np_label = ' (NumPy)' if self.numpy_backend_cb.isChecked() else ''
+        labels = ['Алгоритм Брезенхема', 'Каноническое уравнение' + np_label,
+                  'Параметрическое уравнение' + np_label, 'Алгоритм средней точки']
+        self.time_lines = [pyplot.plot(range_, self.run_times[k], marker='.', label=labels[k])[0] for k in range(4)]
         pyplot.xticks([_ for _ in range(step, r_max + 1, step)])
         pyplot.legend()
         pyplot.xlabel("Радиус")
         pyplot.ylabel("Время")
 
+        sweep = TimeSweep(figure, self.numpy_backend_cb.isChecked(), range_, cnt_runs, self)
+        sweep.point_ready.connect(self.add_time_point)
+        sweep.finished.connect(self.finish_time_test)
+        self.jobs.start(sweep, self.time_test_button)
         if not FUNC_TESTING:
-            pyplot.show()
+            pyplot.show(block=False)
         else:
+            self.jobs.wait()
+
+    def add_time_point(self, k: int, i: int, run_time: float) -> None:
+        self.run_times[k, i] = run_time
+        self.time_lines[k].set_ydata(self.run_times[k])
+        axes = self.time_lines[k].axes
+        axes.relim()
+        axes.autoscale_view()
+        axes.figure.canvas.draw_idle()
+
+    def finish_time_test(self) -> None:
+        if FUNC_TESTING:
             pyplot.savefig(f'./results/time_test_{test_i}.png')
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.jobs.stop()
+        super().closeEvent(event)
+
     def draw_circle(self, center: Point = None, r: float = None):
         if center is None or r is None:
             params = self.get_circle_params()
@@ -305,11 +270,7 @@ class Ui(QtWidgets.QMainWindow):
         circle_points = self.get_circle_points(center, r)
         if not circle_points:
             return
-        for point in circle_points:
-            part = QGraphicsRectItem(point.x, -point.y, 1, 1)
-            part.setZValue(1)
-            part.setPen(current_line_color)
-            self.scene.addItem(part)
+        self.canvas.add_points(circle_points)
 
     def get_circle_spectre_params(self) -> Tuple[float]:
         unsetted = 0
@@ -345,18 +306,31 @@ class Ui(QtWidgets.QMainWindow):
             if params is None:
                 return
         r_start, r_end, n, step, x_c, y_c = params
-        points = []
-        for i in range(int(n)):
-            points.extend(self.get_circle_points(
-                Point(x_c, y_c), r_start + i * step))
-
-        for point in points:
-            part = QGraphicsRectItem(point.x, -point.y, 1, 1)
-            part.setZValue(1)
-            part.setPen(current_line_color)
-            self.scene.addItem(part)
-
-    def get_circle_points(self, center: Point, r: float) -> List[Point]:
+        radii = [r_start + i * step for i in range(int(n))]
+        points = self.get_circle_spectre_points(Point(x_c, y_c), radii)
+
+        self.canvas.add_points(points)
+
+    def get_circle_spectre_points(self, center: Point, radii: List[float]) -> PointBuffer:
+        # весь спектр строится за один проход по массивам (spectre_algs)
+        if self.brezenhem_rbutton.isChecked():
+            return circle_brezenhem_spectre(center, radii)
+        elif self.canonical_rbutton.isChecked():
+            return circle_canonical_spectre(center, radii)
+        elif self.param_rbutton.isChecked():
+            return circle_param_spectre(center, radii)
+        elif self.middle_point_rbutton.isChecked():
+            return circle_middle_point_spectre(center, radii)
+        points = PointBuffer()
+        for r in radii:
+            points.extend(self.get_circle_points(center, r))
+        return points
+
+    def get_circle_points(self, center: Point, r: float) -> PointBuffer:
+        if self.numpy_backend_cb.isChecked() and self.canonical_rbutton.isChecked():
+            return circle_canonical_np(center, r)
+        elif self.numpy_backend_cb.isChecked() and self.param_rbutton.isChecked():
+            return circle_param_np(center, r)
         if self.brezenhem_rbutton.isChecked():
             return circle_brezenhem(center, r)
         elif self.canonical_rbutton.isChecked():
@@ -371,7 +345,7 @@ class Ui(QtWidgets.QMainWindow):
             circle.setPen(current_line_color)
             circle.setZValue(1)
             self.scene.addItem(circle)
-            return []
+            return PointBuffer()
 
     def get_circle_params(self) -> Tuple[Point, float]:
         x_c_str = self.set_x.text()
@@ -412,13 +386,13 @@ class Ui(QtWidgets.QMainWindow):
         ellipse_points = self.get_ellipse_points(center, width, height)
         if not ellipse_points:
             return
-        for point in ellipse_points:
-            part = QGraphicsRectItem(point.x, -point.y, 1, 1)
-            part.setZValue(1)
-            part.setPen(current_line_color)
-            self.scene.addItem(part)
+        self.canvas.add_points(ellipse_points)
 
-    def get_ellipse_points(self, center: Point, width: float, height: float) -> List[Point]:
+    def get_ellipse_points(self, center: Point, width: float, height: float) -> PointBuffer:
+        if self.numpy_backend_cb.isChecked() and self.canonical_rbutton.isChecked():
+            return ellipse_canonical_np(center, width, height)
+        elif self.numpy_backend_cb.isChecked() and self.param_rbutton.isChecked():
+            return ellipse_param_np(center, width, height)
         if self.brezenhem_rbutton.isChecked():
             return ellipse_brezenhem(center, width, height)
         elif self.canonical_rbutton.isChecked():
@@ -433,7 +407,7 @@ class Ui(QtWidgets.QMainWindow):
             ellipse.setPen(current_line_color)
             ellipse.setZValue(1)
             self.scene.addItem(ellipse)
-            return []
+            return PointBuffer()
 
     def get_ellipse_spectre_params(self) -> Tuple[float, str]:
         width_str = self.set_spektr_width.text()
@@ -475,7 +449,7 @@ class Ui(QtWidgets.QMainWindow):
             if params is None:
                 return
         x_c, y_c, width, height, cnt, step_x, step_y, unsetted_ind = params
-        points = []
+        widths, heights = [], []
         coeff = width / height
 
         for i in range(int(cnt)):
@@ -485,13 +459,23 @@ class Ui(QtWidgets.QMainWindow):
             else:
                 height += step_y
                 width = round(height * coeff)
-            points.extend(self.get_ellipse_points(
-                Point(x_c, y_c), width, height))
-        for point in points:
-            part = QGraphicsRectItem(point.x, -point.y, 1, 1)
-            part.setZValue(1)
-            part.setPen(current_line_color)
-            self.scene.addItem(part)
+            widths.append(width)
+            heights.append(height)
+        self.canvas.add_points(self.get_ellipse_spectre_points(Point(x_c, y_c), widths, heights))
+
+    def get_ellipse_spectre_points(self, center: Point, widths: List[float], heights: List[float]) -> PointBuffer:
+        if self.brezenhem_rbutton.isChecked():
+            return ellipse_brezenhem_spectre(center, widths, heights)
+        elif self.canonical_rbutton.isChecked():
+            return ellipse_canonical_spectre(center, widths, heights)
+        elif self.param_rbutton.isChecked():
+            return ellipse_param_spectre(center, widths, heights)
+        elif self.middle_point_rbutton.isChecked():
+            return ellipse_middle_point_spectre(center, widths, heights)
+        points = PointBuffer()
+        for width, height in zip(widths, heights):
+            points.extend(self.get_ellipse_points(center, width, height))
+        return points
 
 
 if __name__ == '__main__':
@@ -506,6 +490,8 @@ if __name__ == '__main__':
         test_i = int(sys.argv[1])
         algs_choice = {'br': window.brezenhem_rbutton, 'can': window.canonical_rbutton, 'param': window.param_rbutton,
                        'mp': window.middle_point_rbutton}
+        if sys.argv[-1] == 'np':
+            window.numpy_backend_cb.setChecked(True)
         if sys.argv[2] == 'circle':
             window.circle_rb.setChecked(True)
             if sys.argv[3] == 'time_test':
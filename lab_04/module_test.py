@@ -1,6 +1,19 @@
-from point_funcs import add_symmetr_points
+import numpy as np
+from point_funcs import add_symmetr_points, add_symmetr_arc
+from point_buffer import PointBuffer
 from class_point import Point
-from ellipse_algs import ellipse_brezenhem
+from ellipse_algs import ellipse_brezenhem, ellipse_canonical, ellipse_param, ellipse_middle_point
+from circle_algs import circle_brezenhem, circle_canonical, circle_param, circle_middle_point
+from circle_algs_np import circle_canonical_np, circle_param_np
+from ellipse_algs_np import ellipse_canonical_np, ellipse_param_np
+from spectre_algs import circle_brezenhem_spectre, circle_canonical_spectre, circle_param_spectre, \
+    circle_middle_point_spectre, ellipse_canonical_spectre, ellipse_param_spectre, ellipse_middle_point_spectre
+from grid_background import GridBackground
+from time_sweep import TimeSweep, time_point
+from input_coalescer import InputCoalescer
+from PyQt5.QtCore import QPoint, QLineF, QRectF, QPointF, QEventLoop, QTimer
+from PyQt5.QtGui import QColor, QBrush
+from PyQt5.QtWidgets import QApplication, QGraphicsScene, QGraphicsView
 import pytest
 
 
@@ -21,6 +34,18 @@ def test_add_symmetr_points_equal():
         assert point.x == 5 and point.y == 10
 
 
+def test_add_symmetr_arc():
+    center = Point(0.1, -3.7)
+    xs, ys = [0, 1, 2], [5, 4.5, 3]
+    for is_circle in [True, False]:
+        points = PointBuffer(1)
+        add_symmetr_arc(points, center, xs, ys, is_circle)
+        expected = []
+        for x, y in zip(xs, ys):
+            expected.extend(add_symmetr_points(center, Point(x + center.x, y + center.y), is_circle))
+        assert [(p.x, p.y) for p in points] == [(p.x, p.y) for p in expected]
+
+
 def test_ellipse_brezenhem(null_point):
     points = ellipse_brezenhem(null_point, 2, 5)
     result = [Point(0.0, 5.0), Point(0.0, 5.0), Point(0.0, -5.0), Point(0.0, -5.0),
@@ -36,3 +61,163 @@ def test_ellipse_brezenhem(null_point):
     for i in range(len(points)):
         assert int(points[i].x) == int(result[i].x) and int(
             points[i].y) == int(result[i].y)
+
+
+def test_figures_np_match():
+    def pixels(points):
+        return set(zip(points.xs.tolist(), points.ys.tolist()))
+
+    center = Point(-10.5, 3)
+    for r in [1, 7, 100, 733.5]:
+        assert pixels(circle_canonical(center, r)) == pixels(circle_canonical_np(center, r))
+        assert pixels(circle_param(center, r)) == pixels(circle_param_np(center, r))
+    for width, height in [(1, 1), (5, 40), (300, 120)]:
+        assert pixels(ellipse_canonical(center, width, height)) == pixels(ellipse_canonical_np(center, width, height))
+        assert pixels(ellipse_param(center, width, height)) == pixels(ellipse_param_np(center, width, height))
+
+
+def test_circle_canonical_np_small_radius():
+    center = Point(0.5, -7)
+    with np.errstate(invalid='raise'):
+        for r in [0.73, 1.2, 1.4]:
+            points = circle_canonical_np(center, r)
+            assert np.isfinite(points.xs).all() and np.isfinite(points.ys).all()
+    points = circle_canonical_np(center, 0.73)
+    assert (1.5, -7.0) in set(zip(points.xs.tolist(), points.ys.tolist()))
+
+
+def test_spectre_match():
+    def pixels(points):
+        return set(zip(points.xs.tolist(), points.ys.tolist()))
+
+    center = Point(0.5, -7)
+    radii = [3 + 17.5 * i for i in range(12)]
+    for alg, alg_spectre in [(circle_brezenhem, circle_brezenhem_spectre), (circle_canonical, circle_canonical_spectre),
+                             (circle_param, circle_param_spectre), (circle_middle_point, circle_middle_point_spectre)]:
+        ref = PointBuffer()
+        for r in radii:
+            ref.extend(alg(center, r))
+        assert pixels(ref) == pixels(alg_spectre(center, radii))
+    widths = [10 + 13 * i for i in range(10)]
+    heights = [round(w / 1.7) for w in widths]
+    for alg, alg_spectre in [(ellipse_canonical, ellipse_canonical_spectre), (ellipse_param, ellipse_param_spectre),
+                             (ellipse_middle_point, ellipse_middle_point_spectre)]:
+        ref = PointBuffer()
+        for width, height in zip(widths, heights):
+            ref.extend(alg(center, width, height))
+        assert pixels(ref) == pixels(alg_spectre(center, widths, heights))
+
+
+def test_input_coalescer():
+    # за кадр от движений остается последняя позиция, шаги колесика складываются
+    # и применяются раньше движения; первое событие кадра применяется сразу
+    calls = []
+    coalescer = InputCoalescer(lambda pos: calls.append(('move', pos)), lambda steps: calls.append(('wheel', steps)))
+    coalescer.move(QPoint(1, 1))
+    for i in range(2, 5):
+        coalescer.move(QPoint(i, i))
+    for steps in (1, 2, -1):
+        coalescer.wheel(steps)
+    assert calls == [('move', QPoint(1, 1))]
+    coalescer.flush()
+    assert calls == [('move', QPoint(1, 1)), ('wheel', 2), ('move', QPoint(4, 4))]
+    coalescer.next_frame()
+    assert len(calls) == 3
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def grid_view(qt_app):
+    view = QGraphicsView()
+    view.setScene(QGraphicsScene())
+    view.setMaximumSize(800, 600)
+    return view
+
+
+def old_grid_lines(max_width: int, max_height: int, interval: int, scale: float):
+    # линии сетки и осей так, как их строил add_grid элементами сцены
+    step = interval if interval != 0 else 20
+    start_width = - ((max_width // 2) + step - (max_width // 2) % step)
+    start_height = - ((max_height // 2) + step - (max_height // 2) % step)
+    end_width = (max_width // 2) - (max_width // 2) % step
+    end_height = (max_height // 2) - (max_width // 2) % step
+    vertical = [QLineF(x, start_height, x, end_height) for x in range(start_width, end_width, step)]
+    horizontal = [QLineF(start_width, y, end_width, y) for y in range(start_height, end_height, step)]
+    axes = [QLineF(-300 * (1 / scale), 0, 300 * (1 / scale), 0), QLineF(0, -300 * (1 / scale), 0, 300 * (1 / scale))]
+    return vertical, horizontal, axes
+
+
+def test_grid_update(grid_view):
+    grid = GridBackground(grid_view)
+    assert grid.update(1.0)
+    assert (grid.step, grid.max_width, grid.max_height) == (50, 800, 600)
+    assert not grid.update(1.0)
+    assert not grid.update(1.2)  # шаг тот же, границы меньше прежних
+    assert grid.update(0.5)
+    assert (grid.step, grid.max_width, grid.max_height) == (100, 1600, 1200)
+    assert not grid.update(0.5)
+    assert grid_view.scene().sceneRect().contains(grid.bounds())
+
+
+@pytest.mark.parametrize('scale', [1.0, 0.5, 0.3, 2.0])
+def test_grid_extents(grid_view, scale):
+    grid = GridBackground(grid_view)
+    grid.update(scale)
+    vertical, horizontal, axes = old_grid_lines(grid.max_width, grid.max_height, grid.interval, scale)
+    half = grid.pen_width() / 2
+
+    def extent(lines):
+        rect = QRectF()
+        for line in lines:
+            rect |= QRectF(line.p1(), line.p2())
+        return rect.adjusted(-half, -half, half, half)
+
+    assert grid.regions() == (extent(vertical), extent(horizontal))
+    assert grid.bounds() == extent(vertical + horizontal + axes)
+
+
+def test_grid_background_brush(grid_view):
+    grid_view.resize(300, 300)
+    grid_view.setBackgroundBrush(QBrush(QColor(200, 0, 0)))
+    GridBackground(grid_view).update(1.0)
+    image = grid_view.viewport().grab().toImage()
+    # середина клетки сетки, вдали от линий и осей
+    cell = grid_view.mapFromScene(QPointF(25, 25))
+    assert image.pixelColor(cell) == QColor(200, 0, 0)
+
+
+def test_time_point():
+    k, i, run_time = time_point('circle', True, 1, 3, 10, 2)
+    assert (k, i) == (1, 3) and run_time >= 0
+
+
+def test_time_sweep(qt_app):
+    radii = [5, 20, 10]
+    sweep = TimeSweep('circle', False, radii, 1)
+    assert sweep.tasks() == [(k, 1) for k in range(4)] + [(k, 2) for k in range(4)] + [(k, 0) for k in range(4)]
+    points, progress = [], []
+    sweep.point_ready.connect(lambda k, i, run_time: points.append((k, i, run_time)))
+    sweep.progress.connect(lambda done, total: progress.append((done, total)))
+    loop = QEventLoop()
+    sweep.finished.connect(loop.quit)
+    QTimer.singleShot(60000, loop.quit)
+    sweep.start()
+    loop.exec_()
+    assert sorted((k, i) for k, i, _ in points) == sorted(sweep.tasks())
+    assert all(run_time >= 0 for _, _, run_time in points)
+    assert progress == [(done, 12) for done in range(1, 13)]
+
+
+def test_time_sweep_cancel(qt_app):
+    # отмена завершает процессы с начатыми замерами, а не ждет их
+    sweep = TimeSweep('circle', False, [10 ** 6] * 4, 100)
+    sweep.start()
+    processes = list(sweep.executor._processes.values())
+    sweep.cancel()
+    for process in processes:
+        process.join(10)
+        assert not process.is_alive()
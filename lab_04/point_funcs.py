@@ -1,6 +1,9 @@
-from typing import List
+from typing import List, Sequence, Tuple
+
+import numpy as np
 
 from class_point import Point
+from point_buffer import PointBuffer
 
 
 def add_symmetr_points(p1: Point, p2: Point, is_circle=False) -> List[Point]:
@@ -20,3 +23,36 @@ def add_symmetr_points(p1: Point, p2: Point, is_circle=False) -> List[Point]:
     points_list.append(Point(p1.x - dx, p1.y - dy))
 
     return points_list
+
+
+def add_symmetr_arc(points: PointBuffer, p: Point, xs: Sequence[float], ys: Sequence[float],
+                    is_circle=False) -> None:
+    # то же, что add_symmetr_points(p, Point(x + p.x, y + p.y)) для каждой точки дуги,
+    # но все отражения пишутся сразу в буфер: строка - точка дуги, столбцы - ее отражения
+    dx = (np.asarray(xs) + p.x) - p.x
+    dy = (np.asarray(ys) + p.y) - p.y
+    k = 8 if is_circle else 4
+    n = len(dx)
+    points.reserve(points.size + n * k)
+    x_out = points.x_data[points.size:points.size + n * k].reshape(n, k)
+    y_out = points.y_data[points.size:points.size + n * k].reshape(n, k)
+
+    if is_circle:
+        x_out[:, 0] = p.x - dy
+        x_out[:, 1] = x_out[:, 2] = p.x + dy
+        x_out[:, 3] = p.x - dy
+        y_out[:, 0] = y_out[:, 1] = p.y + dx
+        y_out[:, 2] = y_out[:, 3] = p.y - dx
+
+    x_out[:, k - 4] = x_out[:, k - 1] = p.x - dx
+    x_out[:, k - 3] = x_out[:, k - 2] = p.x + dx
+    y_out[:, k - 4] = y_out[:, k - 3] = p.y + dy
+    y_out[:, k - 2] = y_out[:, k - 1] = p.y - dy
+    points.size += n * k
+
+
+def drop_repeats(xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # соседние одинаковые точки дуги после округления дают одни и те же пиксели
+    keep = np.ones(len(xs), dtype=bool)
+    keep[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+    return xs[keep], ys[keep]
@@ -0,0 +1,198 @@
+from math import sqrt, pi
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from class_point import Point
+from point_buffer import PointBuffer
+from point_funcs import add_symmetr_arc
+from circle_algs import circle_brezenhem, circle_middle_point
+from ellipse_algs import ellipse_brezenhem, ellipse_middle_point
+
+# спектр концентрических фигур одним проходом: строка массива - одна фигура, столбец - шаг
+# по основной оси; для каждой строки хранятся координаты дуги и маска ее точек
+Arcs = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def trace_rows(start: np.ndarray, ops: np.ndarray) -> np.ndarray:
+    # значения параметра решения в каждом состоянии: слагаемые одного шага (ops[:, i])
+    # прибавляются по очереди, как в скалярных алгоритмах
+    rows, steps, width = ops.shape
+    values = np.empty((rows, steps * width + 1), dtype=np.float64)
+    values[:, 0] = start
+    values[:, 1:] = ops.reshape(rows, -1)
+    return np.cumsum(values, axis=1)[:, ::width]
+
+
+def staircase(start: np.ndarray, limit: np.ndarray) -> np.ndarray:
+    # неосновная координата уменьшается на 1 на шаге i, если не меньше limit[:, i]
+    drops = np.maximum(np.floor(start[:, None] - limit) + 1, 0)
+    drops[:, 0] = 0
+    return start[:, None] - drops
+
+
+def wrong_rows(decisions: np.ndarray, keep: np.ndarray, minor: np.ndarray, checked: np.ndarray) -> np.ndarray:
+    # решение алгоритма разошлось с догадкой или координата уменьшилась больше чем на 1
+    jumps = minor[:, :-1] - minor[:, 1:] > 1
+    return (((decisions != keep) | jumps) & checked).any(axis=1)
+
+
+def reflect_arcs(center: Point, arcs: List[Arcs], is_circle: bool) -> PointBuffer:
+    xs = np.concatenate([arc_xs[mask] for arc_xs, _, mask in arcs])
+    ys = np.concatenate([arc_ys[mask] for _, arc_ys, mask in arcs])
+    points = PointBuffer((8 if is_circle else 4) * len(xs))
+    add_symmetr_arc(points, center, xs, ys, is_circle)
+    return points
+
+
+def with_fallback(points: PointBuffer, wrong: np.ndarray, alg, center: Point, *params: np.ndarray) -> PointBuffer:
+    # фигуры, где аналитический путь разошелся с вещественной арифметикой, строятся как обычно
+    for i in np.flatnonzero(wrong):
+        points.extend(alg(center, *(float(param[i]) for param in params)))
+    return points
+
+
+def circle_brezenhem_spectre(center: Point, radii: Sequence[float]) -> PointBuffer:
+    r = np.asarray(radii, dtype=np.float64)
+    x = np.arange(int(r.max() / sqrt(2)) + 3)
+    # y остается на месте, пока d1 = E(x, y) + E(x, y - 1) < 0
+    limit = (1 + np.sqrt(np.maximum(4 * (r[:, None] ** 2 - x ** 2) - 1, 0))) / 2
+    y = staircase(r, limit)
+
+    x_new = x[1:]
+    keep = y[:, 1:] == y[:, :-1]
+    ops = np.zeros(keep.shape + (2,))
+    ops[:, :, 0] = np.where(keep, 2 * x_new, 2 * (x_new - y[:, 1:] + 1))
+    ops[:, :, 1] = np.where(keep, 1, 0)
+    d = trace_rows(2 * (1 - r), ops)
+
+    inside = x <= y
+    wrong = wrong_rows((2 * d + 2 * y - 1)[:, :-1] < 0, keep, y, inside[:, :-1])
+    inside[wrong] = False
+    points = reflect_arcs(center, [(np.broadcast_to(x, y.shape), y, inside)], True)
+    return with_fallback(points, wrong, circle_brezenhem, center, r)
+
+
+def circle_middle_point_spectre(center: Point, radii: Sequence[float]) -> PointBuffer:
+    r = np.asarray(radii, dtype=np.float64)
+    x = np.arange(int(r.max() / sqrt(2)) + 3)
+    # y остается на месте, пока середина (x, y - 1/2) внутри окружности
+    limit = 0.5 + np.sqrt(np.maximum(r[:, None] ** 2 - x ** 2, 0))
+    y = staircase(r, limit)
+
+    x_new = x[1:]
+    keep = y[:, 1:] == y[:, :-1]
+    ops = np.zeros(keep.shape + (3,))
+    ops[:, :, 0] = 2 * x_new
+    ops[:, :, 1] = 1
+    ops[:, :, 2] = np.where(keep, 0, -2 * y[:, 1:])
+    k = trace_rows(5 / 4 - r, ops)
+
+    going = (x < y)[:, :-1]
+    wrong = wrong_rows(k[:, :-1] < 0, keep, y, going)
+    inside = np.ones(y.shape, dtype=bool)
+    inside[:, 1:] = going
+    inside[wrong] = False
+    points = reflect_arcs(center, [(np.broadcast_to(x, y.shape), y, inside)], True)
+    return with_fallback(points, wrong, circle_middle_point, center, r)
+
+
+def circle_canonical_spectre(center: Point, radii: Sequence[float]) -> PointBuffer:
+    r = np.asarray(radii, dtype=np.float64)
+    arc_end = np.rint(r / sqrt(2))
+    x = np.arange(int(arc_end.max()) + 1, dtype=np.float64)
+    y = np.sqrt(np.maximum(r[:, None] * r[:, None] - x ** 2, 0))
+    inside = x <= arc_end[:, None]
+    return reflect_arcs(center, [(np.broadcast_to(x, y.shape), y, inside)], True)
+
+
+def param_arcs(a: np.ndarray, b: np.ndarray, step: np.ndarray, limit: float) -> Arcs:
+    # углы накапливаются построчно, как angle += step
+    n = int((limit / step).max()) + 3
+    steps = np.repeat(step[:, None], n, axis=1)
+    steps[:, 0] = 0
+    angles = np.cumsum(steps, axis=1)
+    xs = np.rint(a[:, None] * np.cos(angles))
+    ys = np.rint(b[:, None] * np.sin(angles))
+    inside = angles <= limit
+    inside[:, 1:] &= (xs[:, 1:] != xs[:, :-1]) | (ys[:, 1:] != ys[:, :-1])
+    return xs, ys, inside
+
+
+def circle_param_spectre(center: Point, radii: Sequence[float]) -> PointBuffer:
+    r = np.asarray(radii, dtype=np.float64)
+    return reflect_arcs(center, [param_arcs(r, r, 1 / r, pi / 4)], True)
+
+
+def ellipse_param_spectre(center: Point, widths: Sequence[float], heights: Sequence[float]) -> PointBuffer:
+    w = np.asarray(widths, dtype=np.float64)
+    h = np.asarray(heights, dtype=np.float64)
+    return reflect_arcs(center, [param_arcs(w, h, 1 / np.maximum(w, h), pi / 2)], False)
+
+
+def ellipse_canonical_spectre(center: Point, widths: Sequence[float], heights: Sequence[float]) -> PointBuffer:
+    w = np.asarray(widths, dtype=np.float64)[:, None]
+    h = np.asarray(heights, dtype=np.float64)[:, None]
+    rows = np.arange(len(w))
+    edge_x = np.rint(w / np.sqrt(1 + h * h / (w * w)))
+
+    # до edge_x идем по x, дальше по y от последнего y до нуля
+    x_1 = np.arange(int(edge_x.max()) + 1, dtype=np.float64)
+    y_1 = np.rint(np.sqrt(np.maximum(w * w * h * h - x_1 * x_1 * h * h, 0)) / w)
+    inside_1 = x_1 <= edge_x
+    y_start = y_1[rows, edge_x[:, 0].astype(np.int64)][:, None]
+
+    y_2 = y_start - np.arange(int(y_start.max()) + 1)
+    x_2 = np.rint(np.sqrt(np.maximum(w * w * h * h - y_2 * y_2 * w * w, 0)) / h)
+    inside_2 = y_2 >= 0
+
+    # повтор точки на стыке двух частей
+    repeat = (x_2[:, 0] == edge_x[:, 0]) & (y_2[:, 0] == y_start[:, 0])
+    inside_2[repeat, 0] = False
+    return reflect_arcs(center, [(np.broadcast_to(x_1, y_1.shape), y_1, inside_1), (x_2, y_2, inside_2)], False)
+
+
+def ellipse_middle_point_spectre(center: Point, widths: Sequence[float], heights: Sequence[float]) -> PointBuffer:
+    w = np.asarray(widths, dtype=np.float64)
+    h = np.asarray(heights, dtype=np.float64)
+    wc = w[:, None]
+    hc = h[:, None]
+
+    # первая часть: шаг по x, y уменьшается, когда середина (x, y - 1/2) вне эллипса
+    x = np.arange(int(w.max()) + 3)
+    y = staircase(h, 0.5 + hc * np.sqrt(np.maximum(wc * wc - x ** 2, 0)) / wc)
+    x_new = x[1:]
+    keep = y[:, 1:] == y[:, :-1]
+    ops = np.zeros(keep.shape + (3,))
+    ops[:, :, 0] = 2 * hc * hc * x_new
+    ops[:, :, 1] = np.where(keep, hc * hc, -(2 * wc * wc * y[:, 1:]))
+    ops[:, :, 2] = np.where(keep, 0, hc * hc)
+    p_1 = trace_rows(h * h - w * w * (h - 1 / 4), ops)
+    inside_1 = 2 * hc * hc * x < 2 * wc * wc * y
+    wrong = wrong_rows(p_1[:, :-1] < 0, keep, y, inside_1[:, :-1])
+
+    # вторая часть: шаг по y от (width, 0), x уменьшается симметрично
+    y_2 = np.arange(int(h.max()) + 3)
+    x_2 = staircase(w, 0.5 + wc * np.sqrt(np.maximum(hc * hc - y_2 ** 2, 0)) / hc)
+    y_new = y_2[1:]
+    keep = x_2[:, 1:] == x_2[:, :-1]
+    ops = np.zeros(keep.shape + (2,))
+    ops[:, :, 0] = np.where(keep, 2 * wc * wc * y_new, wc * wc * (2 * y_new + 1) - 2 * hc * hc * x_2[:, 1:])
+    ops[:, :, 1] = np.where(keep, wc * wc, 0)
+    p_2 = trace_rows(w * w - h * h * (w - 1 / 4), ops)
+    inside_2 = y_2 <= hc / np.sqrt(1 + wc * wc / (hc * hc))
+    wrong |= wrong_rows(p_2[:, :-1] < 0, keep, x_2, inside_2[:, :-1])
+
+    inside_1[wrong] = False
+    inside_2[wrong] = False
+    points = reflect_arcs(center, [(np.broadcast_to(x, y.shape), y, inside_1),
+                                   (x_2, np.broadcast_to(y_2, x_2.shape), inside_2)], False)
+    return with_fallback(points, wrong, ellipse_middle_point, center, w, h)
+
+
+def ellipse_brezenhem_spectre(center: Point, widths: Sequence[float], heights: Sequence[float]) -> PointBuffer:
+    # в алгоритме Брезенхема для эллипса три вида шагов, поэтому фигуры строятся по отдельности
+    points = PointBuffer()
+    for width, height in zip(widths, heights):
+        points.extend(ellipse_brezenhem(center, width, height))
+    return points
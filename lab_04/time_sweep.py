@@ -0,0 +1,116 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from time import time
+from typing import List, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from class_point import Point
+from circle_algs import circle_brezenhem, circle_canonical, circle_param, circle_middle_point
+from ellipse_algs import ellipse_brezenhem, ellipse_canonical, ellipse_param, ellipse_middle_point
+from circle_algs_np import circle_canonical_np, circle_param_np
+from ellipse_algs_np import ellipse_canonical_np, ellipse_param_np
+
+# замер времени по сетке (алгоритм, радиус) в отдельных процессах: каждая точка сетки -
+# отдельная задача, результат отправляется в GUI сразу, как только она посчитана
+ALGS = {
+    ('circle', False): [circle_brezenhem, circle_canonical, circle_param, circle_middle_point],
+    ('circle', True): [circle_brezenhem, circle_canonical_np, circle_param_np, circle_middle_point],
+    ('ellipse', False): [ellipse_brezenhem, ellipse_canonical, ellipse_param, ellipse_middle_point],
+    ('ellipse', True): [ellipse_brezenhem, ellipse_canonical_np, ellipse_param_np, ellipse_middle_point],
+}
+
+
+def available_cores() -> List[int]:
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pin_worker(cores: List[int], counter) -> None:
+    # каждый процесс на своем ядре, чтобы замеры не мешали друг другу
+    # (sched_setaffinity есть только в Linux, в остальных ОС ядра выбирает система)
+    with counter.get_lock():
+        i = counter.value
+        counter.value += 1
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cores[i % len(cores)]})
+
+
+def time_point(figure: str, use_numpy: bool, k: int, i: int, radius: float, cnt_runs: int) -> Tuple[int, int, float]:
+    alg = ALGS[(figure, use_numpy)][k]
+    sum_time = 0
+    for _ in range(cnt_runs):
+        if figure == 'ellipse':
+            start = time()
+            alg(Point(0, 0), radius, radius, True)
+            sum_time += time() - start
+        else:
+            start = time()
+            alg(Point(0, 0), radius, True)
+            sum_time += time() - start
+    return k, i, sum_time / cnt_runs
+
+
+class TimeSweep(QObject):
+    point_ready = pyqtSignal(int, int, float)  # номер алгоритма, номер радиуса, среднее время
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    done = pyqtSignal(int, int, float)
+
+    def __init__(self, figure: str, use_numpy: bool, radii: List[float], cnt_runs: int, parent: QObject = None):
+        super().__init__(parent)
+        self.figure = figure
+        self.use_numpy = use_numpy
+        self.radii = radii
+        self.cnt_runs = cnt_runs
+        self.left = 0
+        self.total = 0
+        self.executor = None
+        # результаты из служебного потока пула приходят в поток GUI через очередь событий
+        self.done.connect(self.on_point)
+
+    def start(self) -> None:
+        cores = available_cores()
+        # spawn, а не fork: форк процесса с запущенным Qt небезопасен
+        context = get_context('spawn')
+        self.executor = ProcessPoolExecutor(len(cores), context, pin_worker, (cores, context.Value('i', 0)))
+        tasks = self.tasks()
+        self.left = self.total = len(tasks)
+        for k, i in tasks:
+            future = self.executor.submit(time_point, self.figure, self.use_numpy, k, i, self.radii[i], self.cnt_runs)
+            future.add_done_callback(lambda f, k=k, i=i: self.on_done(f, k, i))
+
+    def tasks(self) -> List[Tuple[int, int]]:
+        # (номер алгоритма, номер радиуса); крупные радиусы первыми, чтобы в конце не ждать одну долгую задачу
+        tasks = [(k, i) for i in range(len(self.radii)) for k in range(len(ALGS[(self.figure, self.use_numpy)]))]
+        return sorted(tasks, key=lambda task: -self.radii[task[1]])
+
+    def on_done(self, future: Future, k: int, i: int) -> None:
+        if future.cancelled():
+            return
+        # упавшая задача не должна подвешивать замер: точка остается пустой
+        run_time = float('nan') if future.exception() is not None else future.result()[2]
+        self.done.emit(k, i, run_time)
+
+    def on_point(self, k: int, i: int, run_time: float) -> None:
+        if self.left == 0:  # после отмены могут прийти задачи, которые уже считались
+            return
+        self.point_ready.emit(k, i, run_time)
+        self.left -= 1
+        self.progress.emit(self.total - self.left, self.total)
+        if self.left == 0:
+            self.executor.shutdown(wait=False)
+            self.finished.emit()
+
+    def cancel(self) -> None:
+        if self.executor is not None and self.left > 0:
+            # shutdown отменяет только задачи в очереди, а начатые замеры досчитываются, и выход из
+            # программы ждал бы их: процессы пула завершаются сразу (shutdown забывает их список)
+            processes = list((self.executor._processes or {}).values())
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+            self.left = 0
+            self.finished.emit()
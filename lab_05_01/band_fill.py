@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from multiprocessing import get_context, shared_memory
+from typing import List, Tuple
+
+import numpy as np
+
+from class_point import Point
+from paint_algs import SpanImage, get_y_extremum
+from paint_algs_np import fill_rows
+
+# заливка высоких областей полосами строк в отдельных процессах: каждая полоса строит свою
+# таблицу ребер и пишет строки прямо в общую маску, результат между процессами не пересылается
+MIN_BAND_ROWS = 512  # полосы ниже не выделяются: запуск задачи дороже выигрыша
+
+
+def available_cores() -> List[int]:
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def fill_band(name: str, shape: Tuple[int, int], x0: int, figures: List[List[Point]], y_max: float,
+              row_from: int, row_to: int) -> int:
+    shm = shared_memory.SharedMemory(name)
+    mask = np.ndarray(shape, dtype=bool, buffer=shm.buf)
+    try:
+        fill_rows(mask, x0, figures, y_max, row_from, row_to)
+    finally:
+        del mask
+        shm.close()
+    return row_to - row_from
+
+
+class SharedSpanImage(SpanImage):
+    # маска в общей памяти: процессы полос пишут в нее, сцена рисует из нее же
+    def __init__(self, figures: List[List[Point]]):
+        super().__init__(figures)
+        shape = self.mask.shape
+        self.shm = shared_memory.SharedMemory(create=True, size=max(self.mask.nbytes, 1))
+        self.mask = np.ndarray(shape, dtype=bool, buffer=self.shm.buf)
+
+    def release(self) -> None:
+        # имя блока больше не нужно, сама память отображена, пока жив self.shm
+        self.shm.unlink()
+
+    def __del__(self):
+        self.mask = None
+        try:
+            self.shm.close()
+        except BufferError:  # на маску еще есть ссылки - память закроется вместе с ними
+            pass
+
+
+class BandPool:
+    def __init__(self):
+        self.cores = available_cores()
+        self.executor = None
+
+    def is_useful(self, figures: List[List[Point]]) -> bool:
+        y_min, y_max = get_y_extremum(figures)
+        return len(self.cores) > 1 and y_max - y_min >= 2 * MIN_BAND_ROWS
+
+    def fill(self, job, figures: List[List[Point]]) -> SharedSpanImage:
+        if self.executor is None:
+            # spawn, а не fork: форк процесса с запущенным Qt небезопасен
+            self.executor = ProcessPoolExecutor(len(self.cores), get_context('spawn'))
+        span_image = SharedSpanImage(figures)
+        _, y_max = get_y_extremum(figures)
+        rows = span_image.mask.shape[0]
+        count = min(len(self.cores), max(rows // MIN_BAND_ROWS, 1))
+        bounds = [rows * i // count for i in range(count + 1)]
+        futures = [self.executor.submit(fill_band, span_image.shm.name, span_image.mask.shape, span_image.x0,
+                                        figures, y_max, row_from, row_to)
+                   for row_from, row_to in zip(bounds, bounds[1:])]
+        try:
+            job.report(0, count)
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                job.report(done, count)
+        finally:
+            # при отмене или ошибке дождаться уже начатых полос: они пишут в общую память
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            span_image.release()
+        return span_image
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
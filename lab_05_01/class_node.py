@@ -3,6 +3,7 @@ from dataclasses import dataclass
 
 @dataclass(order=True)
 class Node:
+    __slots__ = ('x', 'dx', 'dy')
     x: float
     dx: float
     dy: int
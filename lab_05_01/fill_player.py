@@ -0,0 +1,102 @@
+from typing import Callable, Iterable, List, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, QRect, QRectF, QPointF, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+
+# пошаговая заливка без задержек внутри алгоритма: алгоритм считает с полной скоростью и
+# записывает шаги, а проигрыватель по таймеру дорисовывает их в изображение;
+# шаг - несколько отрезков строк (строка, левый столбец, правый столбец не включая)
+Run = Tuple[int, int, int]
+
+
+class FillRecording:
+    def __init__(self):
+        self.runs: List[Run] = []
+        self.bounds = [0]  # шаг i - отрезки runs[bounds[i]:bounds[i + 1]]
+
+    def add_step(self, runs: Iterable[Run]) -> None:
+        self.runs.extend(runs)
+        self.bounds.append(len(self.runs))
+
+    def __len__(self) -> int:
+        return len(self.bounds) - 1
+
+    def step_runs(self, first: int, last: int) -> List[Run]:
+        return self.runs[self.bounds[first]:self.bounds[last]]
+
+
+class ImageItem(QGraphicsItem):
+    # рисуется прямо из QImage: после изменения строк перерисовывается только их полоса сцены
+    def __init__(self, image: QImage, offset: QPointF = QPointF(0, 0)):
+        super().__init__()
+        self.image = image
+        self.offset = QPointF(offset)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(self.offset, QRectF(self.image.rect()).size())
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None) -> None:
+        target = option.exposedRect & self.boundingRect()
+        painter.drawImage(target, self.image, target.translated(-self.offset))
+
+    def set_image(self, image: QImage) -> None:
+        if image.size() != self.image.size():
+            self.prepareGeometryChange()
+        self.image = image
+        self.update()
+
+    def update_rect(self, rect: QRect) -> None:
+        self.update(QRectF(rect).translated(self.offset))
+
+
+class FillPlayer(QObject):
+    # сигналы как у Job, чтобы проигрыванием управлял JobControls (прогресс, отмена)
+    progress = pyqtSignal(int, int)
+    frame_shown = pyqtSignal(int)  # номер последнего показанного шага
+    finished = pyqtSignal()
+
+    def __init__(self, recording: FillRecording, image: QImage, color: QColor,
+                 on_frame: Callable[[QRect], None], steps_per_frame: int = 1, interval: int = 10,
+                 parent: QObject = None):
+        super().__init__(parent)
+        self.recording = recording
+        self.image = image
+        self.color = QColor(color)
+        self.on_frame = on_frame
+        self.steps_per_frame = max(steps_per_frame, 1)
+        self.step = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.show_next)
+
+    def start(self) -> None:
+        self.timer.start()
+
+    def show_next(self) -> None:
+        last = min(self.step + self.steps_per_frame, len(self.recording))
+        runs = self.recording.step_runs(self.step, last)
+        self.step = last
+        if runs:
+            # цвет пишется как есть, без смешивания: так же, как setPixel
+            painter = QPainter(self.image)
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            for row, left, right in runs:
+                painter.fillRect(left, row, right - left, 1, self.color)
+            painter.end()
+            rows = [row for row, _, _ in runs]
+            lefts = min(left for _, left, _ in runs)
+            rights = max(right for _, _, right in runs)
+            self.on_frame(QRect(lefts, min(rows), rights - lefts, max(rows) - min(rows) + 1))
+        self.frame_shown.emit(self.step)
+        self.progress.emit(self.step, len(self.recording))
+        if self.step == len(self.recording):
+            self.timer.stop()
+            self.finished.emit()
+
+    def cancel(self) -> None:
+        # результат уже посчитан: отмена только пропускает оставшуюся анимацию
+        if self.timer.isActive():
+            self.timer.stop()
+            self.finished.emit()
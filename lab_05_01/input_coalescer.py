@@ -0,0 +1,49 @@
+from typing import Callable, Union
+
+from PyQt5.QtCore import QObject, QPoint, QPointF, QTimer
+
+# движения мыши и шаги колесика применяются не чаще раза в кадр: первое событие - сразу,
+# следующие до конца кадра копятся (от движений остается последняя позиция, шаги колесика
+# складываются) и применяются разом по таймеру
+FRAME_INTERVAL = 16  # мс, около 60 кадров в секунду
+
+
+class InputCoalescer(QObject):
+    def __init__(self, on_move: Callable[[Union[QPoint, QPointF]], None],
+                 on_wheel: Callable[[int], None] = None, parent: QObject = None):
+        super().__init__(parent)
+        self.on_move = on_move
+        self.on_wheel = on_wheel
+        self.move_pos = None
+        self.wheel_steps = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(FRAME_INTERVAL)
+        self.timer.timeout.connect(self.next_frame)
+
+    def move(self, pos: Union[QPoint, QPointF]) -> None:
+        self.move_pos = type(pos)(pos)  # копия: объект события Qt переиспользует
+        self.schedule()
+
+    def wheel(self, steps: int) -> None:
+        self.wheel_steps += steps
+        self.schedule()
+
+    def schedule(self) -> None:
+        if not self.timer.isActive():
+            self.flush()
+            self.timer.start()
+
+    def next_frame(self) -> None:
+        if self.move_pos is not None or self.wheel_steps:
+            self.flush()
+            self.timer.start()
+
+    def flush(self) -> None:
+        # применить накопленное сейчас: перед нажатиями и клавишами, чтобы порядок событий не менялся
+        steps, self.wheel_steps = self.wheel_steps, 0
+        pos, self.move_pos = self.move_pos, None
+        if steps and self.on_wheel is not None:
+            self.on_wheel(steps)
+        if pos is not None:
+            self.on_move(pos)
@@ -7,15 +7,18 @@ from PyQt5 import QtWidgets
 from PyQt5 import uic
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsLineItem, QGraphicsEllipseItem, QGraphicsTextItem, QColorDialog
-from PyQt5.QtGui import QWheelEvent, QMouseEvent, QPen, QColor, QFont
+from PyQt5.QtGui import QWheelEvent, QMouseEvent, QColor, QFont, QCloseEvent
 
 from dialogs import show_author, show_task, show_instruction, show_err_win, show_war_win
 from class_point import Point
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
 from input_checks import params_to_float
-from paint_algs import paint_alg
+from paint_algs import paint_alg, rasterize_figures, SpanImage, SpanImageItem
+from paint_algs_np import rasterize_figures_np
+from band_fill import BandPool
+from workers import Job, JobControls
 
-grid_lines: List[QGraphicsLineItem] = []
-max_win_size: List[int] = [0, 0, 0]
 point_list: List[Point] = []
 point_scale: List[float] = []
 coords_desc: List[QGraphicsTextItem] = []
@@ -38,11 +41,13 @@ class Ui(QtWidgets.QMainWindow):
     def __init__(self):
         super(Ui, self).__init__()
         uic.loadUi("./template.ui", self)  # временно в корне
+        self.jobs = JobControls(self)
+        self.band_pool = BandPool()
 
         self.scene = QGraphicsScene()
         self.graphicsView.setScene(self.scene)
-        self.need_grid()
-        self.add_grid()
+        self.grid = GridBackground(self.graphicsView)
+        self.update_grid()
 
         # menu bar
         self.about_author.triggered.connect(show_author)
@@ -61,6 +66,7 @@ class Ui(QtWidgets.QMainWindow):
         self.paint_figure_button.clicked.connect(self.paint_figures)
 
         # graphics view mouse events
+        self.input = InputCoalescer(self.apply_mouse_move, self.apply_wheel, self)
         self.graphicsView.mousePressEvent = self.mousePressEvent
         self.graphicsView.wheelEvent = self.wheel_event
         self.graphicsView.mouseReleaseEvent = self.mouseReleaseEvent
@@ -69,13 +75,13 @@ class Ui(QtWidgets.QMainWindow):
         self.show()
 
     def wheel_event(self, event: QWheelEvent) -> None:
-        global scale
-        factor = 1.2
+        self.input.wheel(1 if event.angleDelta().y() > 0 else -1)
 
-        if event.angleDelta().y() > 0:
-            self.graphicsView.scale(factor, factor)
-        else:
-            self.graphicsView.scale(1.0 / factor, 1.0 / factor)
+    def apply_wheel(self, steps: int) -> None:
+        # steps - сумма шагов колесика за кадр, каждый шаг - масштаб в 1.2 раза
+        global scale
+        factor = 1.2 ** steps
+        self.graphicsView.scale(factor, factor)
 
         # Получаем текущий масштаб по оси X (и Y)
         scale = self.graphicsView.transform().m11()
@@ -83,121 +89,62 @@ class Ui(QtWidgets.QMainWindow):
             point = scene_point_list[i]
             point.setTransformOriginPoint(point.boundingRect().center())
             point.setScale(1 / (scale * point_scale[i]))
-        if self.need_grid():
-            for grid_line in grid_lines:
-                if grid_line in self.scene.items():
-                    self.scene.removeItem(grid_line)
-            self.add_grid()
+        self.update_grid()
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         global is_pressed, dragging
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             if not dragging:
-                self.scene.removeItem(self.scene.items()[-1])
                 self.add_point_by_click(event)
             dragging = False
             is_pressed = False
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        global last_pos, dragging
+        global dragging
         if is_pressed:
             dragging = True
-            dx = event.pos().x() - last_pos.x()
-            dy = event.pos().y() - last_pos.y()
+        self.input.move(event.pos())
+
+    def apply_mouse_move(self, pos: QPoint) -> None:
+        global last_pos
+        if is_pressed:
+            dx = pos.x() - last_pos.x()
+            dy = pos.y() - last_pos.y()
             self.graphicsView.horizontalScrollBar().setValue(
                 self.graphicsView.horizontalScrollBar().value() - dx)
             self.graphicsView.verticalScrollBar().setValue(
                 self.graphicsView.verticalScrollBar().value() - dy)
-            last_pos = event.pos()
-            if self.need_grid():
-                for grid_line in grid_lines:
-                    if grid_line in self.scene.items():
-                        self.scene.removeItem(grid_line)
-                self.add_grid()
-        scene_pos = self.graphicsView.mapToScene(event.pos())
+            last_pos = pos
+        scene_pos = self.graphicsView.mapToScene(pos)
         self.current_coords_label.setText(
             f'x :{scene_pos.x():.2f}, y :{-scene_pos.y():.2f}')
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         global last_pos, is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = True
             last_pos = event.pos()
         elif event.button() == Qt.RightButton:
             self.del_point_by_click(event)
 
-    def need_grid(self) -> bool:
-        global max_win_size
-        flag: bool = False
-        max_size = self.graphicsView.maximumSize()
-        max_width = int(max_size.width() * (1 / scale))
-        max_height = int(max_size.height() * (1 / scale))
-        grid_interval = int(50 * (1 / scale))
-        grid_interval = round(grid_interval / 50) * 50
-        if grid_interval != max_win_size[2]:
-            max_win_size[2] = grid_interval
-            flag = True
-        if max_win_size[0] < max_width and max_win_size[1] < max_height:
-            max_win_size[0] = max_width
-            max_win_size[1] = max_height
-            flag = True
-        return flag
-
-    def add_grid(self) -> None:
-        global grid_lines, max_win_size
-        max_width = max_win_size[0]
-        max_height = max_win_size[1]
-        grid_interval = max_win_size[2]
-        if grid_interval == 0:
-            grid_interval = 20
-        self.current_grid_label.setText(f'Текущий шаг сетки: {grid_interval}')
-        start_grid_width = - ((max_width // 2) +
-                              grid_interval - (max_width // 2) % grid_interval)
-        start_grid_height = - \
-            ((max_height // 2) + grid_interval - (max_height // 2) % grid_interval)
-        end_grid_width = (max_width // 2) - (max_width // 2) % grid_interval
-        end_grid_height = (max_height // 2) - (max_width // 2) % grid_interval
-        pen = QPen(Qt.darkGray)
-        pen_width = 1 if int(1 / scale) == 0 else int(1 / scale)
-        pen.setWidth(pen_width)
-        for x in range(start_grid_width, end_grid_width, grid_interval):
-            line = QGraphicsLineItem(x, start_grid_height, x, end_grid_height)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-        for y in range(start_grid_height, end_grid_height, grid_interval):
-            line = QGraphicsLineItem(start_grid_width, y, end_grid_width, y)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-
-        axis_x = QGraphicsLineItem(-300 * (1 / scale), 0, 300 * (1 / scale), 0)
-        axis_y = QGraphicsLineItem(0, -300 * (1 / scale), 0, 300 * (1 / scale))
-        pen.setColor(Qt.white)
-        grid_lines.append(axis_x)
-        grid_lines.append(axis_y)
-        axis_x.setPen(pen)
-        axis_y.setPen(pen)
-        axis_x.setZValue(0)
-        axis_y.setZValue(0)
-        self.scene.addItem(axis_x)
-        self.scene.addItem(axis_y)
+    def update_grid(self) -> None:
+        if self.grid.update(scale):
+            self.current_grid_label.setText(f'Текущий шаг сетки: {self.grid.step}')
 
     def change_color(self, color: QColor) -> None:
         global current_line_color
         current_line_color = color
         objects = self.scene.items()
         for obj in objects:
-            if obj not in grid_lines and not isinstance(obj, QGraphicsTextItem):
+            if not isinstance(obj, QGraphicsTextItem):
                 obj.setPen(current_line_color)
 
     def clear_scene(self):
         global prev_figure_points, current_figure_points
         for item in self.scene.items():
-            if item not in grid_lines:
-                self.scene.removeItem(item)
+            self.scene.removeItem(item)
         point_list.clear()
         point_scale.clear()
         coords_desc.clear()
@@ -378,23 +325,50 @@ class Ui(QtWidgets.QMainWindow):
         if colour.isValid():
             self.change_color(QColor(colour))
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        # пул закрывается только после конца потока заливки: его finally освобождает общую память полос
+        self.jobs.stop()
+        self.band_pool.shutdown()
+        super().closeEvent(event)
+
     def paint_figures(self, func_testing=False):
         delay = False
         if self.set_delay_cb.isChecked():
             delay = True
         if len(figures) == 0:
             show_err_win("Ошибка. Фигура не замкнута")
+        elif delay:
+            # закраска считается сразу, строки показываются по таймеру
+            player = paint_alg(figures, self, current_line_color,
+                               test_i if func_testing else 0, self.delay_steps_sb.value(), func_testing)
+            self.jobs.start(player, self.paint_figure_button, self.clear_button, self.change_color_button)
+            if func_testing:
+                self.jobs.wait()
         else:
+            # расчет в отдельном потоке по копии фигур, на сцену строки выводятся уже в потоке GUI
+            figures_copy = [[Point(p.x, p.y) for p in figure] for figure in figures]
+            if self.band_pool.is_useful(figures_copy):
+                # высокая область - полосами строк на всех ядрах (результат тот же)
+                rasterize = self.band_pool.fill
+            elif self.numpy_backend_cb.isChecked():
+                rasterize = rasterize_figures_np
+            else:
+                rasterize = rasterize_figures
+            job = Job(rasterize, figures_copy, parent=self)
             start = time()
-            paint_alg(figures, self, current_line_color,
-                      test_i, delay, func_testing)
-            end = time()
-            if not delay:
-                if func_testing:
-                    with open('report-functesting-latest.txt', 'a+') as f:
-                        f.write(f"Paint alg time in test {test_i}: {(end - start) * 1000:.2f} mc.\n")
-                else:
-                    show_war_win(f"Время выполнения алгоритма: {(end - start) * 1000:.2f} мс.")
+            job.result_ready.connect(lambda span_image: self.draw_span_image(span_image, start, func_testing))
+            self.jobs.start(job, self.paint_figure_button, self.clear_button)
+            if func_testing:
+                self.jobs.wait()
+
+    def draw_span_image(self, span_image: SpanImage, start: float, func_testing=False) -> None:
+        self.scene.addItem(SpanImageItem(span_image, current_line_color))
+        end = time()
+        if func_testing:
+            with open('report-functesting-latest.txt', 'a+') as f:
+                f.write(f"Paint alg time in test {test_i}: {(end - start) * 1000:.2f} mc.\n")
+        else:
+            show_war_win(f"Время выполнения алгоритма: {(end - start) * 1000:.2f} мс.")
 
 
 if __name__ == '__main__':
@@ -413,6 +387,8 @@ if __name__ == '__main__':
                 Point(float(sys.argv[2 * _ + 3]), float(sys.argv[2 * _ + 4])))
         if sys.argv[-1] == 'true':
             window.set_delay_cb.setChecked(True)
+        if sys.argv[-1] == 'np':
+            window.numpy_backend_cb.setChecked(True)
         window.close_figure()
         window.paint_figures(func_testing=True)
 
@@ -1,6 +1,16 @@
+import numpy as np
 import pytest
 from class_point import Point
-from paint_algs import get_y_extremum, get_figure_edges, create_empty_linked_list
+from paint_algs import get_y_extremum, get_figure_edges, create_empty_linked_list, iter_scan_lines, SpanImage, \
+    record_fill
+from paint_algs_np import fill_figures_np, get_crossings, fill_rows
+from band_fill import SharedSpanImage, fill_band
+from fill_player import FillPlayer
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
+from PyQt5.QtCore import QPoint, QLineF, QRectF, QPointF
+from PyQt5.QtWidgets import QApplication, QGraphicsScene, QGraphicsView
+from PyQt5.QtGui import QColor, QImage, QBrush
 
 
 @pytest.fixture
@@ -33,3 +43,172 @@ def test_get_figure_edges():
 
 def test_create_empty_linked_list():
     assert (len(create_empty_linked_list(-222.6, 23.3)) == 246)
+
+
+def test_iter_scan_lines():
+    square = [Point(0, 0), Point(0, 10), Point(20, 10), Point(20, 0)]
+    lines = list(iter_scan_lines([square]))
+    assert [y for y, _ in lines] == list(range(10, 0, -1))
+    assert lines[0] == (10, [(0, 20)]) and all(spans == [(0, 20)] for _, spans in lines)
+
+
+def test_iter_scan_lines_float():
+    square = [Point(0.5, 0.25), Point(0.5, 10.75), Point(20.5, 10.75), Point(20.5, 0.25)]
+    lines = list(iter_scan_lines([square]))
+    assert len(lines) == 11 and all(spans == [(0.5, 20.5)] for _, spans in lines)
+
+
+def test_span_image():
+    figure = [Point(-7, 3), Point(12, 40), Point(30, -5), Point(9, 8)]
+    lines = list(iter_scan_lines([figure]))
+    by_lines, at_once = SpanImage([figure]), SpanImage([figure])
+    for row, (_, spans) in enumerate(lines):
+        by_lines.add_line(row, spans)
+    at_once.add_lines(lines)
+    assert (by_lines.mask == at_once.mask).all()
+    assert at_once.mask.shape == (45, 38) and at_once.mask[0].sum() == 1
+
+
+def test_fill_figures_np():
+    figures = [[Point(-7, 3), Point(12, 40), Point(30, -5), Point(9, 8)],
+               [Point(-20.5, 10.25), Point(25.75, 12.5), Point(0.3, -17.6)]]
+    expected = SpanImage(figures)
+    expected.add_lines(list(iter_scan_lines(figures)))
+    assert (fill_figures_np(figures).mask == expected.mask).all()
+
+
+def test_fill_band():
+    figures = [[Point(-7, 3), Point(12, 40), Point(30, -5), Point(9, 8)],
+               [Point(-20.5, 10.25), Point(25.75, 12.5), Point(0.3, -17.6)]]
+    shared = SharedSpanImage(figures)
+    rows = shared.mask.shape[0]
+    for row_from, row_to in ((0, 20), (20, 21), (21, rows)):
+        fill_band(shared.shm.name, shared.mask.shape, shared.x0, figures, 40, row_from, row_to)
+    shared.release()
+    assert (shared.mask == fill_figures_np(figures).mask).all()
+
+
+def test_band_crossings():
+    # полоса начинает ребра сразу со своей строки, но x набирается теми же сложениями шага:
+    # пересечения совпадают с проходом по всем строкам точно
+    figures = [[Point(0, 0), Point(300, 400.5), Point(-100.25, 399)]]
+    _, y_max = get_y_extremum(figures)
+    rows = SpanImage(figures).mask.shape[0]
+    all_rows, all_xs = get_crossings(figures, rows, y_max)
+    for row_from, row_to in ((0, 137), (137, 138), (138, rows)):
+        band_rows, band_xs = get_crossings(figures, rows, y_max, row_from, row_to)
+        inside = (all_rows >= row_from) & (all_rows < row_to)
+        expected, order = np.lexsort((all_xs[inside], all_rows[inside])), np.lexsort((band_xs, band_rows))
+        assert (band_rows[order] == all_rows[inside][expected]).all()
+        assert (band_xs[order] == all_xs[inside][expected]).all()
+
+
+@pytest.mark.parametrize('bands', [2, 3, 5, 6])
+def test_band_fill_integer(bands):
+    # у целых вершин пересечения часто ровно посередине между пикселями: заливка полосами
+    # не должна зависеть от их числа
+    figures = [[Point(-250, -180), Point(170, 290), Point(300, -60), Point(40, 10)],
+               [Point(-120, 240), Point(-20, -290), Point(90, 230)],
+               [Point(-300, 0), Point(299, 1), Point(0, 300)]]
+    expected = fill_figures_np(figures).mask
+    span_image = SpanImage(figures)
+    _, y_max = get_y_extremum(figures)
+    rows = span_image.mask.shape[0]
+    bounds = [rows * i // bands + i for i in range(bands)] + [rows]
+    for row_from, row_to in zip(bounds, bounds[1:]):
+        fill_rows(span_image.mask, span_image.x0, figures, y_max, row_from, row_to)
+    assert (span_image.mask == expected).all()
+
+
+def test_record_fill():
+    figures = [[Point(-7, 3), Point(12, 40), Point(30, -5), Point(9, 8)]]
+    span_image, recording = record_fill(figures)
+    height, width = span_image.mask.shape
+    played = QImage(width, height, QImage.Format_ARGB32)
+    played.fill(0)
+    player = FillPlayer(recording, played, QColor(255, 0, 0), lambda rect: None, steps_per_frame=5)
+    while player.step < len(recording):
+        player.show_next()
+    assert len(recording) == height and played == span_image.to_image(QColor(255, 0, 0))
+
+
+def test_input_coalescer():
+    # за кадр от движений остается последняя позиция, шаги колесика складываются
+    # и применяются раньше движения; первое событие кадра применяется сразу
+    calls = []
+    coalescer = InputCoalescer(lambda pos: calls.append(('move', pos)), lambda steps: calls.append(('wheel', steps)))
+    coalescer.move(QPoint(1, 1))
+    for i in range(2, 5):
+        coalescer.move(QPoint(i, i))
+    for steps in (1, 2, -1):
+        coalescer.wheel(steps)
+    assert calls == [('move', QPoint(1, 1))]
+    coalescer.flush()
+    assert calls == [('move', QPoint(1, 1)), ('wheel', 2), ('move', QPoint(4, 4))]
+    coalescer.next_frame()
+    assert len(calls) == 3
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def grid_view(qt_app):
+    view = QGraphicsView()
+    view.setScene(QGraphicsScene())
+    view.setMaximumSize(800, 600)
+    return view
+
+
+def old_grid_lines(max_width: int, max_height: int, interval: int, scale: float):
+    # линии сетки и осей так, как их строил add_grid элементами сцены
+    step = interval if interval != 0 else 20
+    start_width = - ((max_width // 2) + step - (max_width // 2) % step)
+    start_height = - ((max_height // 2) + step - (max_height // 2) % step)
+    end_width = (max_width // 2) - (max_width // 2) % step
+    end_height = (max_height // 2) - (max_width // 2) % step
+    vertical = [QLineF(x, start_height, x, end_height) for x in range(start_width, end_width, step)]
+    horizontal = [QLineF(start_width, y, end_width, y) for y in range(start_height, end_height, step)]
+    axes = [QLineF(-300 * (1 / scale), 0, 300 * (1 / scale), 0), QLineF(0, -300 * (1 / scale), 0, 300 * (1 / scale))]
+    return vertical, horizontal, axes
+
+
+def test_grid_update(grid_view):
+    grid = GridBackground(grid_view)
+    assert grid.update(1.0)
+    assert (grid.step, grid.max_width, grid.max_height) == (50, 800, 600)
+    assert not grid.update(1.0)
+    assert not grid.update(1.2)  # шаг тот же, границы меньше прежних
+    assert grid.update(0.5)
+    assert (grid.step, grid.max_width, grid.max_height) == (100, 1600, 1200)
+    assert not grid.update(0.5)
+    assert grid_view.scene().sceneRect().contains(grid.bounds())
+
+
+@pytest.mark.parametrize('scale', [1.0, 0.5, 0.3, 2.0])
+def test_grid_extents(grid_view, scale):
+    grid = GridBackground(grid_view)
+    grid.update(scale)
+    vertical, horizontal, axes = old_grid_lines(grid.max_width, grid.max_height, grid.interval, scale)
+    half = grid.pen_width() / 2
+
+    def extent(lines):
+        rect = QRectF()
+        for line in lines:
+            rect |= QRectF(line.p1(), line.p2())
+        return rect.adjusted(-half, -half, half, half)
+
+    assert grid.regions() == (extent(vertical), extent(horizontal))
+    assert grid.bounds() == extent(vertical + horizontal + axes)
+
+
+def test_grid_background_brush(grid_view):
+    grid_view.resize(300, 300)
+    grid_view.setBackgroundBrush(QBrush(QColor(200, 0, 0)))
+    GridBackground(grid_view).update(1.0)
+    image = grid_view.viewport().grab().toImage()
+    # середина клетки сетки, вдали от линий и осей
+    cell = grid_view.mapFromScene(QPointF(25, 25))
+    assert image.pixelColor(cell) == QColor(200, 0, 0)
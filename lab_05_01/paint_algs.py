@@ -1,13 +1,16 @@
-import time
 from copy import copy
-from typing import List, Tuple, Dict
+from math import ceil, floor
+from operator import attrgetter
+from typing import List, Tuple, Iterator
 
-from PyQt5.QtCore import QEventLoop
-from PyQt5.QtGui import QColor
-from PyQt5.QtWidgets import QGraphicsLineItem, QGraphicsScene, QMainWindow, QApplication
+import numpy as np
+from PyQt5.QtCore import QPointF
+from PyQt5.QtGui import QColor, QImage, QPixmap
+from PyQt5.QtWidgets import QGraphicsPixmapItem, QMainWindow
 
 from class_node import Node
 from class_point import Point
+from fill_player import FillRecording, FillPlayer, ImageItem
 
 
 def get_figure_edges(figures: List[List[Point]]) -> List[List[Point]]:
@@ -21,6 +24,11 @@ def get_figure_edges(figures: List[List[Point]]) -> List[List[Point]]:
     return edges
 
 
+def get_x_extremum(figures: List[List[Point]]) -> Tuple[float, float]:
+    xs = [point.x for figure in figures for point in figure]
+    return min(xs), max(xs)
+
+
 def get_y_extremum(figures: List[List[Point]]) -> Tuple[float, float]:
     y_min = figures[0][0].y
     y_max = figures[0][0].y
@@ -33,14 +41,12 @@ def get_y_extremum(figures: List[List[Point]]) -> Tuple[float, float]:
     return y_min, y_max
 
 
-def create_empty_linked_list(y_min: float, y_max: float) -> Dict:
-    linked_list = {}
-    for _ in range(round(y_max), round(y_min), -1):
-        linked_list[_] = []
-    return linked_list
+def create_empty_linked_list(y_min: float, y_max: float) -> List[List[Node]]:
+    # таблица ребер: корзина j - ребра, которые становятся активными на строке y_max - j
+    return [[] for _ in range(ceil(y_max - y_min))]
 
 
-def fill_in_nodes(y_groups: Dict, p0: Point, p1: Point) -> None:
+def fill_in_nodes(edge_table: List[List[Node]], y_max: float, p0: Point, p1: Point) -> None:
     if p0.y > p1.y:
         p1.x, p0.x = p0.x, p1.x
         p1.y, p0.y = p0.y, p1.y
@@ -49,74 +55,173 @@ def fill_in_nodes(y_groups: Dict, p0: Point, p1: Point) -> None:
 
     if y_p != 0:
         x_step = -(p1.x - p0.x) / y_p
-        if p1.y not in y_groups:
-            y_groups[p1.y] = [Node(p1.x, x_step, y_p)]
-        else:
-            y_groups[p1.y].append(Node(p1.x, x_step, y_p))
-
-
-def iter_active_edges(active_edges: List[Node]) -> None:
-    i = 0
-    while i < len(active_edges):
-        active_edges[i].x += active_edges[i].dx
-        active_edges[i].dy -= 1
-        if active_edges[i].dy < 1:
-            active_edges.pop(i)
-        else:
-            i += 1
-
-
-def append_active_edges(y_groups: Dict, active_edges: List[Node], y: float) -> None:
-    if y in y_groups:
-        for y_group in y_groups.get(y):
-            active_edges.append(y_group)
-    active_edges.sort(key=lambda edge: edge.x)
-
-
-def draw_curr_scan_string(scene: QGraphicsScene, active_edges: List[Point], y: float, color: QColor) -> None:
-    for i in range(0, len(active_edges), 2):
-        try:
-            line = QGraphicsLineItem(
-                active_edges[i].x, -y, active_edges[i + 1].x, -y)
-            line.setPen(color)
-            line.setZValue(1)
-            scene.addItem(line)
-        except IndexError:
-            line = QGraphicsLineItem(
-                active_edges[i].x, -y, active_edges[i - 1].x, -y)
-            line.setPen(color)
-            line.setZValue(1)
-            scene.addItem(line)
-
-
-def paint_alg(figures: List[List[Point]], win: QMainWindow, color: QColor, test_i: int, delay=False, func_testing=False) -> List[Point]:
+        # первая строка не выше верхнего конца (x сдвигается на дробную часть разницы),
+        # ребро активно на всех строках выше нижнего конца
+        j = ceil(y_max - p1.y)
+        y = y_max - j
+        if j < len(edge_table) and y > p0.y:
+            edge_table[j].append(Node(p1.x + x_step * (p1.y - y), x_step, ceil(y - p0.y)))
+
+
+edge_x = attrgetter('x')
+
+
+def iter_active_edges(active_edges: List[Node]) -> List[Node]:
+    # закончившиеся ребра отбрасываются за один проход, без pop из середины списка
+    alive = []
+    for edge in active_edges:
+        edge.x += edge.dx
+        edge.dy -= 1
+        if edge.dy >= 1:
+            alive.append(edge)
+    return alive
+
+
+def append_active_edges(active_edges: List[Node], new_edges: List[Node]) -> None:
+    # после сдвига список почти упорядочен (порядок меняется только там, где ребра пересеклись),
+    # а новые ребра дописываются в конец: Timsort находит готовый отсортированный участок и
+    # вставляет в него остальное, то есть строка обходится за O(k), а не за O(k log k)
+    active_edges += new_edges
+    active_edges.sort(key=edge_x)
+
+
+def get_scan_spans(active_edges: List[Node]) -> List[Tuple[float, float]]:
+    xs = [edge.x for edge in active_edges]
+    spans = list(zip(xs[0::2], xs[1::2]))
+    if len(xs) % 2:
+        spans.append((xs[-1], xs[-2]))
+    return spans
+
+
+def iter_scan_lines(figures: List[List[Point]]) -> Iterator[Tuple[float, List[Tuple[float, float]]]]:
+    # расчет закраски без обращения к сцене: по очереди отдает строки (y, отрезки заливки)
     y_min, y_max = get_y_extremum(figures)
-    edges = get_figure_edges(figures)
-    y_groups = create_empty_linked_list(y_min, y_max)
+    edge_table = create_empty_linked_list(y_min, y_max)
 
-    for edge in edges:
-        fill_in_nodes(y_groups, copy(edge[0]), copy(edge[1]))
+    for edge in get_figure_edges(figures):
+        fill_in_nodes(edge_table, y_max, copy(edge[0]), copy(edge[1]))
 
-    y_start = y_min
-    y_end = y_max
+    y = y_max
     active_edges = []
+    for new_edges in edge_table:
+        active_edges = iter_active_edges(active_edges)
+        append_active_edges(active_edges, new_edges)
+        yield y, get_scan_spans(active_edges)
+        y -= 1
+
+
+class SpanImage:
+    # строки закраски пишутся в маску (строка маски - строка сканирования, столбец - целый x),
+    # на сцену выводится одно изображение вместо QGraphicsLineItem на каждый отрезок
+    def __init__(self, figures: List[List[Point]]):
+        y_min, y_max = get_y_extremum(figures)
+        x_min, x_max = get_x_extremum(figures)
+        self.x0 = floor(x_min)
+        self.y_top = y_max
+        self.mask = np.zeros((max(ceil(y_max - y_min), 1), ceil(x_max) - self.x0 + 1), dtype=bool)
+
+    def columns(self, spans: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        # пиксели, центры которых лежат между концами отрезка (как у линии толщиной 1)
+        xs = np.array(spans, dtype=np.float64).reshape(-1, 2)
+        width = self.mask.shape[1]
+        lefts = np.clip(np.rint(xs.min(axis=1)) - self.x0, 0, width).astype(np.intp)
+        rights = np.clip(np.rint(xs.max(axis=1)) - self.x0 + 1, 0, width).astype(np.intp)
+        return lefts, rights
+
+    def add_line(self, row: int, spans: List[Tuple[float, float]]) -> None:
+        for left, right in zip(*self.columns(spans)):
+            self.mask[row, left:right] = True
+
+    def add_lines(self, lines: List[Tuple[float, List[Tuple[float, float]]]]) -> None:
+        # все строки сразу: +1 в начале отрезка, -1 после конца, накопленная сумма > 0 - закрашено
+        rows = np.repeat(np.arange(len(lines)), [len(spans) for _, spans in lines])
+        if len(rows) == 0:
+            return
+        lefts, rights = self.columns([span for _, spans in lines for span in spans])
+        counts = np.zeros((self.mask.shape[0], self.mask.shape[1] + 1), dtype=np.int32)
+        np.add.at(counts, (rows, lefts), 1)
+        np.add.at(counts, (rows, rights), -1)
+        self.mask |= np.cumsum(counts, axis=1)[:, :-1] > 0
+
+    def to_image(self, color: QColor) -> QImage:
+        height, width = self.mask.shape
+        argb = np.where(self.mask, np.uint32(color.rgba()), np.uint32(0))
+        return QImage(argb.data, width, height, 4 * width, QImage.Format_ARGB32).copy()
+
+
+class SpanImageItem(QGraphicsPixmapItem):
+    def __init__(self, span_image: SpanImage, color: QColor):
+        super().__init__()
+        self.span_image = span_image
+        # пиксель (0, 0) - точка (x0, -y_top) сцены, центр пикселя совпадает с точкой
+        self.setOffset(span_image.x0 - 0.5, -span_image.y_top - 0.5)
+        self.setZValue(1)
+        self.setPen(color)
+
+    def setPen(self, color: QColor) -> None:
+        # как у прежних линий заливки: Ui.change_color перекрашивает элементы сцены через setPen
+        self.color = QColor(color)
+        self.update_image()
+
+    def update_image(self) -> None:
+        self.setPixmap(QPixmap.fromImage(self.span_image.to_image(self.color)))
+
+
+def rasterize_figures(job, figures: List[List[Point]]) -> SpanImage:
+    # для Job: закраска считается и пишется в маску вне потока GUI
+    y_min, y_max = get_y_extremum(figures)
+    lines = []
+    for y, spans in iter_scan_lines(figures):
+        lines.append((y, spans))
+        if len(lines) % 64 == 0:
+            job.report(len(lines), int(y_max - y_min))
+    span_image = SpanImage(figures)
+    span_image.add_lines(lines)
+    return span_image
+
+
+def record_fill(figures: List[List[Point]]) -> Tuple[SpanImage, FillRecording]:
+    # закраска с полной скоростью, строки записываются для пошагового показа
+    span_image = SpanImage(figures)
+    recording = FillRecording()
+    for row, (_, spans) in enumerate(iter_scan_lines(figures)):
+        span_image.add_line(row, spans)
+        recording.add_step((row, left, right) for left, right in zip(*span_image.columns(spans)) if left < right)
+    return span_image, recording
+
+
+def paint_alg(figures: List[List[Point]], win: QMainWindow, color: QColor, test_i: int, steps_per_frame=1,
+              func_testing=False) -> FillPlayer:
+    # пошаговая закраска: строки дорисовываются по таймеру, в конце - обычное изображение заливки
+    y_min, y_max = get_y_extremum(figures)
+    span_image, recording = record_fill(figures)
+    height, width = span_image.mask.shape
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(0)
+    item = ImageItem(image, QPointF(span_image.x0 - 0.5, -span_image.y_top - 0.5))
+    item.setZValue(1)
+    win.scene.addItem(item)
+    player = FillPlayer(recording, image, color, item.update_rect, steps_per_frame, parent=win)
+
+    def show_result() -> None:
+        win.scene.removeItem(item)
+        win.scene.addItem(SpanImageItem(span_image, color))
+
+    player.finished.connect(show_result)
     if func_testing:
-        step_screenshot = abs(y_end - y_start) // 7
+        step_screenshot = abs(y_max - y_min) // 7
         start = 0
         screenshot_i = 0
-    while y_end > y_start:
-        iter_active_edges(active_edges)
-        append_active_edges(y_groups, active_edges, y_end)
-        draw_curr_scan_string(win.scene, active_edges, y_end, color)
-        y_end -= 1
-        if delay:
-            if func_testing:
-                if start == step_screenshot:
-                    screenshot = win.grab()
-                    screenshot.save(
-                        f'./results/test_delay_{test_i}_{screenshot_i}.png', 'png')
-                    start = 0
-                    screenshot_i += 1
-                start += 1
-            QApplication.processEvents(QEventLoop.AllEvents, 1)
-            time.sleep(0.01)
+
+        def take_screenshot(step: int) -> None:
+            nonlocal start, screenshot_i
+            if start == step_screenshot:
+                screenshot = win.grab()
+                screenshot.save(
+                    f'./results/test_delay_{test_i}_{screenshot_i}.png', 'png')
+                start = 0
+                screenshot_i += 1
+            start += 1
+
+        player.frame_shown.connect(take_screenshot)
+    return player
@@ -0,0 +1,121 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from class_point import Point
+from paint_algs import SpanImage, get_y_extremum
+
+
+def get_edge_arrays(figures: List[List[Point]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # концы всех ребер (замкнутых фигур) массивами: нижний (x0, y0) и верхний (x1, y1)
+    xs_from, ys_from, xs_to, ys_to = [], [], [], []
+    for figure in figures:
+        xs = [point.x for point in figure]
+        ys = [point.y for point in figure]
+        xs_from += xs
+        ys_from += ys
+        xs_to += xs[1:] + xs[:1]
+        ys_to += ys[1:] + ys[:1]
+    xs_from, ys_from = np.array(xs_from, dtype=np.float64), np.array(ys_from, dtype=np.float64)
+    xs_to, ys_to = np.array(xs_to, dtype=np.float64), np.array(ys_to, dtype=np.float64)
+    up = ys_from > ys_to
+    return np.where(up, xs_to, xs_from), np.where(up, ys_to, ys_from), \
+        np.where(up, xs_from, xs_to), np.where(up, ys_from, ys_to)
+
+
+def get_crossings(figures: List[List[Point]], rows: int, y_max: float,
+                  row_from: int = 0, row_to: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    # пересечения ребер со строками [row_from, row_to) - те же, что у активных ребер в iter_scan_lines
+    row_to = rows if row_to is None else row_to
+    x0, y0, x1, y1 = get_edge_arrays(figures)
+    y_p = y1 - y0
+    not_flat = y_p != 0
+    x_step = -(x1 - x0) / np.where(not_flat, y_p, 1)
+    first = np.ceil(y_max - y1)
+    y = y_max - first
+    lengths = np.minimum(np.ceil(y - y0), row_to - first)
+    valid = not_flat & (first < row_to) & (y > y0) & (first + lengths > row_from)
+
+    first, x_step = first[valid].astype(np.intp), x_step[valid]
+    x = x1[valid] + x_step * (y1[valid] - y[valid])
+    ends = first + lengths[valid].astype(np.intp)
+    # ребро, начатое выше полосы, начинается сразу с ее первой строки, цикл ниже идет только по строкам полосы;
+    # x на первой строке - те же сложения шага, что и при проходе по всем строкам (умножение округляется
+    # иначе, и заливка зависела бы от числа полос), но накопленной суммой в numpy по всем таким ребрам сразу
+    skip = np.maximum(row_from - first, 0)
+    started = np.flatnonzero(skip)
+    if len(started):
+        steps = np.zeros((len(started), skip[started].max() + 1))
+        steps[:, 0] = x[started]
+        steps[:, 1:] = x_step[started, None]
+        steps[:, 1:][np.arange(1, steps.shape[1]) > skip[started, None]] = 0  # + 0 не меняет x
+        x[started] = np.add.accumulate(steps, axis=1)[:, -1]
+    first += skip
+    lengths = ends - first
+
+    # ребра по убыванию числа строк: на шаге m живые ребра - префикс массива
+    order = np.argsort(-lengths, kind='stable')
+    first, x_step, x, lengths = first[order], x_step[order], x[order], lengths[order]
+    alive = np.searchsorted(-lengths, -np.arange(1, lengths[0] + 1 if len(lengths) else 1), side='right')
+    crossing_rows, crossing_xs = [], []
+    for m, count in enumerate(alive):
+        if m > 0:
+            # x накапливается прибавлением шага, как edge.x += edge.dx
+            x[:count] += x_step[:count]
+        crossing_rows.append(first[:count] + m)
+        crossing_xs.append(x[:count].copy())
+    if not crossing_rows:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    return np.concatenate(crossing_rows), np.concatenate(crossing_xs)
+
+
+def fill_rows(mask: np.ndarray, x0: int, figures: List[List[Point]], y_max: float, row_from: int, row_to: int) -> None:
+    # правило чет-нечет для строк маски [row_from, row_to) сразу: пересечения сортируются
+    # по (строка, x), соседние по номеру в строке образуют отрезок заливки
+    rows, width = row_to - row_from, mask.shape[1]
+    crossing_rows, crossing_xs = get_crossings(figures, mask.shape[0], y_max, row_from, row_to)
+    if len(crossing_rows) == 0:
+        mask[row_from:row_to] = False
+        return
+    crossing_rows = crossing_rows - row_from
+
+    # сортировка по (строка, x) как lexsort, но в два прохода: по x, затем устойчивая по
+    # строке - для 16-битных номеров строк numpy использует поразрядную сортировку
+    order = np.argsort(crossing_xs)
+    row_keys = crossing_rows[order].astype(np.uint16 if rows <= 1 << 16 else np.uint32)
+    order = order[np.argsort(row_keys, kind='stable')]
+    crossing_rows, crossing_xs = crossing_rows[order], crossing_xs[order]
+    counts = np.bincount(crossing_rows, minlength=rows)
+    starts = np.cumsum(counts) - counts
+    index = np.arange(len(crossing_rows))
+    rank = index - starts[crossing_rows]
+    row_count = counts[crossing_rows]
+
+    # пары (0, 1), (2, 3), ...; при нечетном количестве последнее пересечение
+    # образует отрезок с предыдущим (или само с собой, если оно единственное)
+    pair = (rank % 2 == 0) & (rank + 1 < row_count)
+    odd_last = (rank == row_count - 1) & (row_count % 2 == 1)
+    lefts = np.concatenate([index[pair], np.where(rank[odd_last] > 0, index[odd_last] - 1, index[odd_last])])
+    rights = np.concatenate([index[pair] + 1, index[odd_last]])
+
+    span_rows = crossing_rows[lefts]
+    left_columns = np.clip(np.rint(crossing_xs[lefts]) - x0, 0, width).astype(np.intp)
+    right_columns = np.clip(np.rint(crossing_xs[rights]) - x0 + 1, 0, width).astype(np.intp)
+
+    # четность: +1 на начале отрезка, -1 после конца, накопленная сумма > 0 - закрашено
+    size = rows * (width + 1)
+    marks = np.bincount(span_rows * (width + 1) + left_columns, minlength=size) - \
+        np.bincount(span_rows * (width + 1) + right_columns, minlength=size)
+    mask[row_from:row_to] = np.cumsum(marks.reshape(rows, width + 1), axis=1)[:, :-1] > 0
+
+
+def fill_figures_np(figures: List[List[Point]]) -> SpanImage:
+    span_image = SpanImage(figures)
+    _, y_max = get_y_extremum(figures)
+    fill_rows(span_image.mask, span_image.x0, figures, y_max, 0, span_image.mask.shape[0])
+    return span_image
+
+
+def rasterize_figures_np(job, figures: List[List[Point]]) -> SpanImage:
+    job.report(0)
+    return fill_figures_np(figures)
@@ -1,7 +1,10 @@
-from typing import Union, List
+from typing import Union
+
+import numpy as np
 
 from class_point import Point
-from point_funcs import add_symmetr_points
+from point_buffer import PointBuffer
+from point_funcs import add_symmetr_arc
 
 
 def sign(n: Union[int, float]) -> int:
@@ -12,13 +15,15 @@ def sign(n: Union[int, float]) -> int:
     return 1
 
 
-def brezenhem_circle(p: Point, radius: float) -> List[Point]:
-    points = []
+def brezenhem_circle(p: Point, radius: float) -> PointBuffer:
+    xs = []
+    ys = []
     x = 0
     y = radius
     d = 2 * (1 - radius)
     while x <= y:
-        points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y), True))
+        xs.append(x)
+        ys.append(y)
         d1 = 2 * d + 2 * y - 1
         if d1 < 0:
             x += 1
@@ -27,18 +32,22 @@ def brezenhem_circle(p: Point, radius: float) -> List[Point]:
             x += 1
             y -= 1
             d = d + 2 * (x - y + 1)
+    points = PointBuffer(8 * len(xs), dtype=np.int32)
+    add_symmetr_arc(points, p, xs, ys, True)
     return points
 
 
-def brezenhem_ellipse(p: Point, width: float, height: float) -> List[Point]:
+def brezenhem_ellipse(p: Point, width: float, height: float) -> PointBuffer:
     x = 0
     y = height
-    points = []
+    xs = []
+    ys = []
 
     d = height * height - width * width * (2 * height - 1)
     y_k = 0
     while y >= y_k:
-        points.extend(add_symmetr_points(p, Point(x + p.x, y + p.y)))
+        xs.append(x)
+        ys.append(y)
         if d <= 0:
             d1 = 2 * d + width * width * (2 * y + 2)
             if d1 < 0:
@@ -58,14 +67,16 @@ def brezenhem_ellipse(p: Point, width: float, height: float) -> List[Point]:
                     (2 * x + 1) + width * width * (1 - 2 * y)
             else:
                 d += width * width * (1 - 2 * y)
+    points = PointBuffer(4 * len(xs), dtype=np.int32)
+    add_symmetr_arc(points, p, xs, ys)
     return points
 
 
-def brezenhem_line(p1: Point, p2: Point) -> List[Point]:
-    points = []
+def brezenhem_line(p1: Point, p2: Point) -> PointBuffer:
+    points = PointBuffer(dtype=np.int32)
 
     if abs(p1.x - p2.x) <= 1e-13 and abs(p1.y - p2.y) <= 1e-13:
-        points.append(Point(p1.x, p1.y))
+        points.append(p1.x, p1.y)
         return points
 
     dx = p2.x - p1.x
@@ -86,7 +97,7 @@ def brezenhem_line(p1: Point, p2: Point) -> List[Point]:
     x = p1.x
     y = p1.y
     for i in range(int(dx + 1)):
-        points.append(Point(x, y))
+        points.append(x, y)
 
         if f >= 0:
             if swap:
@@ -101,3 +112,54 @@ def brezenhem_line(p1: Point, p2: Point) -> List[Point]:
                 x += sx
             f += 2 * dy
     return points
+
+
+def line_points(p1: Point, p2: Point) -> PointBuffer:
+    # то же, что brezenhem_line, но без цикла по пикселям: для целых концов число шагов по
+    # второй координате к шагу i основной равно (2 * dy * i + dx) // (2 * dx)
+    if not all(float(c).is_integer() for c in (p1.x, p1.y, p2.x, p2.y)) or (p1.x == p2.x and p1.y == p2.y):
+        return brezenhem_line(p1, p2)
+    dx = int(p2.x - p1.x)
+    dy = int(p2.y - p1.y)
+    sx = sign(dx)
+    sy = sign(dy)
+    dx = abs(dx)
+    dy = abs(dy)
+    swap = dy > dx
+    if swap:
+        dx, dy = dy, dx
+    steps = np.arange(dx + 1, dtype=np.int64)
+    shifts = (2 * dy * steps + dx) // (2 * dx)
+    if swap:
+        xs, ys = p1.x + sx * shifts, p1.y + sy * steps
+    else:
+        xs, ys = p1.x + sx * steps, p1.y + sy * shifts
+    return PointBuffer.from_arrays(xs, ys, dtype=np.int32)
+
+
+# варианты алгоритмов, сразу пишущие в пиксели изображения ([y, x], см. paint_funcs.image_pixels):
+# все точки фигуры записываются одним присваиванием, точки за границами изображения отбрасываются;
+# возвращают точки фигуры - по ним стираются отрезки и считается область перерисовки
+def write_points(pixels: np.ndarray, points: PointBuffer, color: int) -> None:
+    height, width = pixels.shape
+    xs, ys = points.xs.astype(np.intp), points.ys.astype(np.intp)
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    pixels[ys[inside], xs[inside]] = color
+
+
+def write_line(pixels: np.ndarray, p1: Point, p2: Point, color: int) -> PointBuffer:
+    points = line_points(p1, p2)
+    write_points(pixels, points, color)
+    return points
+
+
+def write_circle(pixels: np.ndarray, p: Point, radius: float, color: int) -> PointBuffer:
+    points = brezenhem_circle(p, radius)
+    write_points(pixels, points, color)
+    return points
+
+
+def write_ellipse(pixels: np.ndarray, p: Point, width: float, height: float, color: int) -> PointBuffer:
+    points = brezenhem_ellipse(p, width, height)
+    write_points(pixels, points, color)
+    return points
@@ -1,25 +1,31 @@
 import sys
+from math import floor
 from time import time
 
 from typing import List, Tuple
 
 from PyQt5 import QtWidgets
 from PyQt5 import uic
-from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRect
 from PyQt5.QtWidgets import QColorDialog, QButtonGroup, QGraphicsSceneMouseEvent
-from PyQt5.QtGui import QColor, QImage, QColorConstants, QPixmap
+from PyQt5.QtGui import QColor, QImage, QColorConstants, QCloseEvent
 
 from dialogs import show_author, show_task, show_instruction, show_err_win, show_war_win
 from class_point import Point
 from input_checks import params_to_int
-from paint_funcs import paint_alg
+from paint_funcs import paint_alg, fill_image, fill_image_by_regions, image_pixels, apply_fill
 from point_funcs import del_lines_by_point
-from brezenhem_algs import brezenhem_circle, brezenhem_ellipse, brezenhem_line
+from brezenhem_algs import write_circle, write_ellipse, write_line, write_points
+from point_buffer import PointBuffer
+from workers import Job, JobControls
+from fill_player import ImageItem
+from region_labels import RegionLabels
+from input_coalescer import InputCoalescer
 
 point_list: List[Point] = []
 figures: List[List[Point]] = []
-edges: List[List[List[Point]]] = []
-limit_figures: List[List[Point]] = []
+edges: List[List[PointBuffer]] = []
+limit_figures: List[PointBuffer] = []
 
 prev_figure_points: int = 0
 current_figure_points: int = 0
@@ -33,6 +39,18 @@ seed_point: Point = None
 is_pressed: bool = False
 
 
+def points_rect(points: PointBuffer) -> QRect:
+    # прямоугольник пикселей, которые затронул растеризатор
+    if len(points) == 0:
+        return QRect()
+    left, top = floor(points.xs.min()), floor(points.ys.min())
+    return QRect(left, top, floor(points.xs.max()) - left + 1, floor(points.ys.max()) - top + 1)
+
+
+def seed_mark_rect(point: Point) -> QRect:
+    return QRect(int(point.x) - 2, int(point.y) - 2, 5, 5)
+
+
 def delete_point_from_figures(del_point_id: int) -> None:
     k = del_point_id + 1
     for _ in range(len(figures)):
@@ -84,11 +102,15 @@ class Ui(QtWidgets.QMainWindow):
     def __init__(self):
         super(Ui, self).__init__()
         uic.loadUi("./template.ui", self)  # временно в корне
+        self.jobs = JobControls(self)
+        self.region_labels = None  # разметка областей от прошлой заливки по областям
 
         self.scene = MyScene(self, 0, 0, 630.0, 900.0)
         self.graphicsView.setScene(self.scene)
         self.image = QImage(630, 900, QImage.Format_RGB32)
         self.image.fill(QColorConstants.White)
+        self.image_item = ImageItem(self.image)
+        self.scene.addItem(self.image_item)
 
         # menu bar
         self.about_author.triggered.connect(show_author)
@@ -119,9 +141,14 @@ class Ui(QtWidgets.QMainWindow):
         self.stackedWidget.setCurrentWidget(self.page)
 
         self.graphicsView.setMouseTracking(True)
+        self.input = InputCoalescer(self.show_coords, parent=self)
         self.redraw()
         self.show()
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.jobs.stop()
+        super().closeEvent(event)
+
     def clear_scene(self):
         global prev_figure_points, current_figure_points
         self.image.fill(QColorConstants.White)
@@ -153,9 +180,15 @@ class Ui(QtWidgets.QMainWindow):
         p_x, p_y = scene_pos.x(), scene_pos.y()
         self.draw_point(Point(int(p_x), int(p_y)))
 
-    def redraw(self):
-        self.scene.clear()
-        self.scene.addPixmap(QPixmap.fromImage(self.image))
+    def redraw(self, rect: QRect = None):
+        # изображение рисуется напрямую, без перевода в QPixmap; после рисования на сцене
+        # перерисовывается только измененный прямоугольник rect (None - все изображение)
+        if self.image_item.image is not self.image:
+            self.image_item.set_image(self.image)
+        elif rect is None:
+            self.image_item.update()
+        else:
+            self.image_item.update_rect(rect)
 
     def draw_point(self, point: Point) -> None:
         global current_figure_points
@@ -172,15 +205,13 @@ class Ui(QtWidgets.QMainWindow):
             if len(point_list) > 1:
                 self.draw_line(point_list[-2], point_list[-1])
             current_figure_points += 1
-            self.redraw()
+            self.redraw(QRect(point.x, point.y, 1, 1))
 
     def draw_line(self, p1: Point, p2: Point) -> None:
-        line = brezenhem_line(p1, p2)
-        for point in line:
-            self.image.setPixel(point.x, point.y, current_edge_color.rgb())
+        line = write_line(image_pixels(self.image), p1, p2, current_edge_color.rgb())
         edges[-1].append(line)
         edges[-2].append(line)
-        self.redraw()
+        self.redraw(points_rect(line))
 
     def remove_point(self):
         point = self.get_point_coords()
@@ -190,11 +221,12 @@ class Ui(QtWidgets.QMainWindow):
         for i in range(len(point_list)):
             if point_list[i] == point:
                 del_lines_by_point(edges, i)
+                erased = QRect(point.x, point.y, 1, 1)
                 if edges[i]:
+                    pixels = image_pixels(self.image)
                     for line in edges[i]:
-                        for pixel in line:
-                            self.image.setPixel(int(pixel.x), int(
-                                pixel.y), QColor(Qt.white).rgb())
+                        write_points(pixels, line, QColor(Qt.white).rgb())
+                        erased |= points_rect(line)
                 edges.pop(i)
                 if i == len(point_list) - 1 and len(point_list) > 2:
                     self.draw_line(point_list[i - 1], point_list[0])
@@ -202,7 +234,7 @@ class Ui(QtWidgets.QMainWindow):
                     self.draw_line(point_list[i - 1], point_list[i + 1])
                 point_list.pop(i)
                 self.update_scroll_list()
-                self.redraw()
+                self.redraw(erased)
                 break
         else:
             show_err_win("Введенной точки не существует.")
@@ -245,11 +277,12 @@ class Ui(QtWidgets.QMainWindow):
             return
         delete_point_from_figures(del_point_id)
         delete_point_from_edges(del_point_id)
+        erased = QRect()
         if edges[del_point_id]:
+            pixels = image_pixels(self.image)
             for line in edges[del_point_id]:
-                for pixel in line:
-                    self.image.setPixel(int(pixel.x), int(
-                        pixel.y), QColor(Qt.white).rgb())
+                write_points(pixels, line, QColor(Qt.white).rgb())
+                erased |= points_rect(line)
         edges.pop(del_point_id)
         if del_point_id == len(point_list) - 1 and len(point_list) > 2:
             self.draw_line(point_list[del_point_id - 1], point_list[0])
@@ -258,6 +291,7 @@ class Ui(QtWidgets.QMainWindow):
                            point_list[del_point_id + 1])
         point_list.pop(del_point_id)
         self.update_scroll_list()
+        self.redraw(erased)
 
     def paint_figures(self, func_testing=False):
         delay = False
@@ -269,16 +303,43 @@ class Ui(QtWidgets.QMainWindow):
         if seed_point is None:
             show_err_win("Ошибка. Не задана затравочная точка.")
             return
+        if delay:
+            # заливка считается сразу, закрашенные отрезки показываются по таймеру
+            player = paint_alg(current_edge_color, current_paint_color,
+                               seed_point, self, self.delay_steps_sb.value(), self.region_fill_cb.isChecked())
+            self.jobs.start(player, self.paint_figure_button, self.clear_button)
+            if func_testing:
+                self.jobs.wait()
+            return
+        # заливка копии изображения в отдельном потоке, готовая картинка подменяется в потоке GUI
+        snapshot = self.image.copy()
+        args = (snapshot.copy(), QColor(current_edge_color), QColor(current_paint_color),
+                Point(seed_point.x, seed_point.y))
         start = time()
-        paint_alg(current_edge_color, current_paint_color,
-                  seed_point, self, delay=delay)
+        if self.region_fill_cb.isChecked():
+            job = Job(fill_image_by_regions, *args, self.region_labels, parent=self)
+            job.result_ready.connect(lambda result: self.show_region_fill(snapshot, *result, start, func_testing))
+        else:
+            job = Job(fill_image, *args, parent=self)
+            job.result_ready.connect(lambda image: self.show_filled_image(snapshot, image, start, func_testing))
+        self.jobs.start(job, self.paint_figure_button, self.clear_button)
+        if func_testing:
+            self.jobs.wait()
+
+    def show_region_fill(self, snapshot: QImage, image: QImage, labels: RegionLabels, start: float,
+                         func_testing=False) -> None:
+        self.region_labels = labels
+        self.show_filled_image(snapshot, image, start, func_testing)
+
+    def show_filled_image(self, snapshot: QImage, image: QImage, start: float, func_testing=False) -> None:
+        # залитая копия не подменяет изображение: нарисованное во время заливки сохраняется
+        self.redraw(apply_fill(self.image, snapshot, image))
         end = time()
-        if not delay:
-            if func_testing:
-                with open('report-functesting-latest.txt', 'a+') as f:
-                    f.write(f"Время выполнения алгоритма в тесте {test_i}: {(end - start) * 1000:.2f} мс.\n")
-            else:
-                show_war_win(f"Время выполнения алгоритма: {(end - start) * 1000:.2f} мс.")
+        if func_testing:
+            with open('report-functesting-latest.txt', 'a+') as f:
+                f.write(f"Время выполнения алгоритма в тесте {test_i}: {(end - start) * 1000:.2f} мс.\n")
+        else:
+            show_war_win(f"Время выполнения алгоритма: {(end - start) * 1000:.2f} мс.")
 
     def add_zt(self, point: Point = None) -> None:
         global seed_point
@@ -287,7 +348,9 @@ class Ui(QtWidgets.QMainWindow):
         else:
             new_point = point
         if new_point is not None:
+            dirty = QRect()
             if seed_point is not None:
+                dirty = seed_mark_rect(seed_point)
                 for i in range(3):
                     self.image.setPixel(
                         int(seed_point.x + i), int(seed_point.y - i), QColor(Qt.white).rgb())
@@ -309,7 +372,7 @@ class Ui(QtWidgets.QMainWindow):
                     int(seed_point.x - i), int(seed_point.y - i), QColor(Qt.magenta).rgb())
             self.current_seed_label.setText(
                 f"x,y затравки: {seed_point.x}, {seed_point.y}")
-            self.redraw()
+            self.redraw(dirty | seed_mark_rect(seed_point))
 
     def add_figure(self, args):
         if self.set_circle_figure.isChecked():
@@ -323,12 +386,9 @@ class Ui(QtWidgets.QMainWindow):
             if coords is None:
                 return
         center, width, height = coords
-        points = brezenhem_ellipse(center, width, height)
+        points = write_ellipse(image_pixels(self.image), center, width, height, current_edge_color.rgb())
         limit_figures.append(points)
-        for point in points:
-            self.image.setPixel(int(point.x), int(
-                point.y), current_edge_color.rgb())
-        self.redraw()
+        self.redraw(points_rect(points))
 
     def get_ellipse_params(self) -> Tuple[Point, int, int]:
         xc_str = self.set_xc_ellipse.text()
@@ -363,18 +423,17 @@ class Ui(QtWidgets.QMainWindow):
             if coords is None:
                 return
         center, radius = coords
-        points = brezenhem_circle(center, radius)
+        points = write_circle(image_pixels(self.image), center, radius, current_edge_color.rgb())
         limit_figures.append(points)
-        for point in points:
-            self.image.setPixel(int(point.x), int(point.y),
-                                QColor(current_edge_color).rgb())
-        self.redraw()
+        self.redraw(points_rect(points))
 
     def add_zt_point_by_click(self, event: QGraphicsSceneMouseEvent) -> None:
         global seed_point
         scene_pos = event.scenePos()
         p_x, p_y = scene_pos.x(), scene_pos.y()
+        dirty = QRect()
         if seed_point is not None:
+            dirty = seed_mark_rect(seed_point)
             for i in range(3):
                 self.image.setPixel(
                     int(seed_point.x + i), int(seed_point.y - i), QColor(Qt.white).rgb())
@@ -396,7 +455,11 @@ class Ui(QtWidgets.QMainWindow):
                                 int(seed_point.y + i), QColor(Qt.magenta).rgb())
             self.image.setPixel(int(seed_point.x - i),
                                 int(seed_point.y - i), QColor(Qt.magenta).rgb())
-        self.redraw()
+        self.redraw(dirty | seed_mark_rect(seed_point))
+
+    def show_coords(self, scene_pos: QPointF) -> None:
+        self.current_coords_label.setText(
+            f'x :{scene_pos.x():.2f}, y :{scene_pos.y():.2f}')
 
 
 class MyScene(QtWidgets.QGraphicsScene):
@@ -408,9 +471,7 @@ class MyScene(QtWidgets.QGraphicsScene):
         self.last_y = None
 
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent) -> None:
-        scene_pos = event.scenePos()
-        window.current_coords_label.setText(
-            f'x :{scene_pos.x():.2f}, y :{scene_pos.y():.2f}')
+        self.window.input.move(event.scenePos())
 
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         global last_pos, is_pressed
@@ -443,6 +504,8 @@ if __name__ == '__main__':
                 Point(int(sys.argv[2 * _ + 5]), int(sys.argv[2 * _ + 6])))
         if sys.argv[2 * num_points + 5] == 'true':
             window.set_delay_cb.setChecked(True)
+        elif sys.argv[2 * num_points + 5] == 'regions':
+            window.region_fill_cb.setChecked(True)
         window.close_figure()
         if len(sys.argv) > 2 * num_points + 6:
             limit_figure_type = sys.argv[2 * num_points + 6]
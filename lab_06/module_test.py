@@ -1,9 +1,19 @@
+import gc
+import weakref
 from typing import Tuple
 
+import numpy as np
 import pytest
 from class_point import Point
 from point_funcs import add_symmetr_points
-from brezenhem_algs import brezenhem_ellipse, sign, brezenhem_line
+from brezenhem_algs import brezenhem_ellipse, sign, brezenhem_line, brezenhem_circle, line_points, write_line, \
+    write_circle, write_ellipse
+from paint_funcs import seed_fill, region_fill, image_pixels
+from fill_player import FillRecording, FillPlayer
+from span_scan import run_length, run_ends
+from input_coalescer import InputCoalescer
+from PyQt5.QtCore import QPoint
+from PyQt5.QtGui import QColor, QImage
 
 
 @pytest.fixture
@@ -64,3 +74,125 @@ def test_draw_line():
     for i in range(len(ans)):
         assert res[i].x == ans[i][0]
         assert res[i].y == ans[i][1]
+
+
+def test_line_points():
+    for x2, y2 in [(7, 3), (-7, 3), (3, -7), (-3, -7), (6, 6), (0, -5), (4, 0), (5, 2), (2, 5)]:
+        p1, p2 = segment(1, 2, x2, y2)
+        assert line_points(p1, p2) == brezenhem_line(p1, p2)
+
+
+def test_raster_writers():
+    # запись прямо в пиксели совпадает с setPixel по точкам фигуры, точки вне изображения отбрасываются
+    image = QImage(30, 20, QImage.Format_RGB32)
+    image.fill(QColor(255, 255, 255))
+    expected = image.copy()
+    color = QColor(255, 0, 0).rgb()
+    pixels = image_pixels(image)
+    p1, p2 = segment(-5, 3, 40, 17)
+    figures = [(write_line(pixels, p1, p2, color), brezenhem_line(p1, p2)),
+               (write_circle(pixels, Point(25, 5), 8, color), brezenhem_circle(Point(25, 5), 8)),
+               (write_ellipse(pixels, Point(3, 15), 9, 4, color), brezenhem_ellipse(Point(3, 15), 9, 4))]
+    for written, points in figures:
+        assert written == points
+        for point in points:
+            if 0 <= point.x < 30 and 0 <= point.y < 20:
+                expected.setPixel(point.x, point.y, color)
+    assert image == expected
+
+
+def test_seed_fill():
+    image = QImage(20, 20, QImage.Format_RGB32)
+    image.fill(QColor(255, 255, 255))
+    edge, fill = QColor(255, 0, 0), QColor(0, 0, 255)
+    for i in range(2, 12):
+        for x, y in [(i, 2), (i, 11), (2, i), (11, i)]:
+            image.setPixel(x, y, edge.rgb())
+    steps = []
+    seed_fill(image, edge, fill, Point(5, 5), steps.append)
+    filled = [(x, y) for x in range(20) for y in range(20) if image.pixel(x, y) == fill.rgb()]
+    assert len(filled) == 64 and min(filled) == (3, 3) and max(filled) == (10, 10)
+    assert steps == list(range(1, len(steps) + 1))
+
+
+def test_seed_fill_image_border():
+    # незамкнутая область доходит до краев изображения, заливка останавливается на них
+    image = QImage(20, 20, QImage.Format_RGB32)
+    image.fill(QColor(255, 255, 255))
+    fill = QColor(0, 0, 255)
+    seed_fill(image, QColor(255, 0, 0), fill, Point(5, 5))
+    filled = [(x, y) for x in range(20) for y in range(20) if image.pixel(x, y) == fill.rgb()]
+    assert len(filled) == 19 * 20 and min(filled) == (1, 0)
+
+
+def test_fill_playback():
+    image = QImage(20, 20, QImage.Format_RGB32)
+    image.fill(QColor(255, 255, 255))
+    edge, fill = QColor(255, 0, 0), QColor(0, 0, 255)
+    for i in range(2, 12):
+        for x, y in [(i, 2), (i, 11), (2, i), (11, i), (7, i)]:
+            image.setPixel(x, y, edge.rgb())
+    played = image.copy()
+    recording = FillRecording()
+    seed_fill(image, edge, fill, Point(5, 5), on_run=lambda row, left, right: recording.add_step([(row, left, right)]))
+    player = FillPlayer(recording, played, fill, lambda rect: None, steps_per_frame=3)
+    while player.step < len(recording):
+        player.show_next()
+    assert played == image and len(recording) == 8
+
+
+def test_span_scan():
+    free = np.array([1, 1, 0, 0, 1, 0, 1, 1, 1], dtype=bool)
+    assert run_length(free) == 2 and run_length(free[2:]) == 0 and run_length(free[6:]) == 3
+    assert run_length(free[:0]) == 0
+    assert list(run_ends(free)) == [1, 4, 8]
+
+
+def test_region_fill():
+    image = QImage(20, 20, QImage.Format_RGB32)
+    image.fill(QColor(255, 255, 255))
+    edge, fill = QColor(255, 0, 0), QColor(0, 0, 255)
+    for i in range(2, 12):
+        for x, y in [(i, 2), (i, 11), (2, i), (11, i), (7, i)]:
+            image.setPixel(x, y, edge.rgb())
+    expected = image.copy()
+    image, first_labels = region_fill(image, edge, fill, Point(5, 5))
+    seed_fill(expected, edge, fill, Point(5, 5))
+    labels = first_labels
+    for seed in (Point(9, 9), Point(15, 15), Point(7, 7)):
+        seed_fill(expected, edge, fill, seed)
+        image, labels = region_fill(image, edge, fill, seed, labels)
+        assert image == expected
+    # картинка менялась только заливками по разметке, поэтому разметка не пересчитывалась
+    assert labels is first_labels
+
+
+def test_input_coalescer():
+    # за кадр от движений остается последняя позиция, шаги колесика складываются
+    # и применяются раньше движения; первое событие кадра применяется сразу
+    calls = []
+    coalescer = InputCoalescer(lambda pos: calls.append(('move', pos)), lambda steps: calls.append(('wheel', steps)))
+    coalescer.move(QPoint(1, 1))
+    for i in range(2, 5):
+        coalescer.move(QPoint(i, i))
+    for steps in (1, 2, -1):
+        coalescer.wheel(steps)
+    assert calls == [('move', QPoint(1, 1))]
+    coalescer.flush()
+    assert calls == [('move', QPoint(1, 1)), ('wheel', 2), ('move', QPoint(4, 4))]
+    coalescer.next_frame()
+    assert len(calls) == 3
+
+
+def test_image_pixels_keep_image():
+    image = QImage(40, 30, QImage.Format_RGB32)
+    image.fill(QColor(10, 20, 30))
+    image_ref = weakref.ref(image)
+    pixels = image_pixels(image)[5:, 3:]
+    del image
+    gc.collect()
+    assert image_ref() is not None
+    assert (pixels == QColor(10, 20, 30).rgb()).all() and pixels.shape == (25, 37)
+    del pixels
+    gc.collect()
+    assert image_ref() is None
@@ -1,68 +1,139 @@
-import time
+from typing import Callable, Tuple
 
-from PyQt5.QtCore import QEventLoop
-from PyQt5.QtGui import QColor, QPixmap
-from PyQt5.QtWidgets import QApplication, QMainWindow
+import numpy as np
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QMainWindow
 
 from class_point import Point
+from fill_player import FillRecording, FillPlayer
+from span_scan import free_pixels, run_length, run_ends
+from region_labels import RegionLabels
 
 
-def paint_alg(edge_color: QColor, fill_color: QColor, seed_point: Point, win: QMainWindow, delay=False):
-    stack = [seed_point]
+class ImageBuffer:
+    # буфер изображения для numpy: массив держит этот объект (base), а он - изображение,
+    # поэтому память не освобождается, пока жив массив или его срезы
+    def __init__(self, image: QImage):
+        self.image = image
+        bits = image.bits()
+        self.__array_interface__ = {'shape': (image.height(), image.bytesPerLine() // 4), 'typestr': '<u4',
+                                    'data': (int(bits), False), 'version': 3}
+
+
+def image_pixels(image: QImage) -> np.ndarray:
+    # пиксели 32-битного изображения без копирования: значения 0xAARRGGBB, [y, x]
+    rows = np.asarray(ImageBuffer(image))
+    return rows[:, :image.width()]
+
+
+def apply_fill(image: QImage, before: QImage, after: QImage) -> QRect:
+    # заливка считалась по снимку before: в image переносятся только пиксели, которые она изменила,
+    # нарисованное в image за время заливки остается; результат - прямоугольник изменений
+    old, new = image_pixels(before), image_pixels(after)
+    changed = old != new
+    rows, cols = np.nonzero(changed)
+    if len(rows) == 0:
+        return QRect()
+    image_pixels(image)[changed] = new[changed]
+    left, top = int(cols.min()), int(rows.min())
+    return QRect(left, top, int(cols.max()) - left + 1, int(rows.max()) - top + 1)
+
+
+def seed_fill(image: QImage, edge_color: QColor, fill_color: QColor, seed_point: Point,
+              on_step: Callable[[int], None] = None,
+              on_run: Callable[[int, int, int], None] = None) -> QImage:
+    # заливка работает только с изображением, поэтому ее можно запускать вне потока GUI;
+    # on_step вызывается после каждого пикселя из стека (номер шага),
+    # on_run - с закрашенным на этом шаге отрезком (строка, левый x, правый x не включая)
+    if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32):
+        image = image.convertToFormat(QImage.Format_RGB32)
+    width, height = image.width(), image.height()
+    # пиксели читаются и пишутся прямо в буфере изображения, цвета - готовые числа
+    pixels = image_pixels(image)
+    fill, edge = fill_color.rgb(), edge_color.rgb()
+    stack = [(int(seed_point.x), int(seed_point.y))]
+    if not (0 <= stack[0][0] < width and 0 <= stack[0][1] < height):
+        return image
+    steps = 0
     while stack:
         # Извлечь затравочный пиксель из стека
-        seed_pixel = stack.pop()
-
-        win.image.setPixel(int(seed_pixel.x), int(
-            seed_pixel.y), fill_color.rgb())
-
-        x = seed_pixel.x + 1
-        y = seed_pixel.y
-
-        pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-        while pixel_color != fill_color.rgb() and pixel_color != edge_color.rgb():
-            win.image.setPixel(int(x), int(y), fill_color.rgb())
-            x += 1
-            pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-
-        xr = x - 1
-        x = seed_pixel.x - 1
-        pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-
-        while pixel_color != fill_color.rgb() and pixel_color != edge_color.rgb() and x > 0:
-            win.image.setPixel(int(x), int(y), fill_color.rgb())
-            x -= 1
-            pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-
-        xl = x + 1
-        sign = [1, -1]
-        for i in sign:
-            x = xl
-            y = seed_pixel.y + i
-            while x <= xr:
-                flag = False
-                pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-                while pixel_color != fill_color.rgb() and pixel_color != edge_color.rgb() and x <= xr:
-                    flag = True
-                    x += 1
-                    pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-
-                if flag:
-                    if x == xr and pixel_color != fill_color.rgb() and pixel_color != edge_color.rgb():
-                        stack.append(Point(x, y))
-                    else:
-                        stack.append(Point(x - 1, y))
-                x_in = x
-                pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-                while x < xr and (pixel_color == fill_color.rgb() or pixel_color == edge_color.rgb()):
-                    x += 1
-                    pixel_color = win.image.pixelColor(int(x), int(y)).rgb()
-                if x == x_in:
-                    x += 1
-        if delay:
-            win.scene.clear()
-            win.scene.addPixmap(QPixmap.fromImage(win.image))
-            QApplication.processEvents(QEventLoop.AllEvents, 1)
-            time.sleep(0.01)
-    win.scene.clear()
-    win.scene.addPixmap(QPixmap.fromImage(win.image))
+        x_seed, y = stack.pop()
+
+        # отрезок строки вправо и влево от затравки до границы или уже закрашенного пикселя
+        # (левый край строки не закрашивается, как и раньше)
+        free = free_pixels(pixels[y], fill, edge)
+        xr = x_seed + run_length(free[x_seed + 1:])
+        xl = x_seed - run_length(free[x_seed - 1:0:-1] if x_seed > 0 else free[:0])
+        pixels[y, xl:xr + 1] = fill
+        if on_run is not None:
+            on_run(y, xl, xr + 1)
+
+        # в строках ниже и выше в стек идет крайний правый пиксель каждого незакрашенного участка
+        for y_near in (y + 1, y - 1):
+            if 0 <= y_near < height:
+                ends = run_ends(free_pixels(pixels[y_near, xl:xr + 1], fill, edge))
+                stack.extend((int(x), y_near) for x in ends + xl)
+        steps += 1
+        if on_step is not None:
+            on_step(steps)
+    return image
+
+
+def region_fill(image: QImage, edge_color: QColor, fill_color: QColor, seed_point: Point,
+                labels: RegionLabels = None,
+                on_run: Callable[[int, int, int], None] = None) -> Tuple[QImage, RegionLabels]:
+    # заливка по разметке связных областей: область затравки закрашивается целиком по своим отрезкам;
+    # разметка пересчитывается, только если картинка менялась не этими заливками
+    if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32):
+        image = image.convertToFormat(QImage.Format_RGB32)
+    pixels = image_pixels(image)
+    edge, fill = edge_color.rgb(), fill_color.rgb()
+    if labels is None or not labels.is_current(pixels, edge, fill):
+        labels = RegionLabels(pixels, edge, fill)
+    runs = labels.region(int(seed_point.x), int(seed_point.y))
+    if runs is None:
+        # затравка на границе или у левого края - как у обычной заливки
+        return seed_fill(image, edge_color, fill_color, seed_point, on_run=on_run), labels
+    labels.fill_region(pixels, runs, on_run)
+    return image, labels
+
+
+def fill_image(job, image: QImage, edge_color: QColor, fill_color: QColor, seed_point: Point) -> QImage:
+    # для Job: заливка копии изображения, число закрашенных пикселей заранее неизвестно
+    def report(steps: int) -> None:
+        if steps % 256 == 0:
+            job.report(steps)
+
+    return seed_fill(image, edge_color, fill_color, seed_point, report)
+
+
+def fill_image_by_regions(job, image: QImage, edge_color: QColor, fill_color: QColor, seed_point: Point,
+                          labels: RegionLabels = None) -> Tuple[QImage, RegionLabels]:
+    job.report(0)
+    return region_fill(image, edge_color, fill_color, seed_point, labels)
+
+
+def paint_alg(edge_color: QColor, fill_color: QColor, seed_point: Point, win: QMainWindow,
+              steps_per_frame=1, by_regions=False) -> FillPlayer:
+    # заливка копии считается сразу, закрашенные отрезки дорисовываются в win.image по таймеру
+    recording = FillRecording()
+    snapshot = win.image.copy()
+
+    def record(row: int, left: int, right: int) -> None:
+        recording.add_step([(row, left, right)])
+
+    if by_regions:
+        result, win.region_labels = region_fill(snapshot.copy(), edge_color, fill_color, seed_point,
+                                                win.region_labels, record)
+    else:
+        result = seed_fill(snapshot.copy(), edge_color, fill_color, seed_point, on_run=record)
+    player = FillPlayer(recording, win.image, QColor(fill_color.rgb()),
+                        lambda rect: win.image_item.update_rect(rect), steps_per_frame, parent=win)
+
+    def show_result() -> None:
+        # то, что нарисовано во время анимации, не затирается; при отмене дорисовывается остаток
+        win.redraw(apply_fill(win.image, snapshot, result))
+
+    player.finished.connect(show_result)
+    return player
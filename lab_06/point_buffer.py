@@ -0,0 +1,117 @@
+from typing import Iterable, Iterator, Tuple, Union
+
+import numpy as np
+
+from class_point import Point
+
+ShadedPoint = Tuple[Point, float]
+
+
+# точки растеризации по столбцам (x, y и интенсивность у сглаживающих алгоритмов)
+# вместо списка объектов Point; по индексу и при обходе выдает Point (или (Point, интенсивность))
+class PointBuffer:
+    def __init__(self, capacity: int = 64, shaded: bool = False, dtype: type = np.float64):
+        capacity = max(capacity, 1)
+        self.size = 0
+        self.shaded = shaded
+        self.x_data = np.empty(capacity, dtype=dtype)
+        self.y_data = np.empty(capacity, dtype=dtype)
+        self.intensity_data = np.empty(capacity if shaded else 0, dtype=np.float64)
+
+    @classmethod
+    def from_arrays(cls, xs, ys, intensities=None, dtype: type = np.float64) -> 'PointBuffer':
+        # без копирования, если массивы уже нужного типа
+        buffer = cls(1, intensities is not None, dtype)
+        buffer.x_data = np.asarray(xs, dtype=dtype)
+        buffer.y_data = np.asarray(ys, dtype=dtype)
+        if intensities is not None:
+            buffer.intensity_data = np.asarray(intensities, dtype=np.float64)
+        buffer.size = len(buffer.x_data)
+        return buffer
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self.x_data[:self.size]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self.y_data[:self.size]
+
+    @property
+    def intensities(self) -> Union[np.ndarray, None]:
+        return self.intensity_data[:self.size] if self.shaded else None
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= len(self.x_data):
+            return
+        # рост в два раза - добавление за амортизированное O(1)
+        capacity = max(capacity, 2 * len(self.x_data))
+        self.x_data = self.grow(self.x_data, capacity)
+        self.y_data = self.grow(self.y_data, capacity)
+        if self.shaded:
+            self.intensity_data = self.grow(self.intensity_data, capacity)
+
+    def grow(self, column: np.ndarray, capacity: int) -> np.ndarray:
+        new_column = np.empty(capacity, dtype=column.dtype)
+        new_column[:self.size] = column[:self.size]
+        return new_column
+
+    def append(self, x: float, y: float, intensity: float = None) -> None:
+        if self.size == len(self.x_data):
+            self.reserve(self.size + 1)
+        self.x_data[self.size] = x
+        self.y_data[self.size] = y
+        if self.shaded:
+            self.intensity_data[self.size] = intensity
+        self.size += 1
+
+    def add_arrays(self, xs, ys, intensities=None) -> None:
+        n = len(xs)
+        self.reserve(self.size + n)
+        self.x_data[self.size:self.size + n] = xs
+        self.y_data[self.size:self.size + n] = ys
+        if self.shaded:
+            self.intensity_data[self.size:self.size + n] = intensities
+        self.size += n
+
+    def extend(self, points: Union['PointBuffer', Iterable[Point], Iterable[ShadedPoint]]) -> None:
+        if isinstance(points, PointBuffer):
+            self.add_arrays(points.xs, points.ys, points.intensities)
+            return
+        for p in points:
+            if self.shaded:
+                self.append(p[0].x, p[0].y, p[1])
+            else:
+                self.append(p.x, p.y)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Point, ShadedPoint, 'PointBuffer']:
+        if isinstance(index, slice):
+            # срез - представление над теми же массивами; при добавлении в него
+            # данные копируются, так что исходный буфер не меняется
+            return PointBuffer.from_arrays(self.xs[index], self.ys[index],
+                                           self.intensities[index] if self.shaded else None, self.x_data.dtype)
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("PointBuffer index out of range")
+        p = Point(self.x_data[index].item(), self.y_data[index].item())
+        return (p, self.intensity_data[index].item()) if self.shaded else p
+
+    def __iter__(self) -> Iterator[Union[Point, ShadedPoint]]:
+        if self.shaded:
+            for x, y, intensity in zip(self.xs.tolist(), self.ys.tolist(), self.intensities.tolist()):
+                yield Point(x, y), intensity
+        else:
+            for x, y in zip(self.xs.tolist(), self.ys.tolist()):
+                yield Point(x, y)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (PointBuffer, list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PointBuffer({list(self)})"
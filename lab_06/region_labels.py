@@ -0,0 +1,72 @@
+from typing import Callable
+
+import numpy as np
+
+from span_scan import free_pixels
+
+
+class RegionLabels:
+    # связные (по четырем соседям) области незакрашенных пикселей: каждая строка разбита на
+    # свободные отрезки, отрезки соседних строк, перекрывающиеся по x, объединяются
+    # системой непересекающихся множеств; разметка годится для любой затравки той же картинки
+    def __init__(self, pixels: np.ndarray, edge: int, fill: int):
+        self.edge, self.fill = edge, fill
+        self.free = self.free_mask(pixels)
+        height, width = self.free.shape
+        self.span = width + 1
+
+        # отрезки всех строк по порядку: строка, начало, конец (не включая)
+        padded = np.zeros((height, width + 2), dtype=np.int8)
+        padded[:, 1:-1] = self.free
+        changes = np.diff(padded, axis=1)
+        self.rows, self.starts = np.nonzero(changes == 1)
+        self.ends = np.nonzero(changes == -1)[1]
+        self.start_keys = self.rows * self.span + self.starts
+        end_keys = self.rows * self.span + self.ends
+
+        # для отрезка строки y - отрезки строки y - 1, перекрывающиеся с ним: непрерывный диапазон [lo, hi)
+        above = (self.rows - 1) * self.span
+        lo = np.searchsorted(end_keys, above + self.starts, side='right')
+        hi = np.searchsorted(self.start_keys, above + self.ends, side='left')
+        counts = np.maximum(hi - lo, 0)
+        lower = np.repeat(np.arange(len(counts)), counts)
+        upper = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        parent = list(range(len(counts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a, b in zip(upper.tolist(), lower.tolist()):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        self.roots = np.array([find(i) for i in range(len(parent))], dtype=np.intp)
+
+    def free_mask(self, pixels: np.ndarray) -> np.ndarray:
+        free = free_pixels(pixels, self.fill, self.edge)
+        free[:, 0] = False  # левый край строки затравочная заливка тоже не закрашивает
+        return free
+
+    def is_current(self, pixels: np.ndarray, edge: int, fill: int) -> bool:
+        # картинка менялась только заливками по этой разметке
+        return (edge, fill) == (self.edge, self.fill) and pixels.shape == self.free.shape and \
+            np.array_equal(self.free_mask(pixels), self.free)
+
+    def region(self, x: int, y: int) -> np.ndarray:
+        # номера отрезков области, в которой лежит пиксель; None - пиксель не свободен
+        height, width = self.free.shape
+        if not (0 <= x < width and 0 <= y < height) or not self.free[y, x]:
+            return None
+        run = np.searchsorted(self.start_keys, y * self.span + x, side='right') - 1
+        return np.flatnonzero(self.roots == self.roots[run])
+
+    def fill_region(self, pixels: np.ndarray, runs: np.ndarray, on_run: Callable[[int, int, int], None] = None) -> None:
+        for row, start, end in zip(self.rows[runs].tolist(), self.starts[runs].tolist(), self.ends[runs].tolist()):
+            pixels[row, start:end] = self.fill
+            self.free[row, start:end] = False
+            if on_run is not None:
+                on_run(row, start, end)
@@ -0,0 +1,23 @@
+import numpy as np
+
+# поиск отрезков в строке пикселей за несколько операций над массивом вместо обхода по пикселю;
+# free - маска строки (или ее части): True - пиксель еще можно закрасить
+
+
+def free_pixels(row: np.ndarray, fill: int, edge: int) -> np.ndarray:
+    return (row != fill) & (row != edge)
+
+
+def run_length(free: np.ndarray) -> int:
+    # длина свободного участка в начале маски (до первого занятого пикселя)
+    if len(free) == 0:
+        return 0
+    end = int(np.argmin(free))
+    return len(free) if free[end] else end
+
+
+def run_ends(free: np.ndarray) -> np.ndarray:
+    # индексы последних пикселей всех свободных участков, слева направо
+    ends = free.copy()
+    ends[:-1] &= ~free[1:]
+    return np.flatnonzero(ends)
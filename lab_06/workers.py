@@ -0,0 +1,110 @@
+from typing import Callable
+
+from PyQt5.QtCore import QObject, QThread, QEventLoop, pyqtSignal
+from PyQt5.QtWidgets import QMainWindow, QProgressBar, QPushButton, QAbstractButton, QApplication
+
+from dialogs import show_err_win
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# долгий расчет вне потока GUI: func(job, *args) считает, сообщает прогресс через job.report
+# и не трогает сцену; результат приходит сигналом result_ready уже в поток GUI
+class Job(QThread):
+    progress = pyqtSignal(int, int)  # сделано, всего (0 - количество заранее неизвестно)
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, func: Callable, *args, parent: QObject = None):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+
+    def check(self) -> None:
+        if self.isInterruptionRequested():
+            raise JobCancelled
+
+    def report(self, done: int, total: int = 0) -> None:
+        self.check()
+        self.progress.emit(done, total)
+
+    def cancel(self) -> None:
+        self.requestInterruption()
+
+    def run(self) -> None:
+        try:
+            result = self.func(self, *self.args)
+        except JobCancelled:
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.result_ready.emit(result)
+
+
+# полоса прогресса и кнопка отмены в строке состояния окна; строка видна, только пока идет расчет
+class JobControls(QObject):
+    done = pyqtSignal()
+
+    def __init__(self, win: QMainWindow):
+        super().__init__(win)
+        self.status_bar = win.statusBar()
+        self.progress_bar = QProgressBar()
+        self.cancel_button = QPushButton("Отмена")
+        self.status_bar.addPermanentWidget(self.progress_bar, 1)
+        self.status_bar.addPermanentWidget(self.cancel_button)
+        self.status_bar.hide()
+        self.job = None
+        self.buttons = []
+        self.cancel_button.clicked.connect(self.cancel)
+
+    def is_busy(self) -> bool:
+        return self.job is not None
+
+    def start(self, job, *buttons: QAbstractButton) -> None:
+        # job - Job или объект с такими же сигналами progress, finished и методами start, cancel
+        self.job = job
+        self.buttons = buttons
+        for button in buttons:
+            button.setEnabled(False)
+        self.progress_bar.setRange(0, 0)
+        self.status_bar.show()
+        job.progress.connect(self.set_progress)
+        job.finished.connect(self.on_finished)
+        if isinstance(job, Job):
+            job.failed.connect(show_err_win)
+        job.start()
+
+    def set_progress(self, done: int, total: int) -> None:
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def on_finished(self) -> None:
+        for button in self.buttons:
+            button.setEnabled(True)
+        self.status_bar.hide()
+        self.job = None
+        self.done.emit()
+
+    def cancel(self) -> None:
+        if self.job is not None:
+            self.job.cancel()
+
+    def stop(self) -> None:
+        # при закрытии окна: поток расчета отменяется и дожидается, иначе Qt уничтожит работающий QThread
+        job = self.job
+        self.cancel()
+        if isinstance(job, QThread):
+            job.wait()
+
+    def wait(self) -> None:
+        # для функциональных тестов: дождаться конца расчета, не останавливая цикл событий
+        if self.job is None:
+            return
+        loop = QEventLoop()
+        self.done.connect(loop.quit)
+        loop.exec_()
+        # строка состояния спрятана - дать окну заново разложить виджеты
+        QApplication.processEvents()
@@ -6,20 +6,19 @@ from typing import List
 from PyQt5 import QtWidgets
 from PyQt5 import uic
 from PyQt5.QtCore import Qt, QPoint, QLineF
-from PyQt5.QtWidgets import QGraphicsScene, QGraphicsLineItem, QGraphicsEllipseItem, QGraphicsTextItem, QColorDialog, \
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsLineItem, QGraphicsTextItem, QColorDialog, \
     QGraphicsRectItem
-from PyQt5.QtGui import QWheelEvent, QMouseEvent, QPen, QColor, QFont, QKeyEvent
+from PyQt5.QtGui import QWheelEvent, QMouseEvent, QColor, QFont, QKeyEvent
 
 from dialogs import show_author, show_task, show_instruction, show_war_win
 from class_point import Point
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
+from marker_layer import MarkerLayer, MARKER_SIZE
 from point_funcs import get_code
 
-grid_lines: List[QGraphicsLineItem] = []
-max_win_size: List[int] = [0, 0, 0]
 point_list: List[Point] = []
-point_scale: List[float] = []
 coords_desc: List[QGraphicsTextItem] = []
-scene_point_list: List[QGraphicsEllipseItem] = []
 segments: List[List[Point]] = []
 
 scale: float = 1.0
@@ -78,9 +77,12 @@ class Ui(QtWidgets.QMainWindow):
         self.scene = QGraphicsScene()
         self.graphicsView.setScene(self.scene)
 
-        self.need_grid()
+        self.markers = MarkerLayer()
+        self.markers.setZValue(0.5)  # над отсекателем, под отрезками
+        self.scene.addItem(self.markers)
 
-        self.add_grid()
+        self.grid = GridBackground(self.graphicsView)
+        self.update_grid()
 
         # menu bar
         self.about_author.triggered.connect(show_author)
@@ -99,6 +101,7 @@ class Ui(QtWidgets.QMainWindow):
         self.cutoff_button.clicked.connect(self.cutoff)
 
         # graphics view mouse events
+        self.input = InputCoalescer(self.apply_mouse_move, self.apply_wheel, self)
         self.graphicsView.mousePressEvent = self.mousePressEvent
         self.graphicsView.wheelEvent = self.wheel_event
         self.graphicsView.mouseReleaseEvent = self.mouseReleaseEvent
@@ -107,28 +110,22 @@ class Ui(QtWidgets.QMainWindow):
         self.show()
 
     def wheel_event(self, event: QWheelEvent) -> None:
-        global scale
-        factor = 1.2
+        self.input.wheel(1 if event.angleDelta().y() > 0 else -1)
 
-        if event.angleDelta().y() > 0:
-            self.graphicsView.scale(factor, factor)
-        else:
-            self.graphicsView.scale(1.0 / factor, 1.0 / factor)
+    def apply_wheel(self, steps: int) -> None:
+        # steps - сумма шагов колесика за кадр, каждый шаг - масштаб в 1.2 раза
+        global scale
+        factor = 1.2 ** steps
+        self.graphicsView.scale(factor, factor)
 
         # Получаем текущий масштаб по оси X (и Y)
         scale = self.graphicsView.transform().m11()
-        for i in range(len(scene_point_list)):
-            point = scene_point_list[i]
-            point.setTransformOriginPoint(point.boundingRect().center())
-            point.setScale(1 / (scale * point_scale[i]))
-        if self.need_grid():
-            for grid_line in grid_lines:
-                if grid_line in self.scene.items():
-                    self.scene.removeItem(grid_line)
-            self.add_grid()
+        self.markers.set_scale(scale)
+        self.update_grid()
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         global is_pressed, dragging, enter_vert_segment, enter_hor_segment
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             if not dragging and not enter_cutoff:
                 self.add_point_by_click(event)
@@ -138,11 +135,16 @@ class Ui(QtWidgets.QMainWindow):
             is_pressed = False
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        global last_pos, dragging
+        global dragging
         if is_pressed:
             dragging = True
+        self.input.move(event.pos())
+
+    def apply_mouse_move(self, pos: QPoint) -> None:
+        global last_pos
+        if is_pressed:
             last_scene_pos = self.graphicsView.mapToScene(last_pos)
-            cur_scene_pos = self.graphicsView.mapToScene(event.pos())
+            cur_scene_pos = self.graphicsView.mapToScene(pos)
             if enter_cutoff:
                 self.redraw_rect(last_scene_pos.x(), last_scene_pos.y(
                 ), cur_scene_pos.x(), cur_scene_pos.y())
@@ -150,52 +152,51 @@ class Ui(QtWidgets.QMainWindow):
             elif enter_vert_segment:
                 global tmp_vert_segment
                 if tmp_vert_segment:
-                    self.scene.removeItem(tmp_vert_segment)
                     segments.pop()
-                tmp_vert_segment = QGraphicsLineItem(last_scene_pos.x(), last_scene_pos.y(),
-                                                     cur_scene_pos.x(), last_scene_pos.y())
-                tmp_vert_segment.setPen(current_edge_color)
-                self.scene.addItem(tmp_vert_segment)
+                else:
+                    tmp_vert_segment = QGraphicsLineItem()
+                    tmp_vert_segment.setPen(current_edge_color)
+                    self.scene.addItem(tmp_vert_segment)
+                tmp_vert_segment.setLine(last_scene_pos.x(), last_scene_pos.y(),
+                                         cur_scene_pos.x(), last_scene_pos.y())
                 segments.append([Point(last_scene_pos.x(), -last_scene_pos.y()),
                                  Point(cur_scene_pos.x(), -last_scene_pos.y())])
 
             elif enter_hor_segment:
                 global tmp_hor_segment
                 if tmp_hor_segment:
-                    self.scene.removeItem(tmp_hor_segment)
                     segments.pop()
-                tmp_hor_segment = QGraphicsLineItem(last_scene_pos.x(), last_scene_pos.y(),
-                                                    last_scene_pos.x(), cur_scene_pos.y())
-                tmp_hor_segment.setPen(current_edge_color)
-                self.scene.addItem(tmp_hor_segment)
+                else:
+                    tmp_hor_segment = QGraphicsLineItem()
+                    tmp_hor_segment.setPen(current_edge_color)
+                    self.scene.addItem(tmp_hor_segment)
+                tmp_hor_segment.setLine(last_scene_pos.x(), last_scene_pos.y(),
+                                        last_scene_pos.x(), cur_scene_pos.y())
                 segments.append([Point(last_scene_pos.x(), -last_scene_pos.y()),
                                  Point(last_scene_pos.x(), -cur_scene_pos.y())])
             else:
-                dx = event.pos().x() - last_pos.x()
-                dy = event.pos().y() - last_pos.y()
+                dx = pos.x() - last_pos.x()
+                dy = pos.y() - last_pos.y()
                 self.graphicsView.horizontalScrollBar().setValue(
                     self.graphicsView.horizontalScrollBar().value() - dx)
                 self.graphicsView.verticalScrollBar().setValue(
                     self.graphicsView.verticalScrollBar().value() - dy)
-                last_pos = event.pos()
-                if self.need_grid():
-                    for grid_line in grid_lines:
-                        if grid_line in self.scene.items():
-                            self.scene.removeItem(grid_line)
-                    self.add_grid()
-
-        scene_pos = self.graphicsView.mapToScene(event.pos())
+                last_pos = pos
+
+        scene_pos = self.graphicsView.mapToScene(pos)
         self.current_coords_label.setText(
             f'x :{scene_pos.x():.2f}, y :{-scene_pos.y():.2f}')
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         global last_pos, is_pressed
+        self.input.flush()
         if event.button() == Qt.LeftButton:
             is_pressed = True
             last_pos = event.pos()
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
         global enter_vert_segment, enter_hor_segment
+        self.input.flush()
         if event.key() == Qt.Key_Escape:
             self.close()
         elif event.key() == Qt.Key_Control:
@@ -209,6 +210,7 @@ class Ui(QtWidgets.QMainWindow):
 
     def keyReleaseEvent(self, event: QKeyEvent) -> None:
         global enter_vert_segment, enter_hor_segment, tmp_vert_segment, tmp_hor_segment
+        self.input.flush()
         if event.key() == Qt.Key_Control:
             enter_vert_segment = False
             vert_segment = segments.pop()
@@ -226,81 +228,27 @@ class Ui(QtWidgets.QMainWindow):
         else:
             super().keyReleaseEvent(event)
 
-    def need_grid(self) -> bool:
-        global max_win_size
-        flag: bool = False
-        max_size = self.graphicsView.maximumSize()
-        max_width = int(max_size.width() * (1 / scale))
-        max_height = int(max_size.height() * (1 / scale))
-        grid_interval = int(50 * (1 / scale))
-        grid_interval = round(grid_interval / 50) * 50
-        if grid_interval != max_win_size[2]:
-            max_win_size[2] = grid_interval
-            flag = True
-        if max_win_size[0] < max_width and max_win_size[1] < max_height:
-            max_win_size[0] = max_width
-            max_win_size[1] = max_height
-            flag = True
-        return flag
-
-    def add_grid(self) -> None:
-        global grid_lines, max_win_size
-        max_width = max_win_size[0]
-        max_height = max_win_size[1]
-        grid_interval = max_win_size[2]
-        if grid_interval == 0:
-            grid_interval = 20
-        self.current_grid_label.setText(f'Текущий шаг сетки: {grid_interval}')
-        start_grid_width = - ((max_width // 2) +
-                              grid_interval - (max_width // 2) % grid_interval)
-        start_grid_height = - \
-            ((max_height // 2) + grid_interval - (max_height // 2) % grid_interval)
-        end_grid_width = (max_width // 2) - (max_width // 2) % grid_interval
-        end_grid_height = (max_height // 2) - (max_width // 2) % grid_interval
-        pen = QPen(Qt.darkGray)
-        pen_width = 1 if int(1 / scale) == 0 else int(1 / scale)
-        pen.setWidth(pen_width)
-        for x in range(start_grid_width, end_grid_width, grid_interval):
-            line = QGraphicsLineItem(x, start_grid_height, x, end_grid_height)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-        for y in range(start_grid_height, end_grid_height, grid_interval):
-            line = QGraphicsLineItem(start_grid_width, y, end_grid_width, y)
-            line.setPen(pen)
-            line.setZValue(0)
-            grid_lines.append(line)
-            self.scene.addItem(line)
-
-        axis_x = QGraphicsLineItem(-300 * (1 / scale), 0, 300 * (1 / scale), 0)
-        axis_y = QGraphicsLineItem(0, -300 * (1 / scale), 0, 300 * (1 / scale))
-        pen.setColor(Qt.white)
-        grid_lines.append(axis_x)
-        grid_lines.append(axis_y)
-        axis_x.setPen(pen)
-        axis_y.setPen(pen)
-        axis_x.setZValue(0)
-        axis_y.setZValue(0)
-        self.scene.addItem(axis_x)
-        self.scene.addItem(axis_y)
+    def update_grid(self) -> None:
+        if self.grid.update(scale):
+            self.current_grid_label.setText(f'Текущий шаг сетки: {self.grid.step}')
 
     def change_color(self, color: QColor) -> None:
         global current_edge_color
         current_edge_color = color
         objects = self.scene.items()
         for obj in objects:
-            if obj not in grid_lines and not isinstance(obj, QGraphicsTextItem):
+            if isinstance(obj, MarkerLayer):
+                obj.set_pen(current_edge_color)
+            elif not isinstance(obj, QGraphicsTextItem):
                 obj.setPen(current_edge_color)
 
     def clear_scene(self):
         for item in self.scene.items():
-            if item not in grid_lines:
-                self.scene.removeItem(item)
+            self.scene.removeItem(item)
+        self.markers.clear()
+        self.scene.addItem(self.markers)
         point_list.clear()
-        point_scale.clear()
         coords_desc.clear()
-        scene_point_list.clear()
         self.scroll_list.clear()
 
     def redraw_rect(self, x1: float, y1: float, x2: float, y2: float) -> None:
@@ -329,12 +277,8 @@ class Ui(QtWidgets.QMainWindow):
             point_list.append(point)
             self.scroll_list.addItem(
                 f'{len(point_list)}.({round(point.x, 2)}; {round(point.y, 2)})')
-            point_scale.append(1 / scale)
-            scene_point = QGraphicsEllipseItem(
-                point.x, -point.y, 5 * (1 / scale), 5 * (1 / scale))
-            scene_point.setBrush(current_edge_color)
-            self.scene.addItem(scene_point)
-            self.add_point_label(scene_point, point)
+            self.markers.add(point.x, -point.y, current_edge_color)
+            self.add_point_label(point)
 
             if len(point_list) % 2 == 1:
                 segments.append([point_list[-1]])
@@ -342,14 +286,14 @@ class Ui(QtWidgets.QMainWindow):
                 segments[-1].append(point_list[-1])
                 self.draw_line(
                     point_list[-2], point_list[-1], current_edge_color)
-            scene_point_list.append(scene_point)
 
-    def add_point_label(self, scene_point: QGraphicsEllipseItem, point: Point) -> None:
+    def add_point_label(self, point: Point) -> None:
         point_coords_label = QGraphicsTextItem(
             f'x:({point.x:.2f}, y:{point.y:.2f})')
         coords_desc.append(point_coords_label)
-        point_coords_label.setPos(
-            scene_point.rect().center().x() + 10, scene_point.rect().center().y())
+        # подпись - справа от центра маркера
+        half = MARKER_SIZE / scale / 2
+        point_coords_label.setPos(point.x + half + 10, -point.y + half)
 
         point_coords_label.setDefaultTextColor(QColor(255, 255, 255))
         font = QFont()
@@ -0,0 +1,84 @@
+from typing import List
+
+import numpy as np
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainter, QPen
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+
+# все маркеры точек - один элемент сцены, который рисует их в координатах экрана:
+# размер маркера не зависит от масштаба вида, и при масштабировании ничего не пересчитывается
+MARKER_SIZE = 5  # пикселей экрана, точка - левый верхний угол маркера
+
+
+class MarkerLayer(QGraphicsItem):
+    def __init__(self):
+        super().__init__()
+        self.xs: List[float] = []
+        self.ys: List[float] = []
+        self.brushes: List[QColor] = []
+        self.pens: List[QPen] = []
+        self.coords = None  # xs и ys массивом для отбора видимых маркеров, строится при отрисовке
+        self.bounds = QRectF()  # прямоугольник, в котором лежат точки
+        self.scale = 1.0
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def margin(self) -> float:
+        # размер маркера с контуром в единицах сцены при текущем масштабе
+        return (MARKER_SIZE + 1) / self.scale
+
+    def boundingRect(self) -> QRectF:
+        if not self.xs:
+            return QRectF()
+        margin = self.margin()
+        return self.bounds.adjusted(-margin, -margin, margin, margin)
+
+    def set_scale(self, scale: float) -> None:
+        self.prepareGeometryChange()
+        self.scale = scale
+
+    def add(self, x: float, y: float, color: QColor) -> None:
+        self.prepareGeometryChange()
+        if self.xs:
+            self.bounds = QRectF(QPointF(min(self.bounds.left(), x), min(self.bounds.top(), y)),
+                                 QPointF(max(self.bounds.right(), x), max(self.bounds.bottom(), y)))
+        else:
+            self.bounds = QRectF(x, y, 0, 0)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.brushes.append(QColor(color))
+        self.pens.append(QPen(Qt.black))
+        self.coords = None
+
+    def set_pen(self, color: QColor) -> None:
+        # контур всех уже добавленных маркеров, как setPen у каждого элемента сцены
+        self.pens = [QPen(color)] * len(self.xs)
+        self.update()
+
+    def clear(self) -> None:
+        self.prepareGeometryChange()
+        self.xs.clear()
+        self.ys.clear()
+        self.brushes.clear()
+        self.pens.clear()
+        self.coords = None
+        self.bounds = QRectF()
+
+    def visible(self, rect: QRectF) -> np.ndarray:
+        # номера точек, маркеры которых задевают прямоугольник сцены
+        if self.coords is None:
+            self.coords = np.array([self.xs, self.ys])
+        margin = self.margin()
+        xs, ys = self.coords
+        return np.flatnonzero((xs >= rect.left() - margin) & (xs <= rect.right() + margin) &
+                              (ys >= rect.top() - margin) & (ys <= rect.bottom() + margin))
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None) -> None:
+        if not self.xs:
+            return
+        transform = painter.worldTransform()
+        painter.resetTransform()
+        for i in self.visible(option.exposedRect).tolist():
+            pos = transform.map(QPointF(self.xs[i], self.ys[i]))
+            painter.setPen(self.pens[i])
+            painter.setBrush(self.brushes[i])
+            painter.drawEllipse(QRectF(round(pos.x()), round(pos.y()), MARKER_SIZE, MARKER_SIZE))
@@ -1,5 +1,11 @@
 from class_point import Point
 from point_funcs import get_code
+from grid_background import GridBackground
+from input_coalescer import InputCoalescer
+from marker_layer import MarkerLayer, MARKER_SIZE
+from PyQt5.QtCore import QPoint, QRectF, QLineF, QPointF
+from PyQt5.QtWidgets import QApplication, QGraphicsScene, QGraphicsView
+from PyQt5.QtGui import QColor, QBrush
 import pytest
 
 
@@ -22,3 +28,110 @@ def test_point_outside_cutoff_code(null_point):
 
 def test_point_on_edge_cutoff_code(null_point):
     assert get_code(null_point, [0, 2, 4, -2]) == 0
+
+
+def test_input_coalescer():
+    # за кадр от движений остается последняя позиция, шаги колесика складываются
+    # и применяются раньше движения; первое событие кадра применяется сразу
+    calls = []
+    coalescer = InputCoalescer(lambda pos: calls.append(('move', pos)), lambda steps: calls.append(('wheel', steps)))
+    coalescer.move(QPoint(1, 1))
+    for i in range(2, 5):
+        coalescer.move(QPoint(i, i))
+    for steps in (1, 2, -1):
+        coalescer.wheel(steps)
+    assert calls == [('move', QPoint(1, 1))]
+    coalescer.flush()
+    assert calls == [('move', QPoint(1, 1)), ('wheel', 2), ('move', QPoint(4, 4))]
+    coalescer.next_frame()
+    assert len(calls) == 3
+
+
+def test_marker_layer_visible():
+    # маркер рисуется вправо-вниз от точки: точка левее или выше прямоугольника видна,
+    # пока маркер до него достает
+    layer = MarkerLayer()
+    layer.set_scale(2)
+    for x, y in ((0, 0), (10, 10), (-3, 5), (-4, 5), (5, 13), (5, 14)):
+        layer.add(x, y, QColor(255, 0, 0))
+    assert layer.margin() == (MARKER_SIZE + 1) / 2
+    assert layer.visible(QRectF(0, 0, 10, 10)).tolist() == [0, 1, 2, 4]
+
+
+def test_marker_layer_bounds():
+    layer = MarkerLayer()
+    assert layer.boundingRect().isNull()
+    layer.add(1, 2, QColor(0, 0, 255))
+    layer.add(-5, 10, QColor(0, 0, 255))
+    margin = layer.margin()
+    assert layer.boundingRect() == QRectF(-5, 2, 6, 8).adjusted(-margin, -margin, margin, margin)
+    layer.clear()
+    assert layer.boundingRect().isNull() and len(layer.visible(QRectF(-10, -10, 20, 20))) == 0
+    layer.add(3, 4, QColor(0, 0, 255))
+    assert layer.boundingRect() == QRectF(3, 4, 0, 0).adjusted(-margin, -margin, margin, margin)
+    assert layer.visible(QRectF(-10, -10, 20, 20)).tolist() == [0]
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def grid_view(qt_app):
+    view = QGraphicsView()
+    view.setScene(QGraphicsScene())
+    view.setMaximumSize(800, 600)
+    return view
+
+
+def old_grid_lines(max_width: int, max_height: int, interval: int, scale: float):
+    # линии сетки и осей так, как их строил add_grid элементами сцены
+    step = interval if interval != 0 else 20
+    start_width = - ((max_width // 2) + step - (max_width // 2) % step)
+    start_height = - ((max_height // 2) + step - (max_height // 2) % step)
+    end_width = (max_width // 2) - (max_width // 2) % step
+    end_height = (max_height // 2) - (max_width // 2) % step
+    vertical = [QLineF(x, start_height, x, end_height) for x in range(start_width, end_width, step)]
+    horizontal = [QLineF(start_width, y, end_width, y) for y in range(start_height, end_height, step)]
+    axes = [QLineF(-300 * (1 / scale), 0, 300 * (1 / scale), 0), QLineF(0, -300 * (1 / scale), 0, 300 * (1 / scale))]
+    return vertical, horizontal, axes
+
+
+def test_grid_update(grid_view):
+    grid = GridBackground(grid_view)
+    assert grid.update(1.0)
+    assert (grid.step, grid.max_width, grid.max_height) == (50, 800, 600)
+    assert not grid.update(1.0)
+    assert not grid.update(1.2)  # шаг тот же, границы меньше прежних
+    assert grid.update(0.5)
+    assert (grid.step, grid.max_width, grid.max_height) == (100, 1600, 1200)
+    assert not grid.update(0.5)
+    assert grid_view.scene().sceneRect().contains(grid.bounds())
+
+
+@pytest.mark.parametrize('scale', [1.0, 0.5, 0.3, 2.0])
+def test_grid_extents(grid_view, scale):
+    grid = GridBackground(grid_view)
+    grid.update(scale)
+    vertical, horizontal, axes = old_grid_lines(grid.max_width, grid.max_height, grid.interval, scale)
+    half = grid.pen_width() / 2
+
+    def extent(lines):
+        rect = QRectF()
+        for line in lines:
+            rect |= QRectF(line.p1(), line.p2())
+        return rect.adjusted(-half, -half, half, half)
+
+    assert grid.regions() == (extent(vertical), extent(horizontal))
+    assert grid.bounds() == extent(vertical + horizontal + axes)
+
+
+def test_grid_background_brush(grid_view):
+    grid_view.resize(300, 300)
+    grid_view.setBackgroundBrush(QBrush(QColor(200, 0, 0)))
+    GridBackground(grid_view).update(1.0)
+    image = grid_view.viewport().grab().toImage()
+    # середина клетки сетки, вдали от линий и осей
+    cell = grid_view.mapFromScene(QPointF(25, 25))
+    assert image.pixelColor(cell) == QColor(200, 0, 0)